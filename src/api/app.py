@@ -6,6 +6,7 @@ and shared state.  Includes analytics (Phase 6) and governance (Phase 7).
 """
 
 import asyncio
+import inspect
 import json
 import logging
 import os
@@ -13,13 +14,13 @@ import time
 import uuid
 from collections import defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from fastapi import Depends, FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
 
-from src.api.middleware import RateLimiter
+from src.api.middleware import RateLimiter, RedisRateLimiter
 from src.config import get_settings
 from src.api.schemas import (
     AnalyticsResponse,
@@ -46,7 +47,11 @@ from src.embeddings.engine import EmbeddingEngine, EmbeddingConfig
 from src.embeddings.mismatch import MismatchCostCalculator
 from src.embeddings.similarity import SimilarityCalculator
 from src.embeddings.threshold import AdaptiveThresholdTuner
-from src.embeddings.vector_store import InMemoryVectorDB, PineconeVectorDB
+from src.embeddings.vector_store import (
+    HNSWVectorDB,
+    InMemoryVectorDB,
+    PineconeVectorDB,
+)
 from src.exceptions import (
     AsahiException,
     BatchingError,
@@ -82,6 +87,19 @@ from src.observability.recommendations import RecommendationEngine
 logger = logging.getLogger(__name__)
 
 
+def _local_vector_db(dimension: int) -> Any:
+    """Return the in-process vector DB for Tier 2.
+
+    Uses the HNSW index when hnswlib is installed, otherwise the
+    brute-force in-memory scan.
+    """
+    try:
+        return HNSWVectorDB(dimension=dimension)
+    except VectorDBError:
+        logger.info("hnswlib not installed, using brute-force vector DB", extra={})
+        return InMemoryVectorDB()
+
+
 def create_app(use_mock: bool = False) -> FastAPI:
     """Create and configure the FastAPI application.
 
@@ -112,8 +130,9 @@ def create_app(use_mock: bool = False) -> FastAPI:
         embedding_config = EmbeddingConfig()
         embedding_engine = EmbeddingEngine(embedding_config)
 
-        # Initialize vector DB: Pinecone when PINECONE_API_KEY set (Step 7), else in-memory
-        vector_db: Any = InMemoryVectorDB()
+        # Initialize vector DB: Pinecone when PINECONE_API_KEY set (Step 7),
+        # else an in-memory HNSW index, else a brute-force in-memory scan
+        vector_db: Any = _local_vector_db(embedding_config.dimension)
         if os.environ.get("PINECONE_API_KEY"):
             try:
                 vector_db = PineconeVectorDB(
@@ -126,7 +145,7 @@ def create_app(use_mock: bool = False) -> FastAPI:
                     "Pinecone init failed, using in-memory vector DB",
                     extra={"error": str(exc)},
                 )
-                vector_db = InMemoryVectorDB()
+                vector_db = _local_vector_db(embedding_config.dimension)
 
         # Initialize Tier 2 semantic cache dependencies
         similarity_calc = SimilarityCalculator()
@@ -145,7 +164,8 @@ def create_app(use_mock: bool = False) -> FastAPI:
 
         # Initialize Tier 3 components
         intermediate_cache = IntermediateCache(
-            ttl_seconds=settings.cache.ttl_seconds
+            ttl_seconds=settings.cache.ttl_seconds,
+            max_entries=settings.cache.max_entries,
         )
         workflow_decomposer = WorkflowDecomposer()
 
@@ -313,11 +333,11 @@ def create_app(use_mock: bool = False) -> FastAPI:
             request_queue = RequestQueue()
             optimizer_ref = app.state.optimizer
 
-            def batch_executor(batch: list) -> list:
-                return [
-                    optimizer_ref.infer(**req.infer_kwargs)
-                    for req in batch
-                ]
+            def batch_executor(batch: list) -> Iterator[Any]:
+                # Yield so each caller is answered as soon as its own
+                # inference finishes, not after the whole batch
+                for req in batch:
+                    yield optimizer_ref.infer(**req.infer_kwargs)
 
             batch_scheduler = BatchScheduler(
                 queue=request_queue,
@@ -338,9 +358,17 @@ def create_app(use_mock: bool = False) -> FastAPI:
 
     app.state.start_time = time.time()
     app.state.version = settings.api.version
-    app.state.rate_limiter = RateLimiter(
-        max_requests=settings.api.rate_limit_per_minute, window_seconds=60
-    )
+    # Share rate-limit state across workers when Tier 1 is on Redis
+    if cache_backend_used == "redis":
+        app.state.rate_limiter = RedisRateLimiter.from_url(
+            redis_url,
+            max_requests=settings.api.rate_limit_per_minute,
+            window_seconds=60,
+        )
+    else:
+        app.state.rate_limiter = RateLimiter(
+            max_requests=settings.api.rate_limit_per_minute, window_seconds=60
+        )
 
     # -- Observability (Phase 6) --
     app.state.metrics_collector = MetricsCollector()
@@ -427,9 +455,13 @@ def create_app(use_mock: bool = False) -> FastAPI:
     async def rate_limit(request: Request, call_next: Any) -> Response:
         """Enforce per-IP rate limiting."""
         client_ip = request.client.host if request.client else "unknown"
-        limiter: RateLimiter = request.app.state.rate_limiter
+        limiter: Any = request.app.state.rate_limiter
 
-        if not limiter.is_allowed(client_ip):
+        allowed = limiter.is_allowed(client_ip)
+        # RedisRateLimiter checks are coroutines (async Redis client)
+        if inspect.isawaitable(allowed):
+            allowed = await allowed
+        if not allowed:
             return Response(
                 content='{"error":"rate_limit_exceeded","message":"Too many requests"}',
                 status_code=429,
@@ -469,6 +501,26 @@ def create_app(use_mock: bool = False) -> FastAPI:
             )
         return await call_next(request)
 
+    # -- Body size guard (registered last so it runs first) --
+    max_body_bytes = settings.api.max_body_bytes
+
+    @app.middleware("http")
+    async def limit_body_size(request: Request, call_next: Any) -> Response:
+        """Reject oversize bodies by Content-Length before they are parsed."""
+        content_length = request.headers.get("content-length")
+        if content_length is not None:
+            try:
+                too_large = int(content_length) > max_body_bytes
+            except ValueError:
+                too_large = False
+            if too_large:
+                return Response(
+                    content='{"error":"payload_too_large","message":"Request body too large"}',
+                    status_code=413,
+                    media_type="application/json",
+                )
+        return await call_next(request)
+
     # -- Global exception handlers --
     @app.exception_handler(AsahiException)
     async def asahi_exception_handler(
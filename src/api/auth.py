@@ -1,18 +1,24 @@
-import secrets
+import asyncio
+from base64 import urlsafe_b64encode
 from datetime import datetime, timedelta
-from typing import Optional
+from os import urandom
+from typing import Any, Optional
 
 import bcrypt
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, EmailStr
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.engine import get_async_session
 from src.db.models import ApiKeyModel, OrgModel, UserModel
+from src.governance.auth import _StoredKey
 
 auth_router = APIRouter(prefix="/auth", tags=["Auth"])
 
+_KEY_PREFIX = b"acron_"
+_SESS_PREFIX = b"acron_sess_"
+
 
 class UserCreate(BaseModel):
     email: EmailStr
@@ -46,6 +52,40 @@ def get_password_hash(password: str) -> str:
     return hashed.decode("utf-8")
 
 
+# Checked against when the email is unknown so login takes the same time
+# whether or not the account exists (no user-enumeration timing oracle).
+_DUMMY_HASH = get_password_hash("dummy_password_for_timing_equalization")
+
+
+def _generate_raw_key(prefix: bytes) -> str:
+    # Equivalent to prefix + secrets.token_urlsafe(32), built in one pass.
+    return (prefix + urlsafe_b64encode(urandom(32)).rstrip(b"=")).decode("ascii")
+
+
+def _cached_key_store(request: Request) -> Optional[Any]:
+    """Return the app's DB key store if it keeps a lookup cache."""
+    auth = getattr(request.app.state, "auth_middleware", None)
+    store = getattr(auth, "_key_store", None)
+    return store if hasattr(store, "prime") else None
+
+
+def _prime_key_cache(request: Request, api_key: ApiKeyModel) -> None:
+    """Warm the key store cache so the new key's first use skips the DB."""
+    store = _cached_key_store(request)
+    if store is None:
+        return
+    store.prime(
+        _StoredKey(
+            key_display_prefix=api_key.key_prefix,
+            key_hash=api_key.key_hash,
+            user_id=api_key.user_id,
+            org_id=api_key.org_id,
+            scopes=list(api_key.scopes or []),
+            expires_at=api_key.expires_at,
+        )
+    )
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     pwd_bytes = plain_password.encode("utf-8")
     hashed_bytes = hashed_password.encode("utf-8")
@@ -54,7 +94,9 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 @auth_router.post("/signup", response_model=AuthResponse)
 async def signup(
-    user_data: UserCreate, session: AsyncSession = Depends(get_async_session)
+    user_data: UserCreate,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
 ):
     # Check if user exists
     stmt = select(UserModel).where(UserModel.email == user_data.email)
@@ -80,7 +122,7 @@ async def signup(
     await session.flush() # to get user.id
 
     # Generate API key (bcrypt hash so AuthMiddleware.validate_api_key can verify it)
-    raw_key = f"acron_{secrets.token_urlsafe(32)}"
+    raw_key = _generate_raw_key(_KEY_PREFIX)
     key_hash = bcrypt.hashpw(
         raw_key.encode("utf-8"), bcrypt.gensalt()
     ).decode("utf-8")
@@ -95,6 +137,7 @@ async def signup(
     )
     session.add(api_key)
     await session.commit()
+    _prime_key_cache(request, api_key)
 
     return AuthResponse(
         api_key=raw_key,
@@ -106,21 +149,27 @@ async def signup(
 
 @auth_router.post("/login", response_model=AuthResponse)
 async def login(
-    user_data: UserLogin, session: AsyncSession = Depends(get_async_session)
+    user_data: UserLogin,
+    request: Request,
+    session: AsyncSession = Depends(get_async_session),
 ):
     # Find User
     stmt = select(UserModel).where(UserModel.email == user_data.email)
     result = await session.execute(stmt)
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(user_data.password, user.password_hash):
+    hashed = user.password_hash if user else _DUMMY_HASH
+    password_ok = await asyncio.to_thread(
+        verify_password, user_data.password, hashed
+    )
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
 
     # Generate a short-lived API key (bcrypt hash so AuthMiddleware can verify it)
-    raw_key = f"acron_sess_{secrets.token_urlsafe(32)}"
+    raw_key = _generate_raw_key(_SESS_PREFIX)
     key_hash = bcrypt.hashpw(
         raw_key.encode("utf-8"), bcrypt.gensalt()
     ).decode("utf-8")
@@ -135,6 +184,7 @@ async def login(
     )
     session.add(api_key_entry)
     await session.commit()
+    _prime_key_cache(request, api_key_entry)
 
     return AuthResponse(
         api_key=raw_key,
@@ -147,6 +197,7 @@ async def login(
 @auth_router.post("/delete-account")
 async def delete_account(
     body: DeleteAccountRequest,
+    request: Request,
     session: AsyncSession = Depends(get_async_session),
 ):
     """Permanently delete the user account, all their API keys, and the org if they are the only member."""
@@ -169,7 +220,14 @@ async def delete_account(
     else:
         org_has_other_users = False
 
-    # Delete all API keys for this user
+    # Delete all API keys for this user (and drop them from the lookup cache)
+    store = _cached_key_store(request)
+    if store is not None:
+        prefix_stmt = select(ApiKeyModel.key_prefix).where(
+            ApiKeyModel.user_id == user_id_str
+        )
+        for prefix in (await session.execute(prefix_stmt)).scalars():
+            store.evict(prefix)
     await session.execute(delete(ApiKeyModel).where(ApiKeyModel.user_id == user_id_str))
     await session.execute(delete(UserModel).where(UserModel.id == user.id))
     if org_id is not None and not org_has_other_users:
@@ -4,11 +4,29 @@ CORS, rate limiting, and request-ID injection middleware for Asahi API.
 
 import logging
 import time
+import uuid
 from collections import defaultdict
-from typing import Dict
+from typing import Any, Dict
 
 logger = logging.getLogger(__name__)
 
+# Rolling-window check-and-record in one round trip. Prunes entries older
+# than the window, rejects if the remaining count is at the limit, otherwise
+# records this request and refreshes the key TTL.
+#   KEYS[1] = per-client sorted set
+#   ARGV = now_ms, max_requests, window_ms, unique member
+_SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('PEXPIRE', KEYS[1], window)
+return 1
+"""
+
 
 class RateLimiter:
     """Simple in-memory rate limiter using a sliding window.
@@ -37,13 +55,95 @@ class RateLimiter:
         now = time.time()
         window_start = now - self._window_seconds
 
-        # Clean up old entries
-        self._requests[client_id] = [
-            t for t in self._requests[client_id] if t > window_start
-        ]
+        # Timestamps are appended in order, so expired entries form a
+        # prefix; drop it in place instead of rebuilding the list.
+        reqs = self._requests[client_id]
+        i = 0
+        n = len(reqs)
+        while i < n and reqs[i] <= window_start:
+            i += 1
+        if i:
+            del reqs[:i]
 
-        if len(self._requests[client_id]) >= self._max_requests:
+        if n - i >= self._max_requests:
             return False
 
-        self._requests[client_id].append(now)
+        reqs.append(now)
         return True
+
+
+class RedisRateLimiter:
+    """Sliding-window rate limiter backed by Redis.
+
+    Same interface as :class:`RateLimiter`, except that :meth:`is_allowed`
+    is a coroutine: it runs on the event loop, so it talks to Redis through
+    a ``redis.asyncio`` client instead of blocking the loop on a round
+    trip.  State lives in Redis so the limit is shared across workers and
+    survives restarts. Each check is a single atomic Lua script call
+    (``EVALSHA`` after the first load).
+
+    Args:
+        redis_client: A ``redis.asyncio.Redis`` client (see :meth:`from_url`).
+        max_requests: Maximum requests per window.
+        window_seconds: Window size in seconds.
+        key_prefix: Prefix for per-client keys (default ``asahi:rl``).
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        max_requests: int = 100,
+        window_seconds: int = 60,
+        key_prefix: str = "asahi:rl",
+    ) -> None:
+        self._client = redis_client
+        self._max_requests = max_requests
+        self._window_ms = window_seconds * 1000
+        self._key_prefix = key_prefix.rstrip(":")
+        self._script = redis_client.register_script(_SLIDING_WINDOW_LUA)
+
+    @classmethod
+    def from_url(cls, redis_url: str, **kwargs: Any) -> "RedisRateLimiter":
+        """Build a limiter with its own ``redis.asyncio`` connection pool.
+
+        Args:
+            redis_url: Redis connection URL.
+            **kwargs: Passed through to the constructor.
+
+        Returns:
+            A new RedisRateLimiter.
+        """
+        import redis.asyncio as aioredis
+
+        return cls(aioredis.Redis.from_url(redis_url), **kwargs)
+
+    async def is_allowed(self, client_id: str) -> bool:
+        """Check if a request from this client is allowed.
+
+        Fails open (allows the request) if Redis is unreachable, so a cache
+        outage never takes the API down with it.
+
+        Args:
+            client_id: Client identifier (e.g. IP address).
+
+        Returns:
+            True if the request is within the rate limit.
+        """
+        now_ms = int(time.time() * 1000)
+        try:
+            allowed = await self._script(
+                keys=[f"{self._key_prefix}:{client_id}"],
+                args=[
+                    now_ms,
+                    self._max_requests,
+                    self._window_ms,
+                    f"{now_ms}-{uuid.uuid4().hex}",
+                ],
+            )
+        except Exception as e:
+            logger.warning(
+                "Redis rate limit check failed, allowing request",
+                extra={"client_id": client_id, "error": str(e)},
+            )
+            return True
+        return bool(allowed)
@@ -7,17 +7,28 @@ budget, task type, and prompt token count relative to model capacity.
 """
 
 import logging
-from typing import List, Optional
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 from src.config import get_settings
 from src.exceptions import BatchingError
-from src.models.registry import ModelRegistry, estimate_tokens
+from src.models.registry import ModelProfile, ModelRegistry, estimate_tokens
 
 logger = logging.getLogger(__name__)
 
 
+def _max_tokens_for_length(n_chars: int) -> int:
+    """Upper bound of :func:`estimate_tokens` for any text of *n_chars*.
+
+    Words are whitespace-separated, so there are at most ``(n + 1) // 2``
+    of them; a prompt whose bound is within the limit cannot exceed it.
+    """
+    return int(((n_chars + 1) // 2) * 1.3)
+
+
 class BatchConfig(BaseModel):
     """Configuration for the batch engine.
 
@@ -27,6 +38,8 @@ class BatchConfig(BaseModel):
         max_wait_ms: Global max wait before flushing a batch (ms).
         latency_threshold_ms: Requests with budget below this skip batching.
         eligible_task_types: Only these task types can be batched.
+        urgent_window_ms: Queued requests with less than this left before
+            their deadline are placed in a batch ahead of the others.
     """
 
     min_batch_size: int = Field(default=2, ge=1)
@@ -36,6 +49,7 @@ class BatchConfig(BaseModel):
     eligible_task_types: List[str] = Field(
         default=["summarization", "faq", "translation"]
     )
+    urgent_window_ms: int = Field(default=100, ge=0)
 
 
 class BatchEligibility(BaseModel):
@@ -47,12 +61,35 @@ class BatchEligibility(BaseModel):
         batch_group: Batch group key, e.g. ``"summarization:sonnet"``.
             ``None`` when ineligible.
         max_wait_ms: How long this request can wait for a batch to form.
+        estimated_inference_ms: Expected inference latency of the target
+            model once dispatched (0 when unknown or ineligible).
     """
 
     eligible: bool
     reason: str
     batch_group: Optional[str] = None
     max_wait_ms: int = 0
+    estimated_inference_ms: int = 0
+
+
+_ELIGIBLE_REASON = sys.intern("Request is eligible for batching")
+
+
+def _eligible(
+    batch_group: str, max_wait_ms: int, estimated_inference_ms: int
+) -> BatchEligibility:
+    """Build an eligible :class:`BatchEligibility` without validation.
+
+    Every field is produced by the engine itself with the right type, so
+    the eligible path skips Pydantic validation via ``model_construct``.
+    """
+    return BatchEligibility.model_construct(
+        eligible=True,
+        reason=_ELIGIBLE_REASON,
+        batch_group=batch_group,
+        max_wait_ms=max_wait_ms,
+        estimated_inference_ms=estimated_inference_ms,
+    )
 
 
 class BatchEngine:
@@ -79,10 +116,29 @@ class BatchEngine:
                 max_wait_ms=_s.max_wait_ms,
                 latency_threshold_ms=_s.latency_threshold_ms,
                 eligible_task_types=_s.eligible_task_types,
+                urgent_window_ms=_s.urgent_window_ms,
             )
         self._config = config
         self._registry = model_registry
 
+        # Hot-path copies of config values: plain ints skip BaseModel
+        # attribute access, and the frozenset makes Rule 2 O(1).
+        self._eligible_tasks = frozenset(config.eligible_task_types)
+        self._latency_threshold_ms = config.latency_threshold_ms
+        self._max_batch_size = config.max_batch_size
+        self._max_wait_ms = config.max_wait_ms
+        # model -> per-request token limit (None = capacity unknown)
+        self._per_request_limit_cache: Dict[str, Optional[int]] = {}
+        # model -> registry profile (None = unknown model)
+        self._profile_cache: Dict[str, Optional[ModelProfile]] = {}
+        # (task_type, model) -> interned "task_type:model" group key.
+        # Bounded: task types are limited to the eligible set.
+        self._group_key_cache: Dict[Tuple[str, str], str] = {}
+        # (task_type, model) -> (group key, per-request limit, inference ms)
+        self._route_cache: Dict[
+            Tuple[str, str], Tuple[str, Optional[int], int]
+        ] = {}
+
         logger.info(
             "BatchEngine initialised",
             extra={
@@ -130,6 +186,125 @@ class BatchEngine:
                 f"Failed to evaluate batch eligibility: {exc}"
             ) from exc
 
+    def evaluate_batch(
+        self,
+        prompts: Sequence[str],
+        task_types: Sequence[str],
+        models: Sequence[str],
+        latency_budgets_ms: Sequence[int],
+    ) -> List[BatchEligibility]:
+        """Evaluate a burst of requests in one pass.
+
+        The numeric rules (latency budget, token limit, max wait) are
+        computed as NumPy array operations; model capacity and latency
+        are looked up once per distinct model.  Ineligible requests go
+        through the per-request path to build their reason string, so
+        results match calling :meth:`evaluate` for each request.
+
+        Args:
+            prompts: Prompt text per request.
+            task_types: Task type per request.
+            models: Target model per request.
+            latency_budgets_ms: Latency budget (ms) per request.
+
+        Returns:
+            One BatchEligibility per request, in input order.
+
+        Raises:
+            BatchingError: If the inputs differ in length or evaluation fails.
+        """
+        n = len(prompts)
+        if not (len(task_types) == len(models) == len(latency_budgets_ms) == n):
+            raise BatchingError(
+                "evaluate_batch inputs must all have the same length"
+            )
+        if n == 0:
+            return []
+        try:
+            return self._evaluate_batch_internal(
+                prompts, task_types, models, latency_budgets_ms
+            )
+        except BatchingError:
+            raise
+        except Exception as exc:
+            logger.error(
+                "Batch eligibility evaluation failed",
+                extra={"batch_size": n, "error": str(exc)},
+                exc_info=True,
+            )
+            raise BatchingError(
+                f"Failed to evaluate batch eligibility: {exc}"
+            ) from exc
+
+    def _evaluate_batch_internal(
+        self,
+        prompts: Sequence[str],
+        task_types: Sequence[str],
+        models: Sequence[str],
+        latency_budgets_ms: Sequence[int],
+    ) -> List[BatchEligibility]:
+        """Vectorised eligibility rules for :meth:`evaluate_batch`."""
+        n = len(prompts)
+        eligible_types = self._eligible_tasks
+
+        # Per-model lookups, once per distinct model (-1 = no token limit)
+        limit_by_model: Dict[str, int] = {}
+        latency_by_model: Dict[str, int] = {}
+        for model in set(models):
+            limit = self._per_request_limit(model)
+            limit_by_model[model] = -1 if limit is None else limit
+            latency_by_model[model] = self._estimate_inference_ms(model)
+
+        budgets = np.asarray(latency_budgets_ms, dtype=np.int64)
+        mask = budgets >= self._latency_threshold_ms
+        mask &= np.fromiter(
+            (t in eligible_types for t in task_types), dtype=bool, count=n
+        )
+        limits = np.fromiter(
+            (limit_by_model[m] for m in models), dtype=np.int64, count=n
+        )
+        # Only tokenise prompts that survived the cheap checks and could
+        # actually exceed their model's limit
+        tokens = np.fromiter(
+            (
+                estimate_tokens(p)
+                if ok and limit >= 0 and _max_tokens_for_length(len(p)) > limit
+                else 0
+                for p, ok, limit in zip(
+                    prompts, mask.tolist(), limits.tolist(), strict=True
+                )
+            ),
+            dtype=np.int64,
+            count=n,
+        )
+        mask &= (limits < 0) | (tokens <= limits)
+
+        inference_ms = np.fromiter(
+            (latency_by_model[m] for m in models), dtype=np.int64, count=n
+        )
+        max_waits = np.minimum(
+            np.maximum(budgets - inference_ms, 0), self._max_wait_ms
+        )
+
+        results: List[BatchEligibility] = []
+        for i, ok in enumerate(mask.tolist()):
+            if ok:
+                results.append(
+                    _eligible(
+                        self._group_key(task_types[i], models[i]),
+                        int(max_waits[i]),
+                        int(inference_ms[i]),
+                    )
+                )
+            else:
+                results.append(
+                    self._evaluate_internal(
+                        prompts[i], task_types[i], models[i],
+                        int(latency_budgets_ms[i]),
+                    )
+                )
+        return results
+
     def _evaluate_internal(
         self,
         prompt: str,
@@ -149,31 +324,33 @@ class BatchEngine:
             BatchEligibility result.
         """
         # Rule 1: latency budget too tight
-        if latency_budget_ms < self._config.latency_threshold_ms:
-            logger.debug(
-                "Request ineligible: latency budget too tight",
-                extra={
-                    "latency_budget_ms": latency_budget_ms,
-                    "threshold_ms": self._config.latency_threshold_ms,
-                },
-            )
+        if latency_budget_ms < self._latency_threshold_ms:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Request ineligible: latency budget too tight",
+                    extra={
+                        "latency_budget_ms": latency_budget_ms,
+                        "threshold_ms": self._latency_threshold_ms,
+                    },
+                )
             return BatchEligibility(
                 eligible=False,
                 reason=(
                     f"Latency budget {latency_budget_ms}ms is below "
-                    f"threshold {self._config.latency_threshold_ms}ms"
+                    f"threshold {self._latency_threshold_ms}ms"
                 ),
             )
 
         # Rule 2: task type not eligible
-        if task_type not in self._config.eligible_task_types:
-            logger.debug(
-                "Request ineligible: task type not batchable",
-                extra={
-                    "task_type": task_type,
-                    "eligible_types": self._config.eligible_task_types,
-                },
-            )
+        if task_type not in self._eligible_tasks:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Request ineligible: task type not batchable",
+                    extra={
+                        "task_type": task_type,
+                        "eligible_types": self._config.eligible_task_types,
+                    },
+                )
             return BatchEligibility(
                 eligible=False,
                 reason=(
@@ -182,21 +359,33 @@ class BatchEngine:
                 ),
             )
 
-        # Rule 3: prompt too large relative to model capacity
-        token_count = estimate_tokens(prompt)
-        max_tokens_per_request = self._get_max_input_tokens(model)
+        # Everything below that depends only on (task_type, model) is
+        # resolved once and reused for every later request of that pair.
+        route = self._route_cache.get((task_type, model))
+        if route is None:
+            route = self._resolve_route(task_type, model)
+        batch_group, per_request_limit, estimated_inference_ms = route
 
-        if max_tokens_per_request is not None:
-            per_request_limit = max_tokens_per_request // self._config.max_batch_size
+        # Rule 3: prompt too large relative to model capacity
+        # Short prompts are cleared from their length alone, without
+        # splitting them into words.
+        token_count: Optional[int] = None
+
+        if (
+            per_request_limit is not None
+            and _max_tokens_for_length(len(prompt)) > per_request_limit
+        ):
+            token_count = estimate_tokens(prompt)
             if token_count > per_request_limit:
-                logger.debug(
-                    "Request ineligible: prompt too large for batching",
-                    extra={
-                        "token_count": token_count,
-                        "per_request_limit": per_request_limit,
-                        "model": model,
-                    },
-                )
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Request ineligible: prompt too large for batching",
+                        extra={
+                            "token_count": token_count,
+                            "per_request_limit": per_request_limit,
+                            "model": model,
+                        },
+                    )
                 return BatchEligibility(
                     eligible=False,
                     reason=(
@@ -206,50 +395,122 @@ class BatchEngine:
                     ),
                 )
 
-        # Eligible: compute batch group and max wait
-        batch_group = f"{task_type}:{model}"
-        estimated_inference_ms = self._estimate_inference_ms(model)
+        # Eligible: compute max wait
         max_wait_ms = min(
             max(0, latency_budget_ms - estimated_inference_ms),
-            self._config.max_wait_ms,
+            self._max_wait_ms,
         )
 
-        logger.info(
-            "Request eligible for batching",
-            extra={
-                "batch_group": batch_group,
-                "max_wait_ms": max_wait_ms,
-                "token_count": token_count,
-            },
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Request eligible for batching",
+                extra={
+                    "batch_group": batch_group,
+                    "max_wait_ms": max_wait_ms,
+                    "token_count": token_count,
+                },
+            )
+
+        return _eligible(
+            batch_group, int(max_wait_ms), estimated_inference_ms
         )
 
-        return BatchEligibility(
-            eligible=True,
-            reason="Request is eligible for batching",
-            batch_group=batch_group,
-            max_wait_ms=max_wait_ms,
+    def _per_request_limit(self, model: str) -> Optional[int]:
+        """Return the model's token capacity divided across a full batch.
+
+        Computed once per model and memoised.
+
+        Args:
+            model: Model name to look up.
+
+        Returns:
+            Max tokens per batched request, or ``None`` if capacity is unknown.
+        """
+        if model in self._per_request_limit_cache:
+            return self._per_request_limit_cache[model]
+        max_tokens = self._get_max_input_tokens(model)
+        limit = None if max_tokens is None else max_tokens // self._max_batch_size
+        self._per_request_limit_cache[model] = limit
+        return limit
+
+    def _group_key(self, task_type: str, model: str) -> str:
+        """Return the interned batch group key for a task type and model.
+
+        Args:
+            task_type: Eligible task type.
+            model: Target model name.
+
+        Returns:
+            Group key of the form ``"task_type:model"``.
+        """
+        key = (task_type, model)
+        group = self._group_key_cache.get(key)
+        if group is None:
+            group = self._group_key_cache[key] = sys.intern(f"{task_type}:{model}")
+        return group
+
+    def _resolve_route(
+        self, task_type: str, model: str
+    ) -> Tuple[str, Optional[int], int]:
+        """Resolve and memoise the per-(task type, model) evaluation inputs.
+
+        Args:
+            task_type: Eligible task type.
+            model: Target model name.
+
+        Returns:
+            Tuple of ``(batch_group, per_request_limit, inference_ms)``.
+        """
+        route = (
+            self._group_key(task_type, model),
+            self._per_request_limit(model),
+            self._estimate_inference_ms(model),
         )
+        self._route_cache[(task_type, model)] = route
+        return route
 
-    def _get_max_input_tokens(self, model: str) -> Optional[int]:
-        """Look up model's max input token capacity.
+    def clear_profile_cache(self) -> None:
+        """Forget memoised model lookups (call after the registry changes)."""
+        self._profile_cache.clear()
+        self._per_request_limit_cache.clear()
+        self._route_cache.clear()
+
+    def _profile(self, model: str) -> Optional[ModelProfile]:
+        """Look up a model profile once and memoise the result.
 
         Args:
             model: Model name to look up.
 
         Returns:
-            Max input tokens, or ``None`` if registry is unavailable.
+            The model's profile, or ``None`` if the registry is unavailable
+            or does not know the model.
         """
-        if self._registry is None:
-            return None
-        try:
-            profile = self._registry.get(model)
-            return profile.max_input_tokens
-        except Exception:
+        if model in self._profile_cache:
+            return self._profile_cache[model]
+        profile = (
+            self._registry.get_or_none(model)
+            if self._registry is not None
+            else None
+        )
+        if profile is None and self._registry is not None:
             logger.warning(
-                "Could not look up model capacity; skipping token check",
+                "Model not in registry; using defaults",
                 extra={"model": model},
             )
-            return None
+        self._profile_cache[model] = profile
+        return profile
+
+    def _get_max_input_tokens(self, model: str) -> Optional[int]:
+        """Look up model's max input token capacity.
+
+        Args:
+            model: Model name to look up.
+
+        Returns:
+            Max input tokens, or ``None`` if the profile is unavailable.
+        """
+        profile = self._profile(model)
+        return profile.max_input_tokens if profile is not None else None
 
     def _estimate_inference_ms(self, model: str) -> int:
         """Estimate inference latency for a model.
@@ -260,10 +521,5 @@ class BatchEngine:
         Returns:
             Estimated latency in ms, or a conservative default.
         """
-        if self._registry is None:
-            return 100  # conservative default
-        try:
-            profile = self._registry.get(model)
-            return profile.avg_latency_ms
-        except Exception:
-            return 100
+        profile = self._profile(model)
+        return profile.avg_latency_ms if profile is not None else 100
@@ -1,22 +1,54 @@
 """
 Thread-safe request queue for Asahi batch scheduling.
 
-Holds pending requests organised by batch group.  All mutations are
-protected by a ``threading.Lock`` so the queue is safe for concurrent
-producers (API handlers) and a single consumer (the batch scheduler).
+Holds pending requests organised by batch group.  Each group has its own
+``threading.Lock`` and the request-id index is lock-striped, so concurrent
+producers (API handlers) and the consumer (the batch scheduler) only
+contend when they touch the same group.
 """
 
 import logging
+import sys
 import threading
-from collections import defaultdict
-from concurrent.futures import Future
+import time
+from concurrent.futures import Future, InvalidStateError
+from contextlib import ExitStack, nullcontext
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional
-
-from pydantic import BaseModel, Field
+from heapq import heapify, heappop, heappush
+from itertools import count, islice
+from typing import (
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from pydantic import BaseModel, Field, PrivateAttr
 
 logger = logging.getLogger(__name__)
 
+# Called after each enqueue with (batch_group, new group size)
+EnqueueListener = Callable[[str, int], None]
+
+# How long past its dispatch deadline a caller keeps waiting on a queued
+# request's future before giving up and running it individually.
+DISPATCH_GRACE_MS = 2000
+
+
+_NS_PER_MS = 1_000_000
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+_now_ns = time.monotonic_ns
+
+# Stands in for every lock of a RequestQueue built with thread_safe=False
+_NO_LOCK: ContextManager[Any] = nullcontext()
+
 
 class QueuedRequest(BaseModel):
     """A single request waiting in the batch queue.
@@ -30,6 +62,14 @@ class QueuedRequest(BaseModel):
         deadline: UTC timestamp by which this request must be dispatched.
         future: Resolved with InferenceResult when the batch completes (thread-safe).
         infer_kwargs: Arguments to pass to optimizer.infer() when executing this request.
+        estimated_latency_ms: Expected inference latency once dispatched
+            (0 when unknown).  Used to drop requests that can no longer
+            finish before their caller stops waiting.
+
+    Ages and deadline checks run on the monotonic clock, anchored at the
+    :func:`time.monotonic_ns` reading taken when the request is created.
+    Only the *difference* ``deadline - enqueued_at`` is read from the
+    datetimes, so wall-clock steps (NTP, manual changes) never shift them.
     """
 
     request_id: str
@@ -40,9 +80,190 @@ class QueuedRequest(BaseModel):
     deadline: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     future: Optional[Future] = Field(default=None, exclude=True)
     infer_kwargs: Dict[str, Any] = Field(default_factory=dict)
+    estimated_latency_ms: int = 0
 
     model_config = {"arbitrary_types_allowed": True}
 
+    _enqueued_ns: int = PrivateAttr(default_factory=time.monotonic_ns)
+
+    @property
+    def enqueued_ns(self) -> int:
+        """Monotonic ns timestamp taken when the request was created."""
+        return self._enqueued_ns
+
+    def deadline_ns(self) -> int:
+        """``deadline`` on the monotonic clock, relative to ``enqueued_ns``."""
+        wait = self.deadline - self.enqueued_at
+        return self._enqueued_ns + (wait // _ONE_MICROSECOND) * 1000
+
+    def ms_until_deadline(self) -> float:
+        """Milliseconds left until ``deadline`` (negative once past it).
+
+        Measured on the monotonic clock, like every deadline check in the
+        queue, so wall-clock adjustments don't shift it.
+        """
+        return (self.deadline_ns() - _now_ns()) / _NS_PER_MS
+
+
+class GroupSummary(NamedTuple):
+    """Scheduling state of one batch group, as returned by ``snapshot()``.
+
+    Attributes:
+        group: Batch group key.
+        size: Number of queued requests.
+        oldest_age_ms: Age of the oldest request in milliseconds.
+        deadline_expired: Whether any request is past its deadline.
+        ms_until_deadline: Milliseconds until the earliest deadline in the
+            group (``<= 0`` once expired).
+    """
+
+    group: str
+    size: int
+    oldest_age_ms: int
+    deadline_expired: bool
+    ms_until_deadline: int
+
+
+class _QRec:
+    """Internal queue record wrapping a :class:`QueuedRequest`.
+
+    Holds the fields the queue touches on every scheduler tick as plain
+    slots (integer monotonic ns instead of datetimes) so the hot path never
+    goes through Pydantic attribute access.  ``prev``/``next`` make it a
+    node of its group's intrusive doubly-linked list; ``queued`` tells the
+    group's deadline heap whether an entry is still live.
+    """
+
+    __slots__ = (
+        "deadline_ns",
+        "enqueued_ns",
+        "group",
+        "next",
+        "prev",
+        "queued",
+        "request",
+        "request_id",
+    )
+
+    def __init__(self, request: QueuedRequest) -> None:
+        self.request = request
+        self.request_id = request.request_id
+        # Interned so every dict probe on the group key (group table,
+        # snapshot, get_batch) hits the identity fast path
+        self.group = sys.intern(request.batch_group)
+        self.enqueued_ns = request.enqueued_ns
+        self.deadline_ns = request.deadline_ns()
+        self.prev: Optional[_QRec] = None
+        self.next: Optional[_QRec] = None
+        self.queued = False
+
+
+def _deadline(rec: _QRec) -> int:
+    """Sort key: dispatch deadline."""
+    return rec.deadline_ns
+
+
+def _fail_abandoned(abandoned: List[_QRec]) -> None:
+    """Complete still-pending futures of abandoned requests with TimeoutError.
+
+    Must be called outside queue locks: done-callbacks run inline.
+    """
+    for rec in abandoned:
+        future = rec.request.future
+        if future is not None and not future.done():
+            try:
+                future.set_exception(
+                    TimeoutError("Request abandoned past its batch deadline")
+                )
+            except InvalidStateError:
+                pass  # cancelled by the caller meanwhile
+
+
+class _GroupList:
+    """FIFO of :class:`_QRec` nodes for one batch group.
+
+    An intrusive doubly-linked list: append and pop at the ends, and
+    unlinking an arbitrary node (``RequestQueue.remove``), are all O(1).
+    Deadlines are additionally kept in a min-heap with lazy deletion, so
+    finding the new earliest deadline after a removal is O(log n) rather
+    than a scan of the whole group.
+    """
+
+    __slots__ = (
+        "_deadlines",
+        "_seq",
+        "earliest_deadline",
+        "head",
+        "lock",
+        "size",
+        "tail",
+    )
+
+    def __init__(self, lock: Optional[ContextManager[Any]] = None) -> None:
+        self.head: Optional[_QRec] = None
+        self.tail: Optional[_QRec] = None
+        self.size = 0
+        # Earliest deadline_ns among queued nodes (None when empty).  Written
+        # under ``lock``; read without it as a single atomic reference.
+        self.earliest_deadline: Optional[int] = None
+        self.lock = lock if lock is not None else threading.Lock()
+        # (deadline_ns, seq, rec); entries whose rec left the list are stale
+        self._deadlines: List[Tuple[int, int, _QRec]] = []
+        self._seq = count()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self) -> Iterator[_QRec]:
+        node = self.head
+        while node is not None:
+            yield node
+            node = node.next
+
+    def append(self, rec: _QRec) -> None:
+        rec.prev = self.tail
+        rec.next = None
+        if self.tail is None:
+            self.head = rec
+        else:
+            self.tail.next = rec
+        self.tail = rec
+        self.size += 1
+        rec.queued = True
+        heappush(self._deadlines, (rec.deadline_ns, next(self._seq), rec))
+        self.earliest_deadline = self._deadlines[0][0]
+
+    def popleft(self) -> _QRec:
+        rec = self.head
+        if rec is None:
+            raise IndexError("pop from empty group")
+        self.unlink(rec)
+        return rec
+
+    def unlink(self, rec: _QRec) -> None:
+        if rec.prev is None:
+            self.head = rec.next
+        else:
+            rec.prev.next = rec.next
+        if rec.next is None:
+            self.tail = rec.prev
+        else:
+            rec.next.prev = rec.prev
+        rec.prev = rec.next = None
+        rec.queued = False
+        self.size -= 1
+
+    def refresh_earliest(self) -> None:
+        """Recompute ``earliest_deadline`` after nodes were unlinked."""
+        heap = self._deadlines
+        if len(heap) > 2 * self.size + 32:
+            # Mostly stale entries: rebuild from the live nodes
+            heap[:] = [entry for entry in heap if entry[2].queued]
+            heapify(heap)
+        while heap and not heap[0][2].queued:
+            heappop(heap)
+        self.earliest_deadline = heap[0][0] if heap else None
+
 
 class RequestQueue:
     """Thread-safe queue for pending batch requests.
@@ -51,15 +272,74 @@ class RequestQueue:
     inspects the queue to decide when to flush a group.
 
     Thread safety:
-        Every public method acquires an internal ``threading.Lock``
-        before reading or mutating state.
+        Each group is guarded by its own lock, and the request-id index is
+        split across ``_INDEX_STRIPES`` independently locked shards.  Locks
+        are always taken group first, then index stripe.  A group's list
+        object is never discarded once created, so producers holding a
+        reference can't race with a consumer emptying it.
+
+    Args:
+        thread_safe: When ``False`` every lock is replaced by a no-op
+            context manager.  Only for queues confined to a single thread
+            (e.g. producers and consumer on one event loop); the API
+            server's queue is fed from worker threads and must keep the
+            default.
     """
 
-    def __init__(self) -> None:
-        self._lock = threading.Lock()
-        self._groups: Dict[str, List[QueuedRequest]] = defaultdict(list)
-        self._request_index: Dict[str, str] = {}  # request_id -> group
-        logger.info("RequestQueue initialised")
+    _INDEX_STRIPES = 16
+
+    def __init__(self, thread_safe: bool = True) -> None:
+        self._thread_safe = thread_safe
+        # Guards creation of new groups only; lookups are lock-free.
+        self._struct_lock = self._new_lock()
+        self._groups: Dict[str, _GroupList] = {}
+        # request_id -> node, striped by hash(request_id)
+        self._index_locks = [self._new_lock() for _ in range(self._INDEX_STRIPES)]
+        self._index_shards: List[Dict[str, _QRec]] = [
+            {} for _ in range(self._INDEX_STRIPES)
+        ]
+        self._enqueue_listeners: List[EnqueueListener] = []
+        logger.info("RequestQueue initialised", extra={"thread_safe": thread_safe})
+
+    def _new_lock(self) -> ContextManager[Any]:
+        """Return a real lock, or the shared no-op one when not thread-safe."""
+        return threading.Lock() if self._thread_safe else _NO_LOCK
+
+    def add_enqueue_listener(self, listener: EnqueueListener) -> None:
+        """Register a callback invoked after requests are enqueued.
+
+        The callback receives the batch group and its size after the
+        enqueue, and runs on the producer's thread outside any queue lock,
+        so it must be cheap (e.g. setting a :class:`threading.Event`).
+
+        Args:
+            listener: Callable taking ``(batch_group, group_size)``.
+        """
+        self._enqueue_listeners.append(listener)
+
+    def _notify_enqueued(self, group: str, group_size: int) -> None:
+        """Invoke enqueue listeners for one group."""
+        for listener in self._enqueue_listeners:
+            listener(group, group_size)
+
+    def _group(self, group: str) -> _GroupList:
+        """Return the list for *group*, creating it on first use."""
+        items = self._groups.get(group)
+        if items is None:
+            with self._struct_lock:
+                items = self._groups.get(group)
+                if items is None:
+                    items = self._groups[group] = _GroupList(self._new_lock())
+        return items
+
+    def _stripe(self, request_id: str) -> int:
+        """Return the index stripe a request id belongs to."""
+        return hash(request_id) % self._INDEX_STRIPES
+
+    def _group_snapshot(self) -> List[Tuple[str, _GroupList]]:
+        """Return a stable copy of ``(name, list)`` pairs."""
+        with self._struct_lock:
+            return list(self._groups.items())
 
     def enqueue(self, request: QueuedRequest) -> None:
         """Add a request to the queue.
@@ -70,27 +350,103 @@ class RequestQueue:
         Raises:
             ValueError: If a request with the same ``request_id`` is already queued.
         """
-        with self._lock:
-            if request.request_id in self._request_index:
-                raise ValueError(
-                    f"Request '{request.request_id}' is already in the queue"
-                )
-            self._groups[request.batch_group].append(request)
-            self._request_index[request.request_id] = request.batch_group
-
+        rec = _QRec(request)
+        items = self._group(rec.group)
+        stripe = self._stripe(rec.request_id)
+        with items.lock:
+            with self._index_locks[stripe]:
+                shard = self._index_shards[stripe]
+                if rec.request_id in shard:
+                    raise ValueError(
+                        f"Request '{request.request_id}' is already in the queue"
+                    )
+                shard[rec.request_id] = rec
+            items.append(rec)
+            group_size = len(items)
+
+        self._notify_enqueued(rec.group, group_size)
+
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
                 "Request enqueued",
                 extra={
                     "request_id": request.request_id,
                     "batch_group": request.batch_group,
-                    "group_size": len(self._groups[request.batch_group]),
+                    "group_size": group_size,
                 },
             )
 
+    def enqueue_many(self, requests: Sequence[QueuedRequest]) -> None:
+        """Add several requests to the queue in one atomic step.
+
+        Each affected group's lock and index stripe is taken once for the
+        whole call rather than once per request.  Either every request is
+        queued or, on error, none is.
+
+        Args:
+            requests: Requests to enqueue.  Each must have ``batch_group`` set.
+
+        Raises:
+            ValueError: If a ``request_id`` is repeated in *requests* or is
+                already queued.
+        """
+        if not requests:
+            return
+        recs = [_QRec(request) for request in requests]
+        by_group: Dict[str, List[_QRec]] = {}
+        by_stripe: Dict[int, List[_QRec]] = {}
+        for rec in recs:
+            by_group.setdefault(rec.group, []).append(rec)
+            by_stripe.setdefault(self._stripe(rec.request_id), []).append(rec)
+        if len({rec.request_id for rec in recs}) != len(recs):
+            raise ValueError("Duplicate request_id in enqueue_many batch")
+
+        groups = {group: self._group(group) for group in by_group}
+        with ExitStack() as stack:
+            # Same order as single-request methods: groups, then stripes;
+            # sorted so two concurrent batches can't deadlock.
+            for group in sorted(groups):
+                stack.enter_context(groups[group].lock)
+            for stripe in sorted(by_stripe):
+                stack.enter_context(self._index_locks[stripe])
+
+            for stripe, stripe_recs in by_stripe.items():
+                shard = self._index_shards[stripe]
+                for rec in stripe_recs:
+                    if rec.request_id in shard:
+                        raise ValueError(
+                            f"Request '{rec.request_id}' is already in the queue"
+                        )
+            for stripe, stripe_recs in by_stripe.items():
+                shard = self._index_shards[stripe]
+                for rec in stripe_recs:
+                    shard[rec.request_id] = rec
+            group_sizes: Dict[str, int] = {}
+            for group, group_recs in by_group.items():
+                items = groups[group]
+                append = items.append
+                for rec in group_recs:
+                    append(rec)
+                group_sizes[group] = len(items)
+
+        for group, group_size in group_sizes.items():
+            self._notify_enqueued(group, group_size)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Requests enqueued",
+                extra={"count": len(recs), "groups": len(by_group)},
+            )
+
     def get_batch(self, group: str, max_size: int) -> List[QueuedRequest]:
         """Atomically pop up to ``max_size`` requests from a group.
 
-        The popped requests are removed from the queue.
+        The popped requests are removed from the queue.  Requests whose
+        caller has already stopped waiting -- the future is done or
+        cancelled, or the deadline is more than :data:`DISPATCH_GRACE_MS`
+        in the past -- are discarded instead of being returned, so they
+        don't take a batch slot or cost an inference.  Abandoned futures
+        that are still pending are completed with :class:`TimeoutError`.
 
         Args:
             group: Batch group key.
@@ -100,25 +456,128 @@ class RequestQueue:
             List of requests (may be empty if the group does not exist
             or is already empty).
         """
-        with self._lock:
-            if group not in self._groups or not self._groups[group]:
+        items = self._groups.get(group)
+        if items is None:
+            return []
+
+        abandon_before_ns = _now_ns() - DISPATCH_GRACE_MS * _NS_PER_MS
+        batch: List[_QRec] = []
+        abandoned: List[_QRec] = []
+        with items.lock:
+            if not items:
                 return []
 
-            batch = self._groups[group][:max_size]
-            self._groups[group] = self._groups[group][max_size:]
+            earliest = items.earliest_deadline
+            removed_earliest = False
+            while items and len(batch) < max_size:
+                rec = items.popleft()
+                stripe = self._stripe(rec.request_id)
+                with self._index_locks[stripe]:
+                    self._index_shards[stripe].pop(rec.request_id, None)
+                if rec.deadline_ns == earliest:
+                    removed_earliest = True
+
+                future = rec.request.future
+                if rec.deadline_ns <= abandon_before_ns or (
+                    future is not None and future.done()
+                ):
+                    abandoned.append(rec)
+                else:
+                    batch.append(rec)
+
+            if removed_earliest or not items:
+                items.refresh_earliest()
+
+        # Complete futures outside the lock: done-callbacks run inline
+        _fail_abandoned(abandoned)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Batch popped",
+                extra={
+                    "group": group,
+                    "batch_size": len(batch),
+                    "abandoned": len(abandoned),
+                },
+            )
+        return [rec.request for rec in batch]
+
+    def get_batch_prioritized(
+        self, group: str, max_size: int, urgent_window_ms: int
+    ) -> List[QueuedRequest]:
+        """Atomically pop up to ``max_size`` requests, most urgent first.
+
+        Unlike :meth:`get_batch`, which is strictly FIFO, the whole group
+        is considered.  Requests with less than ``urgent_window_ms`` left
+        before their deadline are *urgent* and taken first; the remaining
+        slots go to the other requests.  Both sets are taken in order of
+        earliest deadline, and the normal set is only sorted when the
+        urgent requests leave room in the batch.  The
+        returned list is in that order, so a streaming executor answers
+        urgent requests first.  Abandoned requests are discarded as in
+        :meth:`get_batch`.
 
-            for req in batch:
-                self._request_index.pop(req.request_id, None)
+        Args:
+            group: Batch group key.
+            max_size: Maximum number of requests to return.
+            urgent_window_ms: Remaining time below which a request is urgent.
 
-            # Clean up empty groups
-            if not self._groups[group]:
-                del self._groups[group]
+        Returns:
+            List of requests (may be empty if the group does not exist
+            or is already empty).
+        """
+        items = self._groups.get(group)
+        if items is None:
+            return []
+
+        now_ns = _now_ns()
+        abandon_before_ns = now_ns - DISPATCH_GRACE_MS * _NS_PER_MS
+        urgent_before_ns = now_ns + urgent_window_ms * _NS_PER_MS
+        urgent: List[_QRec] = []
+        normal: List[_QRec] = []
+        abandoned: List[_QRec] = []
+        with items.lock:
+            if not items:
+                return []
 
+            for rec in items:
+                future = rec.request.future
+                if rec.deadline_ns <= abandon_before_ns or (
+                    future is not None and future.done()
+                ):
+                    abandoned.append(rec)
+                elif rec.deadline_ns < urgent_before_ns:
+                    urgent.append(rec)
+                else:
+                    normal.append(rec)
+
+            # Stable sorts: ties keep FIFO order
+            if len(urgent) > 1:
+                urgent.sort(key=_deadline)
+            if len(urgent) < max_size and len(normal) > 1:
+                normal.sort(key=_deadline)
+            batch = (urgent + normal)[:max_size]
+
+            for rec in abandoned + batch:
+                stripe = self._stripe(rec.request_id)
+                with self._index_locks[stripe]:
+                    self._index_shards[stripe].pop(rec.request_id, None)
+                items.unlink(rec)
+            items.refresh_earliest()
+
+        _fail_abandoned(abandoned)
+
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                "Batch popped",
-                extra={"group": group, "batch_size": len(batch)},
+                "Prioritized batch popped",
+                extra={
+                    "group": group,
+                    "batch_size": len(batch),
+                    "urgent": min(len(urgent), len(batch)),
+                    "abandoned": len(abandoned),
+                },
             )
-            return batch
+        return [rec.request for rec in batch]
 
     def peek(self, group: str, max_size: Optional[int] = None) -> List[QueuedRequest]:
         """Return requests from a group without removing them.
@@ -131,11 +590,30 @@ class RequestQueue:
         Returns:
             List of requests (may be empty).
         """
-        with self._lock:
-            items = self._groups.get(group, [])
-            if max_size is not None:
-                return list(items[:max_size])
-            return list(items)
+        return list(self.peek_iter(group, max_size))
+
+    def peek_iter(
+        self, group: str, max_size: Optional[int] = None
+    ) -> Iterator[QueuedRequest]:
+        """Iterate over requests in a group without removing them.
+
+        The group is snapshotted into a tuple under its lock, so the
+        iterator is unaffected by later queue mutations and callers that
+        only loop over the result skip building a list.
+
+        Args:
+            group: Batch group key.
+            max_size: Maximum number of requests to yield.
+                ``None`` yields all.
+
+        Returns:
+            Iterator over the requests, oldest first.
+        """
+        items = self._groups.get(group)
+        if items is None:
+            return iter(())
+        with items.lock:
+            return iter(tuple(rec.request for rec in islice(items, max_size)))
 
     def get_expired_groups(self) -> List[str]:
         """Return groups that contain at least one request past its deadline.
@@ -143,17 +621,42 @@ class RequestQueue:
         Returns:
             List of group keys with expired requests.
         """
-        now = datetime.now(timezone.utc)
+        now_ns = _now_ns()
         expired: List[str] = []
+        for group, items in self._group_snapshot():
+            deadline_ns = items.earliest_deadline
+            if deadline_ns is not None and deadline_ns <= now_ns:
+                expired.append(group)
+        return expired
 
-        with self._lock:
-            for group, requests in self._groups.items():
-                for req in requests:
-                    if req.deadline <= now:
-                        expired.append(group)
-                        break
+    def snapshot(self) -> List[GroupSummary]:
+        """Return per-group scheduling state in a single pass.
 
-        return expired
+        Gathers everything the scheduler needs for one tick, taking each
+        group's lock once instead of once per accessor call.
+
+        Returns:
+            A :class:`GroupSummary` for every non-empty group.
+        """
+        now_ns = _now_ns()
+        result: List[GroupSummary] = []
+        for group, items in self._group_snapshot():
+            with items.lock:
+                head = items.head
+                if head is None:
+                    continue
+                # Non-empty groups always have an earliest deadline
+                earliest = items.earliest_deadline or now_ns
+                result.append(
+                    GroupSummary(
+                        group,
+                        items.size,
+                        (now_ns - head.enqueued_ns) // _NS_PER_MS,
+                        earliest <= now_ns,
+                        (earliest - now_ns) // _NS_PER_MS,
+                    )
+                )
+        return result
 
     def get_all_groups(self) -> List[str]:
         """Return all non-empty group keys.
@@ -161,8 +664,7 @@ class RequestQueue:
         Returns:
             List of group key strings.
         """
-        with self._lock:
-            return [g for g, items in self._groups.items() if items]
+        return [g for g, items in self._group_snapshot() if items]
 
     def size(self, group: Optional[str] = None) -> int:
         """Return the number of queued requests.
@@ -174,10 +676,10 @@ class RequestQueue:
         Returns:
             Request count.
         """
-        with self._lock:
-            if group is not None:
-                return len(self._groups.get(group, []))
-            return sum(len(items) for items in self._groups.values())
+        if group is not None:
+            items = self._groups.get(group)
+            return len(items) if items is not None else 0
+        return sum(len(items) for _, items in self._group_snapshot())
 
     def remove(self, request_id: str) -> bool:
         """Remove a specific request by ID.
@@ -189,26 +691,32 @@ class RequestQueue:
             ``True`` if the request was found and removed,
             ``False`` otherwise.
         """
-        with self._lock:
-            group = self._request_index.pop(request_id, None)
-            if group is None:
-                return False
-
-            items = self._groups.get(group, [])
-            for idx, req in enumerate(items):
-                if req.request_id == request_id:
-                    items.pop(idx)
-                    break
-
-            # Clean up empty groups
-            if group in self._groups and not self._groups[group]:
-                del self._groups[group]
-
+        stripe = self._stripe(request_id)
+        index_lock = self._index_locks[stripe]
+        shard = self._index_shards[stripe]
+        with index_lock:
+            rec = shard.get(request_id)
+        if rec is None:
+            return False
+
+        items = self._groups[rec.group]
+        with items.lock:
+            with index_lock:
+                # Re-check: the consumer may have popped it meanwhile
+                if shard.get(request_id) is not rec:
+                    return False
+                del shard[request_id]
+            items.unlink(rec)
+
+            if rec.deadline_ns == items.earliest_deadline or not items:
+                items.refresh_earliest()
+
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
                 "Request removed",
-                extra={"request_id": request_id, "group": group},
+                extra={"request_id": request_id, "group": rec.group},
             )
-            return True
+        return True
 
     def has_deadline_expired(self, group: str) -> bool:
         """Check whether any request in a group has passed its deadline.
@@ -219,12 +727,11 @@ class RequestQueue:
         Returns:
             ``True`` if at least one request is past deadline.
         """
-        now = datetime.now(timezone.utc)
-        with self._lock:
-            for req in self._groups.get(group, []):
-                if req.deadline <= now:
-                    return True
-        return False
+        items = self._groups.get(group)
+        if items is None:
+            return False
+        earliest = items.earliest_deadline
+        return earliest is not None and earliest <= _now_ns()
 
     def oldest_request_age_ms(self, group: str) -> int:
         """Return the age of the oldest request in a group in milliseconds.
@@ -235,11 +742,12 @@ class RequestQueue:
         Returns:
             Age in milliseconds, or ``0`` if the group is empty.
         """
-        now = datetime.now(timezone.utc)
-        with self._lock:
-            items = self._groups.get(group, [])
-            if not items:
+        items = self._groups.get(group)
+        if items is None:
+            return 0
+        now_ns = _now_ns()
+        with items.lock:
+            head = items.head
+            if head is None:
                 return 0
-            oldest = items[0].enqueued_at
-            delta = now - oldest
-            return int(delta.total_seconds() * 1000)
+            return (now_ns - head.enqueued_ns) // _NS_PER_MS
@@ -8,25 +8,57 @@ to an executor callback.  Runs in its own daemon thread.
 
 import logging
 import threading
-import time
-from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Callable, Dict, Iterable, List, Optional
 
 from src.batching.engine import BatchConfig
-from src.batching.queue import QueuedRequest, RequestQueue
+from src.batching.queue import DISPATCH_GRACE_MS, QueuedRequest, RequestQueue
 from src.core.optimizer import InferenceResult
 from src.exceptions import BatchingError
 
 logger = logging.getLogger(__name__)
 
-# Executor receives a batch and returns one InferenceResult per request
-BatchExecutor = Callable[[List[QueuedRequest]], List[InferenceResult]]
+# Indexes into BatchScheduler._counters
+_C_BATCHES, _C_PROCESSED, _C_ERRORS, _C_FALLBACKS, _C_DROPPED = range(5)
+
+# Floor for the adaptive wait so an overdue group can't spin the loop
+_MIN_WAIT_S = 0.001
+
+# Executor receives a batch and returns (or yields) one InferenceResult per
+# request, in batch order.  Yielded results are delivered as they arrive.
+BatchExecutor = Callable[[List[QueuedRequest]], Iterable[InferenceResult]]
+
+
+def _set_result(future: Optional[Future], result: InferenceResult) -> None:
+    """Complete *future* with *result* unless it is already done.
+
+    ``Future.set_result`` itself rejects a finished future, so one call
+    replaces a ``done()`` pre-check that would still race with the
+    waiting caller cancelling it.
+    """
+    if future is not None:
+        try:
+            future.set_result(result)
+        except InvalidStateError:
+            pass
+
+
+def _set_exception(future: Optional[Future], exc: BaseException) -> None:
+    """Fail *future* with *exc* unless it is already done."""
+    if future is not None:
+        try:
+            future.set_exception(exc)
+        except InvalidStateError:
+            pass
 
 
 class BatchScheduler:
     """Background scheduler that forms and dispatches request batches.
 
-    The scheduler runs a polling loop (default every 50 ms) that inspects
-    the queue and flushes groups when one of three conditions is met:
+    The scheduler runs a loop that inspects the queue at least every
+    ``poll_interval_ms`` (default 50 ms), and immediately when an enqueue
+    fills a group to ``max_batch_size``.  It flushes groups when one of
+    three conditions is met:
 
     1. **Size threshold** -- the group has ``max_batch_size`` requests.
     2. **Deadline** -- at least one request in the group has passed its
@@ -54,16 +86,25 @@ class BatchScheduler:
         self._executor = executor
         self._config = config or BatchConfig()
         self._poll_interval_s = poll_interval_ms / 1000.0
+        # Tick loop invariants, hoisted out of the per-tick path
+        self._max_batch_size = self._config.max_batch_size
+        self._min_batch_size = self._config.min_batch_size
+        self._approach_threshold_ms = int(self._config.max_wait_ms * 0.7)
+        self._urgent_window_ms = self._config.urgent_window_ms
 
         self._thread: Optional[threading.Thread] = None
         self._running = threading.Event()
         self._lock = threading.Lock()
+        # Set to end the current wait early (full group, stop())
+        self._wake = threading.Event()
+        self._queue.add_enqueue_listener(self._on_enqueue)
 
-        # Counters
-        self._batches_executed: int = 0
-        self._requests_processed: int = 0
-        self._batch_errors: int = 0
-        self._individual_fallbacks: int = 0
+        # Counters, indexed by the _C_* constants.  Related counters (a
+        # batch and its requests) are bumped together under _stats_lock,
+        # and stats() copies them under it, so it never sees a torn view.
+        # Separate from _lock so stats never wait on start()/stop().
+        self._counters: List[int] = [0, 0, 0, 0, 0]
+        self._stats_lock = threading.Lock()
 
         logger.info(
             "BatchScheduler initialised",
@@ -110,6 +151,7 @@ class BatchScheduler:
             if not self._running.is_set():
                 return
             self._running.clear()
+            self._wake.set()
 
         if self._thread is not None:
             self._thread.join(timeout=timeout)
@@ -138,19 +180,26 @@ class BatchScheduler:
         if batch:
             self._execute_batch(batch)
 
+    def notify(self) -> None:
+        """Wake the scheduler loop to run a tick now instead of at the next poll."""
+        self._wake.set()
+
     def stats(self) -> Dict[str, Any]:
         """Return scheduler statistics.
 
         Returns:
             Dict with counters for batches executed, requests processed,
-            errors, fallbacks, queue size, and running state.
+            errors, fallbacks, deadline drops, queue size, and running state.
         """
+        with self._stats_lock:
+            batches, processed, errors, fallbacks, dropped = self._counters
         return {
             "running": self._running.is_set(),
-            "batches_executed": self._batches_executed,
-            "requests_processed": self._requests_processed,
-            "batch_errors": self._batch_errors,
-            "individual_fallbacks": self._individual_fallbacks,
+            "batches_executed": batches,
+            "requests_processed": processed,
+            "batch_errors": errors,
+            "individual_fallbacks": fallbacks,
+            "deadline_drops": dropped,
             "queue_size": self._queue.size(),
         }
 
@@ -163,8 +212,12 @@ class BatchScheduler:
         logger.debug("Scheduler loop started")
         try:
             while self._running.is_set():
-                self._tick()
-                time.sleep(self._poll_interval_s)
+                next_flush_s = self._tick()
+                timeout = self._poll_interval_s
+                if next_flush_s is not None:
+                    timeout = min(timeout, max(_MIN_WAIT_S, next_flush_s))
+                self._wake.wait(timeout=timeout)
+                self._wake.clear()
         except Exception as exc:
             logger.error(
                 "Scheduler loop crashed; draining queue",
@@ -174,63 +227,75 @@ class BatchScheduler:
             self._running.clear()
             self._drain_remaining()
 
-    def _tick(self) -> None:
+    def _on_enqueue(self, group: str, group_size: int) -> None:
+        """Queue listener: wake the loop as soon as a group is full."""
+        if group_size >= self._max_batch_size:
+            self._wake.set()
+
+    def _tick(self) -> Optional[float]:
         """Single iteration of the scheduler loop.
 
         Inspects every group and decides whether to flush based on
         size, deadline, or approaching-deadline heuristics.
-        """
-        groups = self._queue.get_all_groups()
-
-        for group in groups:
-            group_size = self._queue.size(group)
-            if group_size == 0:
-                continue
 
+        Returns:
+            Seconds until the earliest deadline or approaching-deadline
+            flush among groups left queued, or ``None`` if nothing is
+            pending.  The loop uses it to wake just in time instead of
+            waiting a full poll interval.
+        """
+        max_batch_size = self._max_batch_size
+        min_batch_size = self._min_batch_size
+        threshold_ms = self._approach_threshold_ms
+
+        # Decide from one snapshot first, then flush: executing a batch can
+        # take a while and must not interleave with the decision pass.
+        to_flush: List[str] = []
+        next_flush_ms: Optional[int] = None
+        for (
+            group, group_size, oldest_age_ms, expired, ms_until_deadline,
+        ) in self._queue.snapshot():
             # Condition 1: size threshold met
-            if group_size >= self._config.max_batch_size:
-                logger.debug(
-                    "Flushing group: size threshold",
-                    extra={"group": group, "size": group_size},
-                )
-                batch = self._queue.get_batch(
-                    group, self._config.max_batch_size
-                )
-                if batch:
-                    self._execute_batch(batch)
+            if group_size >= max_batch_size:
+                reason = "size threshold"
+            # Condition 2: deadline expired
+            elif expired:
+                reason = "deadline expired"
+            # Condition 3: approaching deadline with enough requests
+            elif group_size >= min_batch_size and oldest_age_ms > threshold_ms:
+                reason = "approaching deadline"
+            else:
+                due_ms = ms_until_deadline
+                if group_size >= min_batch_size:
+                    due_ms = min(due_ms, threshold_ms - oldest_age_ms + 1)
+                if next_flush_ms is None or due_ms < next_flush_ms:
+                    next_flush_ms = due_ms
                 continue
 
-            # Condition 2: deadline expired
-            if self._queue.has_deadline_expired(group):
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(
-                    "Flushing group: deadline expired",
-                    extra={"group": group, "size": group_size},
-                )
-                batch = self._queue.get_batch(
-                    group, self._config.max_batch_size
+                    f"Flushing group: {reason}",
+                    extra={
+                        "group": group,
+                        "size": group_size,
+                        "oldest_age_ms": oldest_age_ms,
+                        "threshold_ms": threshold_ms,
+                    },
                 )
-                if batch:
-                    self._execute_batch(batch)
-                continue
+            to_flush.append(group)
 
-            # Condition 3: approaching deadline with enough requests
-            if group_size >= self._config.min_batch_size:
-                oldest_age_ms = self._queue.oldest_request_age_ms(group)
-                threshold_ms = int(self._config.max_wait_ms * 0.7)
-                if oldest_age_ms > threshold_ms:
-                    logger.debug(
-                        "Flushing group: approaching deadline",
-                        extra={
-                            "group": group,
-                            "oldest_age_ms": oldest_age_ms,
-                            "threshold_ms": threshold_ms,
-                        },
-                    )
-                    batch = self._queue.get_batch(
-                        group, self._config.max_batch_size
-                    )
-                    if batch:
-                        self._execute_batch(batch)
+        for group in to_flush:
+            # Urgent requests first, so a group holding more than one batch
+            # sends the ones closest to their deadline now
+            batch = self._queue.get_batch_prioritized(
+                group, max_batch_size, self._urgent_window_ms
+            )
+            if batch:
+                self._execute_batch(batch)
+            # Leftovers (group held more than one batch) get a prompt re-check
+            next_flush_ms = 0
+
+        return None if next_flush_ms is None else next_flush_ms / 1000.0
 
     # ------------------------------------------------------------------
     # Batch execution
@@ -239,16 +304,27 @@ class BatchScheduler:
     def _execute_batch(self, batch: List[QueuedRequest]) -> None:
         """Execute a batch of requests via the executor callback.
 
-        On failure, falls back to individual execution for each request.
+        Each request's future is completed as soon as its result is
+        produced, so with a generator executor early requests in the batch
+        don't wait for the whole batch.  On failure, requests that have not
+        been answered yet fall back to individual execution.
+
+        Requests that cannot finish before their caller stops waiting are
+        failed up front instead of being sent (see :meth:`_drop_doomed`).
 
         Args:
             batch: List of queued requests to execute together.
         """
+        batch = self._drop_doomed(batch)
+        if not batch:
+            return
         try:
             results = self._executor(batch)
             self._resolve_futures(batch, results)
-            self._batches_executed += 1
-            self._requests_processed += len(batch)
+            with self._stats_lock:
+                counters = self._counters
+                counters[_C_BATCHES] += 1
+                counters[_C_PROCESSED] += len(batch)
 
             logger.info(
                 "Batch executed successfully",
@@ -267,37 +343,87 @@ class BatchScheduler:
                 },
                 exc_info=True,
             )
-            self._batch_errors += 1
-            self._fallback_individual(batch)
+            with self._stats_lock:
+                self._counters[_C_ERRORS] += 1
+            self._fallback_individual([
+                req for req in batch
+                if req.future is None or not req.future.done()
+            ])
+
+    def _drop_doomed(self, batch: List[QueuedRequest]) -> List[QueuedRequest]:
+        """Fail requests whose deadline can no longer be met.
+
+        A caller waits on its future until :data:`DISPATCH_GRACE_MS` past
+        the request's deadline.  If even the request's own estimated
+        inference latency no longer fits in that window, its result would
+        arrive after the caller has given up, so running it only wastes
+        capacity.  Such requests get a :class:`BatchingError` now, which
+        sends the caller to its individual-execution path immediately.
+
+        Args:
+            batch: Requests about to be executed.
+
+        Returns:
+            The requests that can still be served in time.
+        """
+        runnable: List[QueuedRequest] = []
+        doomed: List[QueuedRequest] = []
+        for req in batch:
+            if (
+                req.estimated_latency_ms
+                and req.ms_until_deadline() + DISPATCH_GRACE_MS
+                < req.estimated_latency_ms
+            ):
+                doomed.append(req)
+            else:
+                runnable.append(req)
+        if not doomed:
+            return batch
+
+        for req in doomed:
+            _set_exception(req.future, BatchingError("deadline exceeded"))
+        with self._stats_lock:
+            self._counters[_C_DROPPED] += len(doomed)
+        logger.warning(
+            "Dropped requests that cannot meet their deadline",
+            extra={
+                "dropped": len(doomed),
+                "batch_group": doomed[0].batch_group,
+            },
+        )
+        return runnable
 
     def _resolve_futures(
         self,
         batch: List[QueuedRequest],
-        results: List[InferenceResult],
+        results: Iterable[InferenceResult],
     ) -> None:
         """Resolve each request's future with its corresponding result.
 
-        If the results list is shorter than the batch, remaining futures
-        get an exception.
+        Results are consumed lazily; each future is completed as soon as
+        its result is available.
 
         Args:
             batch: The batch of requests.
             results: InferenceResult per request from the executor.
+
+        Raises:
+            ValueError: If the executor produced fewer or more results
+                than requests.  :meth:`_execute_batch` then runs the
+                unanswered requests individually.
         """
-        for idx, req in enumerate(batch):
-            if req.future is not None and not req.future.done():
-                if idx < len(results):
-                    try:
-                        req.future.set_result(results[idx])
-                    except Exception:
-                        pass
-                else:
-                    try:
-                        req.future.set_exception(
-                            BatchingError("No result returned for request"),
-                        )
-                    except Exception:
-                        pass
+        for req, result in zip(batch, results, strict=True):
+            _set_result(req.future, result)
+
+    def _execute_one(self, req: QueuedRequest) -> InferenceResult:
+        """Run a single request through the executor and return its result.
+
+        Raises:
+            BatchingError: If the executor produced no result.
+        """
+        for result in self._executor([req]):
+            return result
+        raise BatchingError("No result returned for request")
 
     def _fallback_individual(self, batch: List[QueuedRequest]) -> None:
         """Execute each request individually when batch execution fails.
@@ -307,14 +433,10 @@ class BatchScheduler:
         """
         for req in batch:
             try:
-                results = self._executor([req])
-                if req.future is not None and not req.future.done():
-                    try:
-                        req.future.set_result(results[0])
-                    except Exception:
-                        pass
-                self._individual_fallbacks += 1
-                self._requests_processed += 1
+                _set_result(req.future, self._execute_one(req))
+                with self._stats_lock:
+                    self._counters[_C_FALLBACKS] += 1
+                    self._counters[_C_PROCESSED] += 1
             except Exception as exc:
                 logger.error(
                     "Individual fallback also failed",
@@ -324,13 +446,10 @@ class BatchScheduler:
                     },
                     exc_info=True,
                 )
-                if req.future is not None and not req.future.done():
-                    try:
-                        req.future.set_exception(
-                            BatchingError(f"All execution paths failed: {exc}"),
-                        )
-                    except Exception:
-                        pass
+                _set_exception(
+                    req.future,
+                    BatchingError(f"All execution paths failed: {exc}"),
+                )
 
     def _drain_remaining(self) -> None:
         """Drain all remaining queued requests via individual execution."""
@@ -340,13 +459,9 @@ class BatchScheduler:
                 batch = self._queue.get_batch(group, 1)
                 for req in batch:
                     try:
-                        results = self._executor([req])
-                        if req.future is not None and not req.future.done():
-                            try:
-                                req.future.set_result(results[0])
-                            except Exception:
-                                pass
-                        self._requests_processed += 1
+                        _set_result(req.future, self._execute_one(req))
+                        with self._stats_lock:
+                            self._counters[_C_PROCESSED] += 1
                     except Exception as exc:
                         logger.error(
                             "Drain failed for request",
@@ -0,0 +1,20 @@
+"""
+Fast non-cryptographic hashing for cache keys.
+
+Cache keys only need to be deterministic and well distributed, so the
+xxHash3 family is used instead of MD5 throughout the cache package.
+"""
+
+import xxhash
+
+
+def fast_hexdigest(text: str) -> str:
+    """Return the 64-bit xxHash3 hex digest (16 characters) of *text*.
+
+    Args:
+        text: String to hash (UTF-8 encoded).
+
+    Returns:
+        Lower-case hex digest.
+    """
+    return xxhash.xxh3_64_hexdigest(text.encode("utf-8"))
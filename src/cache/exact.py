@@ -1,28 +1,63 @@
 """
 Exact-match caching layer for Asahi inference optimizer (Tier 1).
 
-Stores and retrieves inference responses keyed by MD5 hash of the
-user query.  Ignores system prompts.  Enforces TTL-based expiration.
+Stores and retrieves inference responses keyed by an xxHash3 (128-bit)
+digest of the user query.  Ignores system prompts.  Enforces TTL-based expiration.
 Tracks hit/miss statistics.
 """
 
-import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from itertools import islice
 from typing import Dict, Optional
 
+import xxhash
 from pydantic import BaseModel, Field
 
 from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+_UTC = timezone.utc
+
+
+def generate_cache_key(query: str, org_id: Optional[str] = None) -> str:
+    """Generate a deterministic cache key from a query string.
+
+    Uses the non-cryptographic xxHash3 128-bit digest: keys only need to
+    be well distributed, not collision-resistant, and xxh3 is several
+    times faster than MD5 on prompt-sized inputs.  The digest is the same
+    32 hex characters long as the MD5 keys it replaces.
+
+    Args:
+        query: The user query to hash.
+        org_id: Optional org/tenant ID for cache isolation.
+
+    Returns:
+        Hex-encoded digest, optionally prefixed with org_id.
+    """
+    digest = xxhash.xxh3_128_hexdigest(query.encode("utf-8"))
+    return f"{org_id}:{digest}" if org_id else digest
+
+
+def _raw_cache_key(query: str, org_id: Optional[str] = None) -> bytes:
+    """Binary form of :func:`generate_cache_key` for in-process dict keys.
+
+    Uses the raw 16-byte digest, skipping the hex encoding and halving
+    the key size; the hex string is only built when an entry is stored.
+    """
+    digest = xxhash.xxh3_128_digest(query.encode("utf-8"))
+    return org_id.encode("utf-8") + b":" + digest if org_id else digest
+
 
 class CacheEntry(BaseModel):
     """A single cached inference response.
 
     Attributes:
-        cache_key: MD5 hex digest of the original query.
+        cache_key: Hex digest of the original query (see :func:`generate_cache_key`).
         query: The original user query text.
         response: Cached response text.
         model: Model that produced the response.
@@ -63,33 +98,68 @@ class CacheStats(BaseModel):
 class Cache:
     """In-memory exact-match cache with TTL expiration.
 
-    Uses MD5 hash of the user query as the cache key.  System prompts
-    are intentionally excluded to maximize hit rate.
+    Uses an xxHash3 digest of the user query as the cache key.  System prompts
+    are intentionally excluded to maximize hit rate.  Size is bounded:
+    once ``max_entries`` is reached the least recently used entry is
+    evicted.  All operations are safe to call from multiple threads.
 
     Args:
         ttl_seconds: Time-to-live for cache entries in seconds.
             Defaults to 86400 (24 hours).
+        max_entries: Maximum number of entries kept.  Defaults to
+            ``cache.max_entries`` from settings.
     """
 
-    def __init__(self, ttl_seconds: Optional[int] = None) -> None:
-        self._store: Dict[str, CacheEntry] = {}
-        self._ttl_seconds = ttl_seconds if ttl_seconds is not None else get_settings().cache.ttl_seconds
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        _s = get_settings().cache
+        # Keyed by the binary digest (see _raw_cache_key); the hex key is
+        # kept on CacheEntry.cache_key.  Recency order: LRU first.
+        self._store: OrderedDict[bytes, CacheEntry] = OrderedDict()
+        # key -> absolute time.monotonic() expiry.  Expiry checks compare
+        # floats here instead of building datetimes; the datetimes on
+        # CacheEntry are kept for callers and serialisation.  With one TTL
+        # per cache, insertion order here is also expiry order.
+        self._expiry: Dict[bytes, float] = {}
+        # One lock covers both dicts: recency and expiry order are global,
+        # so they cannot be split across independently locked shards
+        self._lock = threading.Lock()
+        self._ttl_seconds = ttl_seconds if ttl_seconds is not None else _s.ttl_seconds
+        self._ttl_delta = timedelta(seconds=self._ttl_seconds)
+        self._max_entries = max_entries if max_entries is not None else _s.max_entries
         self._hits: int = 0
         self._misses: int = 0
         self._total_cost_saved: float = 0.0
 
     def generate_key(self, query: str, org_id: Optional[str] = None) -> str:
-        """Generate a deterministic MD5 cache key from a query string.
+        """Generate a deterministic cache key from a query string.
 
         Args:
             query: The user query to hash.
             org_id: Optional org/tenant ID for cache isolation.
 
         Returns:
-            Hex-encoded MD5 digest, optionally prefixed with org_id.
+            Hex-encoded digest, optionally prefixed with org_id.
+        """
+        return generate_cache_key(query, org_id)
+
+    def _drop_expired_head(self, now: float, limit: int = 2) -> None:
+        """Drop up to *limit* expired entries from the front (lock held).
+
+        Called on every write so expired entries are reclaimed without
+        waiting for :meth:`cleanup_expired` or for LRU eviction to reach
+        them; the bound keeps each write O(1).
         """
-        digest = hashlib.md5(query.encode("utf-8")).hexdigest()
-        return f"{org_id}:{digest}" if org_id else digest
+        expiry = self._expiry
+        for _ in range(limit):
+            key = next(iter(expiry), None)
+            if key is None or now < expiry[key]:
+                return
+            del expiry[key]
+            del self._store[key]
 
     def get(self, query: str, org_id: Optional[str] = None) -> Optional[CacheEntry]:
         """Look up a cached response by query.
@@ -104,33 +174,40 @@ class Cache:
         Returns:
             The CacheEntry on a hit, or ``None`` on a miss.
         """
-        key = self.generate_key(query, org_id)
-        entry = self._store.get(key)
-
-        if entry is None:
-            self._misses += 1
-            return None
-
-        now = datetime.now(timezone.utc)
-        if now >= entry.expires_at:
-            del self._store[key]
-            self._misses += 1
+        key = _raw_cache_key(query, org_id)
+        with self._lock:
+            entry = self._store.get(key)
+
+            if entry is None:
+                self._misses += 1
+                return None
+
+            expired = time.monotonic() >= self._expiry[key]
+            if expired:
+                del self._store[key]
+                del self._expiry[key]
+                self._misses += 1
+            else:
+                self._store.move_to_end(key)
+                entry.access_count += 1
+                self._hits += 1
+                self._total_cost_saved += entry.cost
+
+        if expired:
             logger.debug(
                 "Cache entry expired",
-                extra={"cache_key": key, "query_prefix": query[:40]},
+                extra={"cache_key": entry.cache_key, "query_prefix": query[:40]},
             )
             return None
 
-        entry.access_count += 1
-        self._hits += 1
-        self._total_cost_saved += entry.cost
-        logger.debug(
-            "Cache hit",
-            extra={
-                "cache_key": key,
-                "access_count": entry.access_count,
-            },
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Cache hit",
+                extra={
+                    "cache_key": entry.cache_key,
+                    "access_count": entry.access_count,
+                },
+            )
         return entry
 
     def set(
@@ -159,31 +236,46 @@ class Cache:
         if not query or not query.strip():
             raise ValueError("Query must not be empty")
 
-        key = self.generate_key(query, org_id)
-        now = datetime.now(timezone.utc)
+        key = _raw_cache_key(query, org_id)
+        now = datetime.now(_UTC)
 
-        if key in self._store:
-            logger.warning(
-                "Cache key collision or overwrite",
-                extra={
-                    "cache_key": key,
-                    "old_query_prefix": self._store[key].query[:40],
-                    "new_query_prefix": query[:40],
-                },
-            )
-
-        entry = CacheEntry(
-            cache_key=key,
+        # Every field is built here with the right type, so skip
+        # Pydantic validation on the write path
+        entry = CacheEntry.model_construct(
+            # Same string generate_cache_key() returns, without rehashing
+            cache_key=f"{org_id}:{key[-16:].hex()}" if org_id else key.hex(),
             query=query,
             response=response,
             model=model,
-            cost=cost,
+            cost=float(cost),
             created_at=now,
-            expires_at=now + timedelta(seconds=self._ttl_seconds),
+            expires_at=now + self._ttl_delta,
             access_count=0,
         )
-        self._store[key] = entry
-        logger.debug("Cache set", extra={"cache_key": key})
+        with self._lock:
+            existing = self._store.get(key)
+            self._store[key] = entry
+            self._store.move_to_end(key)
+            # Re-insert so the expiry dict stays in expiry order
+            self._expiry.pop(key, None)
+            mono_now = time.monotonic()
+            self._expiry[key] = mono_now + self._ttl_seconds
+            self._drop_expired_head(mono_now)
+            while len(self._store) > self._max_entries:
+                evicted, _ = self._store.popitem(last=False)
+                del self._expiry[evicted]
+
+        if existing is not None:
+            logger.warning(
+                "Cache key collision or overwrite",
+                extra={
+                    "cache_key": existing.cache_key,
+                    "old_query_prefix": existing.query[:40],
+                    "new_query_prefix": query[:40],
+                },
+            )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Cache set", extra={"cache_key": entry.cache_key})
         return entry
 
     def invalidate(self, query: str, org_id: Optional[str] = None) -> bool:
@@ -196,10 +288,15 @@ class Cache:
         Returns:
             ``True`` if an entry was removed, ``False`` otherwise.
         """
-        key = self.generate_key(query, org_id)
-        if key in self._store:
-            del self._store[key]
-            logger.info("Cache entry invalidated", extra={"cache_key": key})
+        key = _raw_cache_key(query, org_id)
+        with self._lock:
+            entry = self._store.pop(key, None)
+            if entry is not None:
+                del self._expiry[key]
+        if entry is not None:
+            logger.info(
+                "Cache entry invalidated", extra={"cache_key": entry.cache_key}
+            )
             return True
         return False
 
@@ -209,8 +306,10 @@ class Cache:
         Returns:
             Number of entries removed.
         """
-        count = len(self._store)
-        self._store.clear()
+        with self._lock:
+            count = len(self._store)
+            self._store.clear()
+            self._expiry.clear()
         logger.info("Cache cleared", extra={"entries_removed": count})
         return count
 
@@ -220,13 +319,17 @@ class Cache:
         Returns:
             CacheStats with current hit/miss counts and derived metrics.
         """
-        total = self._hits + self._misses
+        with self._lock:
+            hits, misses = self._hits, self._misses
+            entry_count = len(self._store)
+            cost_saved = self._total_cost_saved
+        total = hits + misses
         return CacheStats(
-            hits=self._hits,
-            misses=self._misses,
-            hit_rate=self._hits / total if total > 0 else 0.0,
-            entry_count=len(self._store),
-            total_cost_saved=round(self._total_cost_saved, 6),
+            hits=hits,
+            misses=misses,
+            hit_rate=hits / total if total > 0 else 0.0,
+            entry_count=entry_count,
+            total_cost_saved=round(cost_saved, 6),
         )
 
     def cleanup_expired(self) -> int:
@@ -235,21 +338,37 @@ class Cache:
         Returns:
             Number of entries removed.
         """
-        now = datetime.now(timezone.utc)
-        expired_keys = [
-            key
-            for key, entry in self._store.items()
-            if now >= entry.expires_at
-        ]
-        for key in expired_keys:
-            del self._store[key]
-
-        if expired_keys:
+        with self._lock:
+            now = time.monotonic()
+            # Expiry order: the expired entries are a prefix, so count it
+            # and stop at the first entry that is still live
+            removed = 0
+            for expires in self._expiry.values():
+                if now < expires:
+                    break
+                removed += 1
+
+            if removed > len(self._expiry) // 4:
+                # Mostly expired: rebuilding the survivors in one pass is
+                # cheaper than many individual deletions
+                self._expiry = dict(islice(self._expiry.items(), removed, None))
+                live = self._expiry
+                self._store = OrderedDict(
+                    (key, entry)
+                    for key, entry in self._store.items()
+                    if key in live
+                )
+            else:
+                for key in list(islice(self._expiry, removed)):
+                    del self._store[key]
+                    del self._expiry[key]
+
+        if removed:
             logger.info(
                 "Expired entries cleaned up",
-                extra={"count": len(expired_keys)},
+                extra={"count": removed},
             )
-        return len(expired_keys)
+        return removed
 
     @property
     def size(self) -> int:
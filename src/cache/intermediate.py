@@ -8,12 +8,15 @@ to skip redundant computation.
 """
 
 import logging
+import threading
 import time
-from typing import Any, Callable, Dict, List, Optional
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set
 
 from pydantic import BaseModel
 
 from src.cache.workflow import WorkflowStep
+from src.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -39,17 +42,65 @@ class IntermediateCache:
 
     Stores results keyed by composite keys so that different queries
     requiring the same intermediate work can reuse cached results.
+    All cache operations are safe to call from multiple threads.
 
     Args:
         ttl_seconds: Time-to-live for entries (default 24h).
+        max_entries: Maximum number of entries; the least recently used
+            entry is evicted beyond it.  Defaults to ``cache.max_entries``
+            from settings.
     """
 
-    def __init__(self, ttl_seconds: int = 86400) -> None:
-        self._store: Dict[str, Dict[str, Any]] = {}
+    def __init__(
+        self,
+        ttl_seconds: int = 86400,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        # Entry fields are kept in parallel dicts so hot lookups and expiry
+        # sweeps only touch the part they need.
+        # key -> result, in recency order (least recently used first)
+        self._results: OrderedDict[str, str] = OrderedDict()
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        # key -> absolute monotonic expiry, in insertion (= expiry) order
+        self._expiry: Dict[str, float] = {}
+        # leading key segment (document id) -> keys, for per-document
+        # invalidation without scanning the whole cache
+        self._by_document: Dict[str, Set[str]] = {}
+        # Guards all of the dicts above; they share recency/expiry order
+        self._lock = threading.Lock()
         self._ttl_seconds = ttl_seconds
+        self._max_entries = (
+            max_entries
+            if max_entries is not None
+            else get_settings().cache.max_entries
+        )
         self._hits: int = 0
         self._misses: int = 0
 
+    def _drop(self, cache_key: str) -> None:
+        """Remove *cache_key* from every per-field dict (lock held)."""
+        del self._results[cache_key]
+        del self._meta[cache_key]
+        del self._expiry[cache_key]
+        doc_id = cache_key.split(":", 1)[0]
+        keys = self._by_document.get(doc_id)
+        if keys is not None:
+            keys.discard(cache_key)
+            if not keys:
+                del self._by_document[doc_id]
+
+    def _drop_expired_head(self, now: float, limit: int = 2) -> None:
+        """Drop up to *limit* expired entries from the front (lock held).
+
+        Called on every write so expired entries never pile up waiting
+        for :meth:`cleanup_expired`; the bound keeps each write O(1).
+        """
+        for _ in range(limit):
+            key = next(iter(self._expiry), None)
+            if key is None or now <= self._expiry[key]:
+                return
+            self._drop(key)
+
     def get(self, cache_key: str) -> Optional[str]:
         """Look up an intermediate result by composite key.
 
@@ -59,26 +110,27 @@ class IntermediateCache:
         Returns:
             The cached result string, or ``None`` on miss.
         """
-        entry = self._store.get(cache_key)
-        if entry is None:
-            self._misses += 1
-            return None
-
-        if time.time() - entry["stored_at"] > self._ttl_seconds:
-            del self._store[cache_key]
-            self._misses += 1
+        with self._lock:
+            expires_at = self._expiry.get(cache_key)
+            if expires_at is None:
+                self._misses += 1
+                return None
+
+            if time.monotonic() > expires_at:
+                self._drop(cache_key)
+                self._misses += 1
+                result = None
+            else:
+                self._results.move_to_end(cache_key)
+                self._hits += 1
+                result = self._results[cache_key]
+
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                "Tier 3 entry expired",
+                "Tier 3 entry expired" if result is None else "Tier 3 cache hit",
                 extra={"cache_key": cache_key},
             )
-            return None
-
-        self._hits += 1
-        logger.debug(
-            "Tier 3 cache hit",
-            extra={"cache_key": cache_key},
-        )
-        return entry["result"]
+        return result
 
     def set(
         self,
@@ -93,15 +145,25 @@ class IntermediateCache:
             result: The result to cache.
             metadata: Optional metadata to store alongside.
         """
-        self._store[cache_key] = {
-            "result": result,
-            "metadata": metadata or {},
-            "stored_at": time.time(),
-        }
-        logger.debug(
-            "Tier 3 cache set",
-            extra={"cache_key": cache_key},
-        )
+        with self._lock:
+            self._results[cache_key] = result
+            self._results.move_to_end(cache_key)
+            self._meta[cache_key] = metadata or {}
+            self._by_document.setdefault(
+                cache_key.split(":", 1)[0], set()
+            ).add(cache_key)
+            # Re-insert so the expiry dict stays in expiry order
+            self._expiry.pop(cache_key, None)
+            now = time.monotonic()
+            self._expiry[cache_key] = now + self._ttl_seconds
+            self._drop_expired_head(now)
+            while len(self._results) > self._max_entries:
+                self._drop(next(iter(self._results)))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Tier 3 cache set",
+                extra={"cache_key": cache_key},
+            )
 
     def invalidate(self, cache_key: str) -> bool:
         """Remove an entry by its composite key.
@@ -112,25 +174,30 @@ class IntermediateCache:
         Returns:
             True if an entry was removed.
         """
-        if cache_key in self._store:
-            del self._store[cache_key]
-            return True
-        return False
+        with self._lock:
+            if cache_key not in self._expiry:
+                return False
+            self._drop(cache_key)
+        return True
 
     def invalidate_by_document(self, document_id: str) -> int:
         """Remove all entries related to a specific document.
 
+        Only the keys indexed under the document are visited, so the cost
+        is proportional to that document's entries, not the cache size.
+
         Args:
             document_id: The document identifier.
 
         Returns:
             Number of entries removed.
         """
-        keys_to_remove = [
-            k for k in self._store if k.startswith(f"{document_id}:")
-        ]
-        for key in keys_to_remove:
-            del self._store[key]
+        prefix = f"{document_id}:"
+        with self._lock:
+            candidates = self._by_document.get(document_id.split(":", 1)[0], ())
+            keys_to_remove = [k for k in candidates if k.startswith(prefix)]
+            for key in keys_to_remove:
+                self._drop(key)
 
         if keys_to_remove:
             logger.info(
@@ -142,6 +209,32 @@ class IntermediateCache:
             )
         return len(keys_to_remove)
 
+    def cleanup_expired(self) -> int:
+        """Remove all expired entries.
+
+        Only the expiry dict is scanned, and the scan stops at the first
+        live entry since it is kept in expiry order.
+
+        Returns:
+            Number of entries removed.
+        """
+        with self._lock:
+            now = time.monotonic()
+            expired_keys = []
+            for key, expires_at in self._expiry.items():
+                if now <= expires_at:
+                    break
+                expired_keys.append(key)
+            for key in expired_keys:
+                self._drop(key)
+
+        if expired_keys:
+            logger.info(
+                "Tier 3 expired entries cleaned up",
+                extra={"count": len(expired_keys)},
+            )
+        return len(expired_keys)
+
     def execute_workflow(
         self,
         steps: List[WorkflowStep],
@@ -193,11 +286,14 @@ class IntermediateCache:
         Returns:
             Dict with hit/miss counts, hit rate, and entry count.
         """
-        total = self._hits + self._misses
+        with self._lock:
+            hits, misses = self._hits, self._misses
+            entry_count = len(self._results)
+        total = hits + misses
         return {
             "tier": 3,
-            "hits": self._hits,
-            "misses": self._misses,
-            "hit_rate": self._hits / total if total > 0 else 0.0,
-            "entry_count": len(self._store),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total > 0 else 0.0,
+            "entry_count": entry_count,
         }
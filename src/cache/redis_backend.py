@@ -6,20 +6,30 @@ optimizer can use either backend. Uses REDIS_URL from environment.
 
 Keys in Redis:
   - asahi:t1:hits, asahi:t1:misses  (counters; created on first incr)
-  - asahi:t1:{key}  (entry key = org_id:md5 or md5; only created on SET after a cache miss + successful inference)
+  - asahi:t1:ac:v3:{key}  (per-entry access counter, expiring with its entry;
+    kept out of the entry so a hit never rewrites the entry)
+  - asahi:t1:index  (sorted set of entry keys scored by expiry epoch; gives
+    an O(log N) entry count without scanning the keyspace)
+  - asahi:t1:v3:{key}  (entry key = org_id:digest or digest; only created on SET after a cache miss + successful inference)
+
+The ``v3`` segment is the key-format version (v2: xxHash3 digests instead of
+MD5; v3: MessagePack entries instead of JSON).  Entries written by older
+releases are never read back and simply age out under their TTL.
 
 So Redis will look "empty" until at least one inference request has completed
 as a cache miss and was stored. Run an inference with a new prompt (and valid
 LLM config) to populate the cache. Use SCAN 0 MATCH asahi:t1:* to list keys.
 """
 
-import hashlib
-import json
 import logging
+import threading
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import msgspec
 
-from src.cache.exact import CacheEntry, CacheStats
+from src.cache.exact import CacheEntry, CacheStats, generate_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -30,20 +40,115 @@ except ImportError:
     redis = None  # type: ignore[assignment]
 
 
-def _serialize_entry(entry: CacheEntry) -> str:
-    """Serialize CacheEntry to JSON for Redis storage."""
-    return entry.model_dump_json()
-
+# Lookup, hit/miss accounting and the entry's access count in one round
+# trip.  Returns nil on a miss, else {entry, access_count}.  On its first
+# increment the access counter is given the entry's remaining TTL so both
+# expire together; set() deletes the counter whenever the entry is
+# rewritten, so later hits never need to touch either TTL.
+#   KEYS[1] = entry key, KEYS[2] = hits counter, KEYS[3] = misses counter,
+#   KEYS[4] = entry access counter
+_GET_COUNTED_LUA = """
+local value = redis.call('GET', KEYS[1])
+if not value then
+    redis.call('INCR', KEYS[3])
+    return false
+end
+redis.call('INCR', KEYS[2])
+local count = redis.call('INCR', KEYS[4])
+if count == 1 then
+    local ttl = redis.call('PTTL', KEYS[1])
+    if ttl > 0 then
+        redis.call('PEXPIRE', KEYS[4], ttl)
+    end
+end
+return {value, count}
+"""
 
-def _deserialize_entry(data: str) -> CacheEntry:
-    """Deserialize JSON from Redis to CacheEntry."""
-    obj = json.loads(data)
-    for time_field in ("created_at", "expires_at"):
-        if time_field in obj and obj[time_field]:
-            obj[time_field] = datetime.fromisoformat(
-                obj[time_field].replace("Z", "+00:00")
+_UTC = timezone.utc
+
+# Connection pools shared by every RedisCache built from the same URL, so
+# extra instances (e.g. one per tenant) reuse TCP/TLS connections.
+_POOLS: Dict[str, Any] = {}
+_POOLS_LOCK = threading.Lock()
+_POOL_MAX_CONNECTIONS = 32
+
+
+def _shared_pool(redis_url: str) -> Any:
+    """Return the process-wide connection pool for *redis_url*."""
+    with _POOLS_LOCK:
+        pool = _POOLS.get(redis_url)
+        if pool is None:
+            # Entries are binary MessagePack, so responses stay bytes
+            pool = _POOLS[redis_url] = redis.ConnectionPool.from_url(
+                redis_url,
+                decode_responses=False,
+                max_connections=_POOL_MAX_CONNECTIONS,
             )
-    return CacheEntry.model_validate(obj)
+        return pool
+
+
+# Keys deleted per pipelined batch in clear()
+_CLEAR_BATCH_SIZE = 500
+
+
+class _EntryRecord(msgspec.Struct, array_like=True):
+    """Wire format of a :class:`CacheEntry` in Redis.
+
+    Encoded as a MessagePack array (field names are not stored) with
+    datetimes as native MessagePack timestamps.  Field order is part of
+    the format: changing it requires bumping ``RedisCache.KEY_VERSION``.
+    """
+
+    cache_key: str
+    query: str
+    response: str
+    model: str
+    cost: float
+    created_at: datetime
+    expires_at: datetime
+    access_count: int
+
+
+_ENCODER = msgspec.msgpack.Encoder()
+_DECODER = msgspec.msgpack.Decoder(_EntryRecord)
+
+
+def _serialize_entry(entry: CacheEntry) -> bytes:
+    """Serialize CacheEntry to MessagePack for Redis storage."""
+    return _ENCODER.encode(
+        _EntryRecord(
+            entry.cache_key,
+            entry.query,
+            entry.response,
+            entry.model,
+            entry.cost,
+            entry.created_at,
+            entry.expires_at,
+            entry.access_count,
+        )
+    )
+
+
+def _deserialize_entry(data: bytes) -> CacheEntry:
+    """Deserialize MessagePack from Redis to CacheEntry.
+
+    The decoder already type-checks every field, so Pydantic validation
+    is skipped.
+
+    Raises:
+        msgspec.DecodeError: If *data* is not a valid encoded entry.
+    """
+    record = _DECODER.decode(data)
+    return CacheEntry.model_construct(
+        cache_key=record.cache_key,
+        query=record.query,
+        response=record.response,
+        model=record.model,
+        cost=record.cost,
+        created_at=record.created_at,
+        expires_at=record.expires_at,
+        access_count=record.access_count,
+    )
 
 
 class RedisCache:
@@ -51,7 +156,8 @@ class RedisCache:
 
     Same public interface as src.cache.exact.Cache: get, set, stats,
     generate_key, invalidate, clear. Use when REDIS_URL is set for
-    persistence and multi-instance consistency.
+    persistence and multi-instance consistency.  Instances created from
+    the same URL share one connection pool (see :meth:`close_pools`).
 
     Args:
         redis_url: Redis connection URL (e.g. redis://localhost:6379/0).
@@ -62,6 +168,9 @@ class RedisCache:
     KEY_PREFIX = "asahi:t1"
     HITS_KEY = "asahi:t1:hits"
     MISSES_KEY = "asahi:t1:misses"
+    INDEX_KEY = "asahi:t1:index"
+    # Bumped whenever the digest or entry format changes
+    KEY_VERSION = "v3"
 
     def __init__(
         self,
@@ -77,40 +186,92 @@ class RedisCache:
         if _redis_client is not None:
             self._client = _redis_client
         else:
-            self._client = redis.from_url(redis_url, decode_responses=True)
+            self._client = redis.Redis(connection_pool=_shared_pool(redis_url))
         self._ttl_seconds = ttl_seconds
+        self._ttl_delta = timedelta(seconds=ttl_seconds)
         self._key_prefix = key_prefix.rstrip(":")
+        # Redis key prefixes are fixed per instance; build them once so
+        # each operation only concatenates the digest
+        self._entry_prefix = f"{self._key_prefix}:{self.KEY_VERSION}:"
+        self._access_prefix = f"{self._key_prefix}:ac:{self.KEY_VERSION}:"
+        self._get_counted = self._client.register_script(_GET_COUNTED_LUA)
+        # SCAN yields bytes or str depending on the client's decode_responses
+        self._stats_keys = frozenset(
+            k for key in (self.HITS_KEY, self.MISSES_KEY, self.INDEX_KEY)
+            for k in (key, key.encode())
+        )
+
+    @classmethod
+    def close_pools(cls) -> None:
+        """Disconnect and forget every shared connection pool.
 
-    def _key(self, cache_key: str) -> str:
-        """Return full Redis key for a cache key."""
-        return f"{self._key_prefix}:{cache_key}"
+        Call on process shutdown.  Instances created afterwards open a
+        fresh pool.
+        """
+        with _POOLS_LOCK:
+            pools = list(_POOLS.values())
+            _POOLS.clear()
+        for pool in pools:
+            pool.disconnect()
+        logger.info("Redis connection pools closed", extra={"pools": len(pools)})
+
+    def _count_as_miss(self, rkey: str, ac_key: str) -> None:
+        """Drop an unusable entry and move its lookup from hits to misses.
+
+        Used when a key was found (and counted as a hit by the lookup
+        script) but the entry could not be served.
+        """
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.delete(rkey, ac_key)
+            pipe.zrem(self.INDEX_KEY, rkey)
+            pipe.decr(self.HITS_KEY)
+            pipe.incr(self.MISSES_KEY)
+            pipe.execute()
+        except Exception:
+            pass
 
     def generate_key(self, query: str, org_id: Optional[str] = None) -> str:
-        """Generate a deterministic MD5 cache key from a query string.
+        """Generate a deterministic cache key from a query string.
 
         Args:
             query: The user query to hash.
             org_id: Optional org/tenant ID for cache isolation.
 
         Returns:
-            Hex-encoded MD5 digest, optionally prefixed with org_id.
+            Hex-encoded digest, optionally prefixed with org_id.
         """
-        digest = hashlib.md5(query.encode("utf-8")).hexdigest()
-        return f"{org_id}:{digest}" if org_id else digest
+        return generate_cache_key(query, org_id)
+
+    def _keys(
+        self, query: str, org_id: Optional[str] = None
+    ) -> Tuple[str, str, str]:
+        """Hash *query* once and derive every key an operation needs.
+
+        Returns:
+            ``(cache_key, entry_key, access_key)``.
+        """
+        key = generate_cache_key(query, org_id)
+        return key, self._entry_prefix + key, self._access_prefix + key
 
     def get(self, query: str, org_id: Optional[str] = None) -> Optional[CacheEntry]:
         """Look up a cached response by query.
 
+        The lookup, the hit/miss counter update and the entry's access
+        count are a single Lua script call, so a lookup costs one round
+        trip and a hit never rewrites the entry.
+
         Args:
             query: The user query to look up.
 
         Returns:
             The CacheEntry on a hit, or None on a miss or on error.
         """
-        key = self.generate_key(query, org_id)
-        rkey = self._key(key)
+        key, rkey, ac_key = self._keys(query, org_id)
         try:
-            data = self._client.get(rkey)
+            found = self._get_counted(
+                keys=[rkey, self.HITS_KEY, self.MISSES_KEY, ac_key]
+            )
         except Exception as e:
             logger.warning(
                 "Redis get failed",
@@ -122,9 +283,9 @@ class RedisCache:
                 pass
             return None
 
-        if data is None:
-            self._client.incr(self.MISSES_KEY)
+        if found is None:
             return None
+        data, access_count = found
 
         try:
             entry = _deserialize_entry(data)
@@ -133,35 +294,20 @@ class RedisCache:
                 "Redis entry deserialize failed",
                 extra={"cache_key": key, "error": str(e)},
             )
-            self._client.delete(rkey)
-            self._client.incr(self.MISSES_KEY)
+            self._count_as_miss(rkey, ac_key)
             return None
 
         # Check expiry in-app (Redis TTL may have been extended by other logic)
-        now = datetime.now(timezone.utc)
-        if now >= entry.expires_at:
-            try:
-                self._client.delete(rkey)
-            except Exception:
-                pass
-            self._client.incr(self.MISSES_KEY)
+        if datetime.now(_UTC) >= entry.expires_at:
+            self._count_as_miss(rkey, ac_key)
             return None
 
-        entry.access_count += 1
-        self._client.incr(self.HITS_KEY)
-        # Re-save with updated access_count (optional; not required for correctness)
-        try:
-            self._client.setex(
-                rkey,
-                self._ttl_seconds,
-                _serialize_entry(entry),
+        entry.access_count = int(access_count)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Cache hit",
+                extra={"cache_key": key, "access_count": entry.access_count},
             )
-        except Exception:
-            pass
-        logger.debug(
-            "Cache hit",
-            extra={"cache_key": key, "access_count": entry.access_count},
-        )
         return entry
 
     def set(
@@ -190,9 +336,9 @@ class RedisCache:
         if not query or not query.strip():
             raise ValueError("Query must not be empty")
 
-        key = self.generate_key(query, org_id)
-        now = datetime.now(timezone.utc)
-        expires_at = now + timedelta(seconds=self._ttl_seconds)
+        key, rkey, ac_key = self._keys(query, org_id)
+        now = datetime.now(_UTC)
+        expires_at = now + self._ttl_delta
         entry = CacheEntry(
             cache_key=key,
             query=query,
@@ -203,20 +349,26 @@ class RedisCache:
             expires_at=expires_at,
             access_count=0,
         )
-        rkey = self._key(key)
         try:
-            self._client.setex(
-                rkey,
-                self._ttl_seconds,
-                _serialize_entry(entry),
-            )
+            # Entry and its index record in one round trip.  Overwrites
+            # just move the existing index member's score.  Entries that
+            # Redis expired via ``ex=`` leave their index members behind,
+            # so each write also drops the members already past expiry;
+            # otherwise the (TTL-less) index grows without bound.
+            pipe = self._client.pipeline(transaction=False)
+            pipe.set(rkey, _serialize_entry(entry), ex=self._ttl_seconds)
+            pipe.delete(ac_key)
+            pipe.zremrangebyscore(self.INDEX_KEY, "-inf", now.timestamp())
+            pipe.zadd(self.INDEX_KEY, {rkey: expires_at.timestamp()})
+            pipe.execute()
         except Exception as e:
             logger.error(
                 "Redis set failed",
                 extra={"cache_key": key, "error": str(e)},
             )
             raise
-        logger.debug("Cache set", extra={"cache_key": key})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Cache set", extra={"cache_key": key})
         return entry
 
     def invalidate(self, query: str, org_id: Optional[str] = None) -> bool:
@@ -229,10 +381,13 @@ class RedisCache:
         Returns:
             True if an entry was removed, False otherwise.
         """
-        key = self.generate_key(query, org_id)
-        rkey = self._key(key)
+        key, rkey, ac_key = self._keys(query, org_id)
         try:
-            deleted = self._client.delete(rkey)
+            pipe = self._client.pipeline(transaction=False)
+            pipe.delete(rkey)
+            pipe.delete(ac_key)
+            pipe.zrem(self.INDEX_KEY, rkey)
+            deleted = pipe.execute()[0]
             if deleted:
                 logger.info(
                     "Cache entry invalidated",
@@ -249,57 +404,118 @@ class RedisCache:
     def clear(self) -> int:
         """Remove all Tier 1 cache entries with our prefix.
 
-        Does not reset hits/misses counters. Returns number of keys deleted.
+        Does not reset hits/misses counters.  Keys are removed in batches
+        of ``_CLEAR_BATCH_SIZE`` as the scan proceeds, rather than being
+        collected into one huge call, and with ``UNLINK`` so Redis frees
+        the memory in a background thread instead of blocking on it.
 
         Returns:
-            Number of entry keys removed (not including stats keys).
+            Number of entry keys removed (not including stats keys or
+            access counters).
         """
+        stats_keys = self._stats_keys
+        ac_prefix = f"{self._key_prefix}:ac:"
+        ac_prefix_bytes = ac_prefix.encode()
         try:
-            keys = list(self._client.scan_iter(match=f"{self._key_prefix}:*"))
-            # Exclude stats keys
-            entry_keys = [
-                k for k in keys
-                if k not in (self.HITS_KEY, self.MISSES_KEY)
-            ]
-            if entry_keys:
-                self._client.delete(*entry_keys)
+            removed = 0
+            batch = []
+            for k in self._client.scan_iter(
+                match=f"{self._key_prefix}:*", count=_CLEAR_BATCH_SIZE
+            ):
+                if k in stats_keys:
+                    continue
+                batch.append(k)
+                if not k.startswith(
+                    ac_prefix_bytes if isinstance(k, bytes) else ac_prefix
+                ):
+                    removed += 1
+                if len(batch) >= _CLEAR_BATCH_SIZE:
+                    self._client.unlink(*batch)
+                    batch = []
+            # Last partial batch and the index in one round trip
+            pipe = self._client.pipeline(transaction=False)
+            if batch:
+                pipe.unlink(*batch)
+            pipe.unlink(self.INDEX_KEY)
+            pipe.execute()
             logger.info(
                 "Cache cleared",
-                extra={"entries_removed": len(entry_keys)},
+                extra={"entries_removed": removed},
             )
-            return len(entry_keys)
+            return removed
         except Exception as e:
             logger.error("Redis clear failed", extra={"error": str(e)})
             return 0
 
+    def rebuild_index(self) -> int:
+        """Rebuild the expiry index from the keyspace.
+
+        Repair path only (e.g. after the index key was evicted or entries
+        were written by another tool): SCANs every current-version entry
+        key, so it is O(N) and should be run out of band, never per
+        request.
+
+        Returns:
+            Number of entries indexed.
+        """
+        now = time.time()
+        self._client.delete(self.INDEX_KEY)
+        indexed = 0
+        batch = []
+        for k in self._client.scan_iter(
+            match=f"{self._key_prefix}:{self.KEY_VERSION}:*",
+            count=_CLEAR_BATCH_SIZE,
+        ):
+            batch.append(k)
+            if len(batch) >= _CLEAR_BATCH_SIZE:
+                indexed += self._index_keys(batch, now)
+                batch = []
+        indexed += self._index_keys(batch, now)
+        logger.info("Cache index rebuilt", extra={"entries": indexed})
+        return indexed
+
+    def _index_keys(self, keys: List[Any], now: float) -> int:
+        """Add *keys* to the index, scored by their remaining Redis TTL."""
+        if not keys:
+            return 0
+        pipe = self._client.pipeline(transaction=False)
+        for k in keys:
+            pipe.ttl(k)
+        scores = {
+            k: now + ttl
+            for k, ttl in zip(keys, pipe.execute(), strict=True)
+            if ttl is not None and ttl > 0
+        }
+        if scores:
+            self._client.zadd(self.INDEX_KEY, scores)
+        return len(scores)
+
     def stats(self) -> CacheStats:
         """Return aggregate cache statistics.
 
-        Uses Redis keys for entry count and in-Redis hit/miss counters.
-        Hit rate is derived from hits and misses.
+        Hit/miss counts come from in-Redis counters and the entry count
+        from the expiry index (members past their expiry are pruned
+        first), all in one pipelined round trip.  Hit rate is derived from
+        hits and misses.
 
         Returns:
             CacheStats with hits, misses, hit_rate, entry_count, total_cost_saved.
         """
         try:
-            hits = int(self._client.get(self.HITS_KEY) or 0)
-            misses = int(self._client.get(self.MISSES_KEY) or 0)
+            pipe = self._client.pipeline(transaction=False)
+            pipe.get(self.HITS_KEY)
+            pipe.get(self.MISSES_KEY)
+            pipe.zremrangebyscore(self.INDEX_KEY, "-inf", time.time())
+            pipe.zcard(self.INDEX_KEY)
+            raw_hits, raw_misses, _, count = pipe.execute()
+            hits = int(raw_hits or 0)
+            misses = int(raw_misses or 0)
         except Exception:
             hits = 0
             misses = 0
+            count = 0
         total = hits + misses
         hit_rate = hits / total if total > 0 else 0.0
-        try:
-            entry_keys = [
-                k
-                for k in self._client.scan_iter(
-                    match=f"{self._key_prefix}:*"
-                )
-                if k not in (self.HITS_KEY, self.MISSES_KEY)
-            ]
-            count = len(entry_keys)
-        except Exception:
-            count = 0
         # total_cost_saved not stored in Redis; we could maintain a key but skip for simplicity
         return CacheStats(
             hits=hits,
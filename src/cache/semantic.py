@@ -7,10 +7,13 @@ cached response or signal a miss.
 """
 
 import logging
+import threading
+import time
 import uuid
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 from pydantic import BaseModel, Field
 
 from src.embeddings.engine import EmbeddingEngine
@@ -18,6 +21,7 @@ from src.embeddings.mismatch import MismatchCostCalculator
 from src.embeddings.similarity import SimilarityCalculator
 from src.embeddings.threshold import AdaptiveThresholdTuner
 from src.embeddings.vector_store import VectorDBEntry, VectorDatabase
+from src.exceptions import EmbeddingError
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +44,85 @@ class SemanticCacheResult(BaseModel):
     reason: str = ""
 
 
+class _EmbeddingCoalescer:
+    """Merges concurrent single-text embedding calls into batch calls.
+
+    A call made while no other call is in flight is embedded directly, so
+    an idle cache adds no latency.  A call that arrives while others are
+    in flight joins a pending batch: the first such caller becomes the
+    batch leader, waits ``window_s`` for more callers, then embeds the
+    whole batch with one :meth:`EmbeddingEngine.embed_texts` call and
+    hands each caller its vector.  Provider embedding calls are network
+    round trips priced per request, so batching them is the main
+    throughput lever for Tier 2 under concurrent load.
+
+    Args:
+        embedder: Engine used for the actual embedding calls.
+        window_s: How long a batch leader waits for more callers.
+    """
+
+    def __init__(self, embedder: EmbeddingEngine, window_s: float) -> None:
+        self._embedder = embedder
+        self._window_s = window_s
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._pending: List[Tuple[str, Future]] = []
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed *text*, batching with concurrent callers when possible.
+
+        Raises:
+            ValueError: If text is empty.
+            EmbeddingError: If the embedding call fails.
+        """
+        if not text or not text.strip():
+            # Rejected per caller so one bad text can't fail a whole batch
+            return self._embedder.embed_text(text)
+
+        future: Future = Future()
+        with self._lock:
+            self._in_flight += 1
+            solo = self._in_flight == 1
+            leader = not solo and not self._pending
+            if not solo:
+                self._pending.append((text, future))
+        try:
+            if solo:
+                return self._embedder.embed_text(text)
+            if leader:
+                time.sleep(self._window_s)
+                self._flush()
+            return future.result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _flush(self) -> None:
+        """Embed every pending text in one batch and resolve the callers."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        try:
+            vectors = self._embedder.embed_texts([text for text, _ in batch])
+            if len(vectors) != len(batch):
+                # Checked before any future is resolved: a strict zip()
+                # would only fail midway, leaving the rest blocked forever
+                raise EmbeddingError(
+                    f"Embedding backend returned {len(vectors)} vectors "
+                    f"for {len(batch)} texts"
+                )
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        for (_, future), vector in zip(batch, vectors, strict=True):
+            future.set_result(vector)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Coalesced embedding batch",
+                extra={"batch_size": len(batch)},
+            )
+
+
 class SemanticCache:
     """Tier 2 semantic similarity cache.
 
@@ -54,6 +137,10 @@ class SemanticCache:
         mismatch_calc: Calculator for cache-vs-recompute economics.
         threshold_tuner: Tuner for per-task similarity thresholds.
         ttl_seconds: Time-to-live for cached entries (default 24h).
+            Entries past it are no longer served.
+        coalesce_window_ms: How long concurrent lookups wait to have their
+            query embeddings computed in one batch (``0`` disables
+            coalescing).  A lookup with no concurrent peers never waits.
     """
 
     def __init__(
@@ -64,8 +151,14 @@ class SemanticCache:
         mismatch_calc: MismatchCostCalculator,
         threshold_tuner: AdaptiveThresholdTuner,
         ttl_seconds: int = 86400,
+        coalesce_window_ms: int = 5,
     ) -> None:
         self._embedder = embedding_engine
+        self._coalescer = (
+            _EmbeddingCoalescer(embedding_engine, coalesce_window_ms / 1000.0)
+            if coalesce_window_ms > 0
+            else None
+        )
         self._db = vector_db
         self._similarity = similarity_calc
         self._mismatch = mismatch_calc
@@ -74,6 +167,12 @@ class SemanticCache:
         self._hits: int = 0
         self._misses: int = 0
 
+    def _embed(self, text: str) -> np.ndarray:
+        """Embed *text*, via the coalescer when enabled."""
+        if self._coalescer is not None:
+            return self._coalescer.embed(text)
+        return self._embedder.embed_text(text)
+
     def get(
         self,
         query: str,
@@ -93,7 +192,7 @@ class SemanticCache:
             SemanticCacheResult indicating hit or miss.
         """
         try:
-            query_embedding = self._embedder.embed_text(query)
+            query_embedding = self._embed(query)
         except Exception as exc:
             logger.error(
                 "Failed to embed query for semantic cache lookup",
@@ -105,7 +204,7 @@ class SemanticCache:
             )
 
         results = self._db.query(
-            embedding=query_embedding.tolist(), top_k=5
+            embedding=query_embedding, top_k=5
         )
 
         if not results:
@@ -118,10 +217,18 @@ class SemanticCache:
         # or the cached entry's task type to handle semantically identical queries
         # that were detected as different task types
         threshold = self._tuner.get_threshold(task_type, cost_sensitivity)
+        now = time.time()
+        above_threshold = self._similarity.above_threshold
 
         for result in results:
+            # Entry timestamps are epoch seconds; older entries stored ISO
+            # strings and are left to the vector DB's own lifecycle
+            expires_at = result.metadata.get("expires_at")
+            if isinstance(expires_at, (int, float)) and expires_at <= now:
+                continue
+
             # Check similarity against threshold
-            if not self._similarity.above_threshold(result.score, threshold):
+            if not above_threshold(result.score, threshold):
                 # Also check against the cached entry's task type threshold
                 # This handles cases where semantically identical queries are
                 # detected as different task types (e.g., "What is X?" vs "Explain X")
@@ -132,7 +239,7 @@ class SemanticCache:
                     )
                     # Use the more lenient (lower) threshold
                     threshold = min(threshold, cached_threshold)
-                    if not self._similarity.above_threshold(result.score, threshold):
+                    if not above_threshold(result.score, threshold):
                         continue
                 else:
                     continue
@@ -148,14 +255,15 @@ class SemanticCache:
                 cached_response = result.metadata.get("response", "")
                 cached_query = result.metadata.get("query", "")
 
-                logger.info(
-                    "Tier 2 cache hit",
-                    extra={
-                        "similarity": round(result.score, 4),
-                        "task_type": task_type,
-                        "cached_query_prefix": cached_query[:40],
-                    },
-                )
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Tier 2 cache hit",
+                        extra={
+                            "similarity": round(result.score, 4),
+                            "task_type": task_type,
+                            "cached_query_prefix": cached_query[:40],
+                        },
+                    )
 
                 return SemanticCacheResult(
                     hit=True,
@@ -192,7 +300,7 @@ class SemanticCache:
             task_type: Detected task category.
         """
         try:
-            embedding = self._embedder.embed_text(query)
+            embedding = self._embed(query)
         except Exception as exc:
             logger.error(
                 "Failed to embed query for semantic cache set",
@@ -200,33 +308,32 @@ class SemanticCache:
             )
             return
 
-        now = datetime.now(timezone.utc)
+        now = time.time()
         vector_id = uuid.uuid4().hex[:16]
 
         entry = VectorDBEntry(
             vector_id=vector_id,
-            embedding=embedding.tolist(),
+            embedding=embedding,
             metadata={
                 "query": query,
                 "response": response,
                 "model": model,
                 "cost": cost,
                 "task_type": task_type,
-                "created_at": now.isoformat(),
-                "expires_at": (
-                    now + timedelta(seconds=self._ttl_seconds)
-                ).isoformat(),
+                "created_at": now,
+                "expires_at": now + self._ttl_seconds,
             },
         )
 
         self._db.upsert([entry])
-        logger.debug(
-            "Tier 2 cache set",
-            extra={
-                "vector_id": vector_id,
-                "task_type": task_type,
-            },
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Tier 2 cache set",
+                extra={
+                    "vector_id": vector_id,
+                    "task_type": task_type,
+                },
+            )
 
     def invalidate(self, query: str) -> bool:
         """Remove a cached entry by re-embedding and finding the closest match.
@@ -242,7 +349,7 @@ class SemanticCache:
         except Exception:
             return False
 
-        results = self._db.query(embedding=embedding.tolist(), top_k=1)
+        results = self._db.query(embedding=embedding, top_k=1)
         if results and results[0].score > 0.99:
             self._db.delete([results[0].vector_id])
             return True
@@ -6,15 +6,75 @@ cached independently.  This enables intermediate result reuse across
 different queries that share common sub-tasks.
 """
 
-import hashlib
+import functools
 import logging
 import re
 from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
+from src.cache._hash import fast_hexdigest
+
 logger = logging.getLogger(__name__)
 
+# Literal keywords at least one of which must occur (case-insensitively)
+# for the matching regex to match.  Plain substring tests run at C speed, so
+# they reject the common no-match prompt far faster than the regex scan,
+# which then only runs to confirm word boundaries.
+_COMPARE_KEYWORDS = (
+    "compare", "difference between", "vs", "versus", "contrast", "better",
+)
+_DOC_REF_KEYWORDS = (
+    "document", "article", "paper", "text", "passage", "section",
+    "paragraph", "based on", "according to", "from the", "in the",
+)
+
+# Patterns are compiled once at import.  Keyword lists that are only
+# tested for "any match" are joined into one alternation, so the prompt
+# is scanned once instead of once per keyword.
+_COMPARE_RE = re.compile(
+    r"\bcompare\b|\bdifference between\b|\bvs\.?\b|\bversus\b"
+    r"|\bcontrast\b|\bbetter.+or\b",
+    re.IGNORECASE,
+)
+_DOC_REF_RE = re.compile(
+    r"\b(?:document|article|paper|text|passage|section|paragraph"
+    r"|based on|according to|from the|in the)\b",
+    re.IGNORECASE,
+)
+# Tried in order; the first match wins
+_COMPARE_SUBJECT_RES = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"compare\s+(.+?)\s+(?:and|with|to)\s+(.+?)(?:\.|$|\?)",
+        r"difference\s+between\s+(.+?)\s+and\s+(.+?)(?:\.|$|\?)",
+        r"(.+?)\s+vs\.?\s+(.+?)(?:\.|$|\?)",
+        r"(.+?)\s+versus\s+(.+?)(?:\.|$|\?)",
+    )
+)
+_SENTENCE_END_RE = re.compile(r"[.!?]")
+_SECTION_SPLIT_RE = re.compile(r"\n\s*(?:\d+[\.\)]\s|#{1,3}\s|\n)")
+_NUMBERED_ITEM_RE = re.compile(r"\d+[\.\)]\s+")
+
+# Step ids for typical workflow lengths, so building a step skips the
+# string formatting; longer workflows fall back to formatting
+_STEP_IDS = tuple(f"step_{i}" for i in range(33))
+
+
+@functools.lru_cache(maxsize=4096)
+def _step_cache_key(
+    step_type: str, intent: str, document_id: Optional[str]
+) -> str:
+    """Return the Tier 3 key ``{doc_id}:{step_type}:{intent_hash}``.
+
+    Memoized because retries and repeated comparisons of the same
+    subjects produce the same triples; only the immutable key string is
+    shared, never the (mutable) step.
+    """
+    doc_part = document_id or "none"
+    intent_hash = fast_hexdigest(intent)[:8]
+    return f"{doc_part}:{step_type}:{intent_hash}"
+
 
 class WorkflowStep(BaseModel):
     """A single step in a decomposed workflow.
@@ -90,9 +150,10 @@ class WorkflowDecomposer:
             return []
 
         prompt = prompt.strip()
+        lowered = prompt.lower()
 
         # Detect comparison pattern
-        if self._is_comparison(prompt):
+        if self._is_comparison(prompt, lowered):
             return self._decompose_comparison(prompt, document_id)
 
         # Detect multi-part questions
@@ -101,7 +162,7 @@ class WorkflowDecomposer:
             return self._decompose_multi_part(parts, document_id)
 
         # Detect document reference
-        if document_id or self._has_document_reference(prompt):
+        if document_id or self._has_document_reference(prompt, lowered):
             doc_id = document_id or self._extract_document_id(prompt)
             return self._decompose_with_document(prompt, doc_id)
 
@@ -127,7 +188,7 @@ class WorkflowDecomposer:
         """
         text = text.strip()
         # Take first sentence or first 80 chars
-        first_sentence = re.split(r"[.!?]", text)[0].strip()
+        first_sentence = _SENTENCE_END_RE.split(text, 1)[0].strip()
         if len(first_sentence) > 80:
             first_sentence = first_sentence[:77] + "..."
         return first_sentence
@@ -145,29 +206,29 @@ class WorkflowDecomposer:
             List of section strings.
         """
         # Split on numbered sections or double newlines
-        sections = re.split(
-            r"\n\s*(?:\d+[\.\)]\s|#{1,3}\s|\n)", text
-        )
-        sections = [s.strip() for s in sections if s.strip()]
+        sections = [
+            section
+            for raw in _SECTION_SPLIT_RE.split(text)
+            if (section := raw.strip())
+        ]
         return sections if sections else [text.strip()]
 
     # ------------------------------------------------------------------
     # Internal decomposition strategies
     # ------------------------------------------------------------------
 
-    def _is_comparison(self, prompt: str) -> bool:
-        """Check if the prompt is a comparison question."""
-        patterns = [
-            r"\bcompare\b",
-            r"\bdifference between\b",
-            r"\bvs\.?\b",
-            r"\bversus\b",
-            r"\bcontrast\b",
-            r"\bbetter.+or\b",
-        ]
-        return any(
-            re.search(p, prompt, re.IGNORECASE) for p in patterns
-        )
+    def _is_comparison(self, prompt: str, lowered: Optional[str] = None) -> bool:
+        """Check if the prompt is a comparison question.
+
+        Args:
+            prompt: The prompt to check.
+            lowered: ``prompt.lower()``, if the caller already has it.
+        """
+        if lowered is None:
+            lowered = prompt.lower()
+        if not any(word in lowered for word in _COMPARE_KEYWORDS):
+            return False
+        return _COMPARE_RE.search(prompt) is not None
 
     def _decompose_comparison(
         self, prompt: str, document_id: Optional[str]
@@ -222,14 +283,8 @@ class WorkflowDecomposer:
     def _extract_comparison_subjects(self, prompt: str) -> List[str]:
         """Extract the two subjects being compared."""
         # Pattern: "compare X and Y", "X vs Y", "difference between X and Y"
-        patterns = [
-            r"compare\s+(.+?)\s+(?:and|with|to)\s+(.+?)(?:\.|$|\?)",
-            r"difference\s+between\s+(.+?)\s+and\s+(.+?)(?:\.|$|\?)",
-            r"(.+?)\s+vs\.?\s+(.+?)(?:\.|$|\?)",
-            r"(.+?)\s+versus\s+(.+?)(?:\.|$|\?)",
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, prompt, re.IGNORECASE)
+        for pattern in _COMPARE_SUBJECT_RES:
+            match = pattern.search(prompt)
             if match:
                 return [match.group(1).strip(), match.group(2).strip()]
         return []
@@ -240,7 +295,7 @@ class WorkflowDecomposer:
         parts: List[str] = []
 
         # Try numbered list
-        numbered = re.split(r"\d+[\.\)]\s+", prompt)
+        numbered = _NUMBERED_ITEM_RE.split(prompt)
         numbered = [p.strip() for p in numbered if p.strip()]
         if len(numbered) > 1:
             return numbered
@@ -271,20 +326,25 @@ class WorkflowDecomposer:
             )
         return steps[: self._config.max_steps]
 
-    def _has_document_reference(self, prompt: str) -> bool:
-        """Check if the prompt references a document."""
-        patterns = [
-            r"\b(document|article|paper|text|passage|section|paragraph)\b",
-            r"\b(based on|according to|from the|in the)\b",
-        ]
-        return any(
-            re.search(p, prompt, re.IGNORECASE) for p in patterns
-        )
+    def _has_document_reference(
+        self, prompt: str, lowered: Optional[str] = None
+    ) -> bool:
+        """Check if the prompt references a document.
+
+        Args:
+            prompt: The prompt to check.
+            lowered: ``prompt.lower()``, if the caller already has it.
+        """
+        if lowered is None:
+            lowered = prompt.lower()
+        if not any(word in lowered for word in _DOC_REF_KEYWORDS):
+            return False
+        return _DOC_REF_RE.search(prompt) is not None
 
     def _extract_document_id(self, prompt: str) -> str:
         """Extract or generate a document ID from the prompt."""
         # Hash the prompt to create a stable document ID
-        return hashlib.md5(prompt.encode()).hexdigest()[:12]
+        return fast_hexdigest(prompt)[:12]
 
     def _decompose_with_document(
         self, prompt: str, document_id: Optional[str]
@@ -327,12 +387,16 @@ class WorkflowDecomposer:
         Returns:
             Constructed WorkflowStep.
         """
-        doc_part = document_id or "none"
-        intent_hash = hashlib.md5(intent.encode()).hexdigest()[:8]
-        cache_key = f"{doc_part}:{step_type}:{intent_hash}"
-
-        return WorkflowStep(
-            step_id=f"step_{step_num}",
+        cache_key = _step_cache_key(step_type, intent, document_id)
+
+        # Every field is built here with the right type, so skip
+        # Pydantic validation
+        return WorkflowStep.model_construct(
+            step_id=(
+                _STEP_IDS[step_num]
+                if 0 <= step_num < len(_STEP_IDS)
+                else f"step_{step_num}"
+            ),
             step_type=step_type,
             intent=intent,
             document_id=document_id,
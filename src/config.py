@@ -6,16 +6,27 @@ overrides (``ASAHI_`` prefix), and exposes a typed :class:`Settings`
 singleton via :func:`get_settings`.
 """
 
+import copy
 import logging
 import os
 import threading
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import (
+    Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, get_type_hints,
+)
 
+import msgspec
 import yaml
 from dotenv import load_dotenv
 
+# libyaml's C loader when PyYAML was built with it; same safe semantics
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -31,47 +42,68 @@ def _project_path(*parts: str) -> Path:
     return _PROJECT_ROOT.joinpath(*parts)
 
 
+# Default file locations, built once rather than on every (re)load
+_DEFAULT_ENV_PATH = _project_path(".env")
+_DEFAULT_CONFIG_PATH = _project_path("config", "config.yaml")
+
+
 # ---------------------------------------------------------------------------
 # Nested settings dataclasses
 # ---------------------------------------------------------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class ApiSettings:
     host: str = "0.0.0.0"
     port: int = 8000
     cors_origins: List[str] = field(default_factory=lambda: ["*"])
     rate_limit_per_minute: int = 100
+    max_body_bytes: int = 512000
     version: str = "1.0.0"
-    baseline_input_rate: float = 0.010
-    baseline_output_rate: float = 0.030
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheSettings:
     ttl_seconds: int = 86400
     max_entries: int = 10000
     cleanup_interval_seconds: int = 300
 
 
-@dataclass
+# Read-only defaults shared by every RoutingSettings / BatchingSettings
+# instance instead of being rebuilt per instance.  YAML values replace
+# them wholesale.
+_DEFAULT_QUALITY_MAP: Mapping[str, float] = MappingProxyType({
+    "low": 3.0, "medium": 3.5, "high": 4.0, "max": 4.5,
+})
+_DEFAULT_LATENCY_MAP: Mapping[str, int] = MappingProxyType({
+    "slow": 2000, "normal": 500, "fast": 300, "instant": 150,
+})
+_DEFAULT_TASK_OVERRIDES: Mapping[str, Mapping[str, float]] = MappingProxyType({
+    "coding": MappingProxyType({"min_quality": 4.0, "max_latency": 500}),
+    "reasoning": MappingProxyType({"min_quality": 4.0, "max_latency": 500}),
+    "legal": MappingProxyType({"min_quality": 4.2, "max_latency": 2000}),
+})
+_DEFAULT_ELIGIBLE_TASK_TYPES: Tuple[str, ...] = (
+    "summarization", "faq", "translation",
+)
+
+
+@dataclass(slots=True)
 class RoutingSettings:
     default_quality_threshold: float = 3.5
     default_latency_budget_ms: int = 300
-    quality_map: Dict[str, float] = field(default_factory=lambda: {
-        "low": 3.0, "medium": 3.5, "high": 4.0, "max": 4.5,
-    })
-    latency_map: Dict[str, int] = field(default_factory=lambda: {
-        "slow": 2000, "normal": 500, "fast": 300, "instant": 150,
-    })
-    task_overrides: Dict[str, Dict[str, float]] = field(default_factory=lambda: {
-        "coding": {"min_quality": 4.0, "max_latency": 500},
-        "reasoning": {"min_quality": 4.0, "max_latency": 500},
-        "legal": {"min_quality": 4.2, "max_latency": 2000},
-    })
-
-
-@dataclass
+    quality_map: Mapping[str, float] = field(
+        default_factory=lambda: _DEFAULT_QUALITY_MAP
+    )
+    latency_map: Mapping[str, int] = field(
+        default_factory=lambda: _DEFAULT_LATENCY_MAP
+    )
+    task_overrides: Mapping[str, Mapping[str, float]] = field(
+        default_factory=lambda: _DEFAULT_TASK_OVERRIDES
+    )
+
+
+@dataclass(slots=True)
 class TrackingSettings:
     log_dir: str = "data/logs"
     enable_kafka: bool = False
@@ -81,7 +113,7 @@ class TrackingSettings:
     baseline_output_rate: float = 0.030
 
 
-@dataclass
+@dataclass(slots=True)
 class AnomalySettings:
     cost_spike_threshold: float = 2.0
     latency_spike_threshold: float = 2.0
@@ -91,14 +123,14 @@ class AnomalySettings:
     rolling_window_hours: int = 24
 
 
-@dataclass
+@dataclass(slots=True)
 class ForecastSettings:
     ema_span_days: int = 7
     min_data_points: int = 3
     stable_threshold_pct: float = 5.0
 
 
-@dataclass
+@dataclass(slots=True)
 class ObservabilitySettings:
     enabled: bool = True
     prometheus_port: int = 9090
@@ -109,7 +141,7 @@ class ObservabilitySettings:
     forecasting: ForecastSettings = field(default_factory=ForecastSettings)
 
 
-@dataclass
+@dataclass(slots=True)
 class EmbeddingsSettings:
     provider: str = "cohere"
     model_name: str = "embed-english-v3.0"
@@ -120,18 +152,17 @@ class EmbeddingsSettings:
     max_retries: int = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class BatchingSettings:
     min_batch_size: int = 2
     max_batch_size: int = 10
     max_wait_ms: int = 500
     latency_threshold_ms: int = 200
-    eligible_task_types: List[str] = field(
-        default_factory=lambda: ["summarization", "faq", "translation"]
-    )
+    eligible_task_types: Sequence[str] = _DEFAULT_ELIGIBLE_TASK_TYPES
+    urgent_window_ms: int = 100
 
 
-@dataclass
+@dataclass(slots=True)
 class FeatureStoreSettings:
     provider: str = "local"
     local_data_path: str = "data/features.json"
@@ -141,7 +172,7 @@ class FeatureStoreSettings:
     max_feature_tokens: int = 200
 
 
-@dataclass
+@dataclass(slots=True)
 class OptimizationSettings:
     min_relevance_threshold: float = 0.3
     scoring_method: str = "keyword"
@@ -151,7 +182,7 @@ class OptimizationSettings:
     max_quality_risk: str = "medium"
 
 
-@dataclass
+@dataclass(slots=True)
 class GovernanceSettings:
     encryption_key_env: str = "ASAHI_ENCRYPTION_KEY"
     pbkdf2_iterations: int = 480000
@@ -162,6 +193,8 @@ class GovernanceSettings:
     auth_api_key_required: bool = False
     auth_key_expiry_days: int = 90
     auth_key_prefix: str = "ask"
+    auth_key_cache_ttl_seconds: int = 300
+    auth_key_cache_max_entries: int = 50000
     budget_tracking_window_hours: int = 24
     default_max_requests_per_day: int = 1000
     tenancy_cache_namespace_prefix: str = "tenant"
@@ -169,49 +202,73 @@ class GovernanceSettings:
     compliance_default_retention_days: int = 365
 
 
-@dataclass
+@dataclass(slots=True)
 class LoggingSettings:
     level: str = "INFO"
     format: str = "json"
 
 
-@dataclass
-class Settings:
-    """Top-level settings container."""
-    api: ApiSettings = field(default_factory=ApiSettings)
-    cache: CacheSettings = field(default_factory=CacheSettings)
-    routing: RoutingSettings = field(default_factory=RoutingSettings)
-    tracking: TrackingSettings = field(default_factory=TrackingSettings)
-    observability: ObservabilitySettings = field(default_factory=ObservabilitySettings)
-    embeddings: EmbeddingsSettings = field(default_factory=EmbeddingsSettings)
-    batching: BatchingSettings = field(default_factory=BatchingSettings)
-    feature_store: FeatureStoreSettings = field(default_factory=FeatureStoreSettings)
-    optimization: OptimizationSettings = field(default_factory=OptimizationSettings)
-    governance: GovernanceSettings = field(default_factory=GovernanceSettings)
-    logging: LoggingSettings = field(default_factory=LoggingSettings)
-
-
 # ---------------------------------------------------------------------------
 # YAML loader
 # ---------------------------------------------------------------------------
 
+# Last parse of each config file, keyed by path and validated against the
+# file's (st_mtime_ns, st_size) so reloads skip parsing an unchanged file
+_YAML_CACHE: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
+
+
 def _load_yaml(path: Path) -> Dict[str, Any]:
-    """Read and parse a YAML file.  Returns ``{}`` if the file is missing."""
-    if not path.exists():
+    """Read and parse a YAML file.  Returns ``{}`` if the file is missing.
+
+    A ``.json`` file (e.g. ``config.yaml`` transcoded at build time) is
+    decoded with msgspec instead, which is far faster than any YAML
+    parser.  Parses are cached until the file's mtime or size changes.
+    Callers always get their own copy, since settings sections keep
+    references to the lists and dicts inside it.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError:
         logger.warning("Config file not found: %s", path)
         return {}
-    with open(path, "r", encoding="utf-8") as fh:
-        data = yaml.safe_load(fh)
-    return data if isinstance(data, dict) else {}
+    cached = _YAML_CACHE.get(path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return copy.deepcopy(cached[2])
+    # Binary mode: both decoders handle the UTF-8 stream themselves
+    with open(path, "rb") as fh:
+        if path.suffix == ".json":
+            data = msgspec.json.decode(fh.read())
+        else:
+            data = yaml.load(fh, Loader=_YamlLoader)
+    if not isinstance(data, dict):
+        data = {}
+    _YAML_CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+    return copy.deepcopy(data)
+
+
+# Settings dataclasses nested inside a section; YAML mappings for these
+# fields are merged into the existing instance rather than replacing it
+_NESTED_SECTION_TYPES = frozenset({AnomalySettings, ForecastSettings})
+
+# Field names per settings dataclass, so applying YAML is a set
+# intersection instead of a hasattr probe per key
+_FIELDS_BY_CLASS: Dict[type, frozenset] = {
+    cls: frozenset(f.name for f in fields(cls))
+    for cls in (
+        ApiSettings, CacheSettings, RoutingSettings, TrackingSettings,
+        AnomalySettings, ForecastSettings, ObservabilitySettings,
+        EmbeddingsSettings, BatchingSettings, FeatureStoreSettings,
+        OptimizationSettings, GovernanceSettings, LoggingSettings,
+    )
+}
 
 
 def _apply_dict(target: object, data: Dict[str, Any]) -> None:
-    """Recursively apply *data* values onto a dataclass instance."""
-    for key, value in data.items():
-        if not hasattr(target, key):
-            continue
+    """Recursively apply *data* values onto a settings dataclass instance."""
+    for key in _FIELDS_BY_CLASS[type(target)] & data.keys():
+        value = data[key]
         current = getattr(target, key)
-        if isinstance(current, (AnomalySettings, ForecastSettings)) and isinstance(value, dict):
+        if type(current) in _NESTED_SECTION_TYPES and isinstance(value, dict):
             _apply_dict(current, value)
         else:
             setattr(target, key, value)
@@ -221,13 +278,22 @@ def _apply_dict(target: object, data: Dict[str, Any]) -> None:
 # Env-var overrides  (ASAHI_SECTION_KEY  e.g. ASAHI_API_PORT)
 # ---------------------------------------------------------------------------
 
-_FLAT_SECTIONS = [
-    "api", "cache", "routing", "tracking", "observability",
-    "embeddings", "batching", "feature_store", "optimization",
-    "governance", "logging",
-]
+# Top-level section name -> section dataclass
+_SECTION_TYPES: Dict[str, type] = {
+    "api": ApiSettings,
+    "cache": CacheSettings,
+    "routing": RoutingSettings,
+    "tracking": TrackingSettings,
+    "observability": ObservabilitySettings,
+    "embeddings": EmbeddingsSettings,
+    "batching": BatchingSettings,
+    "feature_store": FeatureStoreSettings,
+    "optimization": OptimizationSettings,
+    "governance": GovernanceSettings,
+    "logging": LoggingSettings,
+}
 
-_TYPE_MAP = {
+_TYPE_MAP: Dict[type, Callable[[str], Any]] = {
     int: int,
     float: float,
     bool: lambda v: v.lower() in ("1", "true", "yes"),
@@ -235,25 +301,185 @@ _TYPE_MAP = {
 }
 
 
-def _apply_env_overrides(settings: Settings) -> None:
-    """Override flat scalar fields via ``ASAHI_<SECTION>_<KEY>`` env vars."""
-    for section_name in _FLAT_SECTIONS:
-        section = getattr(settings, section_name, None)
-        if section is None:
-            continue
+# (field_name, env_key, cast) for one overridable field
+_EnvField = Tuple[str, str, Callable[[str], Any]]
+
+
+def _build_env_override_table() -> Dict[str, Tuple[_EnvField, ...]]:
+    """Resolve every overridable field to ``(field, env_key, cast)`` once.
+
+    Only scalar fields (those whose declared type is in ``_TYPE_MAP``)
+    are overridable; lists, dicts and nested sections are YAML-only.
+    """
+    table = {}
+    for section_name, section_type in _SECTION_TYPES.items():
         prefix = f"ASAHI_{section_name.upper()}_"
-        for key in list(vars(section)):
-            env_key = prefix + key.upper()
-            env_val = os.environ.get(env_key)
-            if env_val is None:
-                continue
-            current = getattr(section, key)
-            cast = _TYPE_MAP.get(type(current), str)
-            try:
-                setattr(section, key, cast(env_val))
+        # Resolved hints rather than Field.type, which is a plain string
+        # if annotations are ever postponed
+        hints = get_type_hints(section_type)
+        table[section_name] = tuple(
+            (f.name, prefix + f.name.upper(), _TYPE_MAP[hints[f.name]])
+            for f in fields(section_type)
+            if hints[f.name] in _TYPE_MAP
+        )
+    return table
+
+
+_ENV_OVERRIDE_TABLE = _build_env_override_table()
+
+# env_key -> (section_name, field_name, cast): lets overrides be resolved
+# by walking the (few) ASAHI_* variables that are set rather than probing
+# for every overridable field
+_ENV_DISPATCH: Dict[str, Tuple[str, str, Callable[[str], Any]]] = {
+    env_key: (section_name, key, cast)
+    for section_name, entries in _ENV_OVERRIDE_TABLE.items()
+    for key, env_key, cast in entries
+}
+
+# (field_name, env_key, cast, raw_value) for one pending override
+_EnvOverride = Tuple[str, str, Callable[[str], Any], str]
+
+
+def _asahi_env() -> Dict[str, str]:
+    """Snapshot the ``ASAHI_*`` environment variables."""
+    return {k: v for k, v in os.environ.items() if k.startswith("ASAHI_")}
+
+
+def _group_env_overrides(
+    asahi_env: Dict[str, str],
+) -> Dict[str, List[_EnvOverride]]:
+    """Map each set ``ASAHI_*`` variable to its section; unknown keys drop."""
+    grouped: Dict[str, List[_EnvOverride]] = {}
+    for env_key, env_val in asahi_env.items():
+        spec = _ENV_DISPATCH.get(env_key)
+        if spec is not None:
+            section_name, key, cast = spec
+            grouped.setdefault(section_name, []).append(
+                (key, env_key, cast, env_val)
+            )
+    return grouped
+
+
+def _apply_section_env(section: object, overrides: List[_EnvOverride]) -> None:
+    """Apply one section's pending ``ASAHI_<SECTION>_<KEY>`` overrides."""
+    debug = logger.isEnabledFor(logging.DEBUG)
+    for key, env_key, cast, env_val in overrides:
+        try:
+            setattr(section, key, cast(env_val))
+            if debug:
                 logger.debug("Env override applied: %s=%s", env_key, env_val)
-            except (ValueError, TypeError):
-                logger.warning("Invalid env override %s=%s", env_key, env_val)
+        except (ValueError, TypeError):
+            logger.warning("Invalid env override %s=%s", env_key, env_val)
+
+
+def _apply_env_overrides(settings: "Settings") -> None:
+    """Override flat scalar fields via ``ASAHI_<SECTION>_<KEY>`` env vars."""
+    for section_name, overrides in _group_env_overrides(_asahi_env()).items():
+        _apply_section_env(getattr(settings, section_name), overrides)
+
+
+# ---------------------------------------------------------------------------
+# Top-level container
+# ---------------------------------------------------------------------------
+
+
+# Serialises first-access section builds across all Settings instances
+_section_lock = threading.Lock()
+
+
+class Settings:
+    """Top-level settings container.
+
+    Sections are built on first access -- defaults, then the section's
+    YAML mapping, then its ``ASAHI_*`` overrides -- so a process only pays
+    for the sections it reads.  ``Settings()`` holds plain defaults.
+    The container is read-only once built: sections cannot be replaced
+    or removed, so a published instance is safe to share across threads.
+
+    Args:
+        raw: Parsed YAML document.
+        env: ``ASAHI_*`` environment snapshot taken when loading.
+    """
+
+    __slots__ = ("_raw", "_env", *_SECTION_TYPES)
+
+    api: ApiSettings
+    cache: CacheSettings
+    routing: RoutingSettings
+    tracking: TrackingSettings
+    observability: ObservabilitySettings
+    embeddings: EmbeddingsSettings
+    batching: BatchingSettings
+    feature_store: FeatureStoreSettings
+    optimization: OptimizationSettings
+    governance: GovernanceSettings
+    logging: LoggingSettings
+
+    def __init__(
+        self,
+        raw: Optional[Dict[str, Any]] = None,
+        env: Optional[Dict[str, str]] = None,
+    ) -> None:
+        object.__setattr__(self, "_raw", raw or {})
+        # Kept grouped by section so a section build only sees its own
+        object.__setattr__(
+            self, "_env", _group_env_overrides(env) if env else {}
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for attributes not yet set, i.e. unbuilt sections
+        section_type = _SECTION_TYPES.get(name)
+        if section_type is None:
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+        with _section_lock:
+            # Another thread may have built it while we waited
+            try:
+                return object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+            section = section_type()
+            section_data = self._raw.get(name)
+            if isinstance(section_data, dict):
+                _apply_dict(section, section_data)
+            overrides = self._env.get(name)
+            if overrides:
+                _apply_section_env(section, overrides)
+            object.__setattr__(self, name, section)
+            return section
+
+
+# ---------------------------------------------------------------------------
+# .env loader
+# ---------------------------------------------------------------------------
+
+# (path, st_mtime_ns, st_size) of the last .env file loaded
+_dotenv_state: Optional[Tuple[Path, int, int]] = None
+
+
+def _load_dotenv(path: Path) -> None:
+    """Load *path* into ``os.environ`` unless it is unchanged since last load.
+
+    A missing file is a no-op, as it is for ``load_dotenv``.
+    """
+    global _dotenv_state
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        _dotenv_state = None
+        return
+    state = (path, st.st_mtime_ns, st.st_size)
+    if state == _dotenv_state:
+        return
+    load_dotenv(path, override=True)
+    _dotenv_state = state
 
 
 # ---------------------------------------------------------------------------
@@ -274,12 +500,16 @@ def get_settings(
 
     On first call (or when ``_force_reload=True``) the function:
 
-    1. Calls ``load_dotenv()`` to populate env vars from ``.env``.
+    1. Calls ``load_dotenv()`` to populate env vars from ``.env``
+       (skipped when the file is unchanged since the last load).
     2. Reads ``config/config.yaml``.
-    3. Applies ``ASAHI_*`` environment-variable overrides.
+    3. Snapshots the ``ASAHI_*`` environment-variable overrides.
+
+    Individual sections are built from these on first access.
 
     Args:
-        yaml_path: Override the YAML config file path (testing).
+        yaml_path: Override the config file path (testing); ``.json``
+            files are accepted too.
         env_path: Override the ``.env`` file path (testing).
         _force_reload: Re-read everything even if already loaded.
 
@@ -288,8 +518,11 @@ def get_settings(
     """
     global _settings
 
-    if _settings is not None and not _force_reload:
-        return _settings
+    # Lock-free fast path.  The global is read once so a concurrent
+    # reset_settings() cannot make this return None.
+    settings = _settings
+    if settings is not None and not _force_reload:
+        return settings
 
     with _lock:
         # Double-check after acquiring lock
@@ -297,37 +530,16 @@ def get_settings(
             return _settings
 
         # 1. Load .env
-        dotenv_path = env_path or _project_path(".env")
-        load_dotenv(dotenv_path, override=True)
+        _load_dotenv(env_path or _DEFAULT_ENV_PATH)
 
         # 2. Read YAML
-        config_path = yaml_path or _project_path("config", "config.yaml")
+        config_path = yaml_path or _DEFAULT_CONFIG_PATH
         raw = _load_yaml(config_path)
 
-        # 3. Build Settings with defaults, then overlay YAML values
-        settings = Settings()
-
-        for section_name in _FLAT_SECTIONS:
-            section_data = raw.get(section_name)
-            if isinstance(section_data, dict):
-                section_obj = getattr(settings, section_name)
-                _apply_dict(section_obj, section_data)
-
-        # Handle nested observability sub-sections from YAML
-        obs_data = raw.get("observability", {})
-        if isinstance(obs_data, dict):
-            anomaly_data = obs_data.get("anomaly")
-            if isinstance(anomaly_data, dict):
-                _apply_dict(settings.observability.anomaly, anomaly_data)
-            forecast_data = obs_data.get("forecasting")
-            if isinstance(forecast_data, dict):
-                _apply_dict(settings.observability.forecasting, forecast_data)
-
-        # 4. Apply ASAHI_* env-var overrides
-        _apply_env_overrides(settings)
-
-        _settings = settings
-        logger.info("Settings loaded from %s", config_path)
+        # 3. Sections overlay YAML values and ASAHI_* overrides lazily
+        _settings = Settings(raw, _asahi_env())
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Settings loaded from %s", config_path)
         return _settings
 
 
@@ -1,5 +1,17 @@
 """Central orchestration."""
 
-from src.core.optimizer import InferenceOptimizer, InferenceResult
+from typing import Any
 
 __all__ = ["InferenceOptimizer", "InferenceResult"]
+
+
+def __getattr__(name: str) -> Any:
+    # Import the optimizer (and its model/cache/routing graph) on first
+    # use rather than whenever the package is imported (PEP 562)
+    if name in __all__:
+        from src.core import optimizer
+
+        value = getattr(optimizer, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -54,8 +54,9 @@ load_dotenv()
 
 # Optional: batching queue (Step 5 full batching)
 try:
-    from src.batching.queue import QueuedRequest, RequestQueue
+    from src.batching.queue import DISPATCH_GRACE_MS, QueuedRequest, RequestQueue
 except ImportError:
+    DISPATCH_GRACE_MS = 2000
     QueuedRequest = None  # type: ignore[misc, assignment]
     RequestQueue = None  # type: ignore[misc, assignment]
 
@@ -71,6 +72,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Token optimization quality risk, least to most risky
+_RISK_ORDER = {"none": 0, "low": 1, "medium": 2, "high": 3}
+
 
 class InferenceResult(BaseModel):
     """Structured result of an inference request.
@@ -168,6 +172,11 @@ class InferenceOptimizer:
         self._tracker = tracker or EventTracker()
         self._use_mock = use_mock
         self._start_time = time.time()
+        # Bound once, like the caches' settings; infer reads these on
+        # every request
+        _s = get_settings()
+        self._routing_settings = _s.routing
+        self._optimization_settings = _s.optimization
 
         # Phase 1 components
         self._router = router or Router(self._registry)
@@ -251,7 +260,7 @@ class InferenceOptimizer:
         Returns:
             InferenceResult with response, cost, and metadata.
         """
-        _s = get_settings().routing
+        _s = self._routing_settings
         if latency_budget_ms is None:
             latency_budget_ms = _s.default_latency_budget_ms
         if quality_threshold is None:
@@ -436,7 +445,7 @@ class InferenceOptimizer:
         # 3b. TOKEN OPTIMIZATION (Step 3): reduce prompt tokens when safe
         if self._token_optimizer is not None:
             try:
-                opt_settings = get_settings().optimization
+                opt_settings = self._optimization_settings
                 opt_result = self._token_optimizer.optimize(
                     prompt=prompt_to_use,
                     system_prompt=None,
@@ -445,9 +454,8 @@ class InferenceOptimizer:
                     task_type=task_id or "general",
                     quality_preference=quality_preference or "medium",
                 )
-                risk_order = {"none": 0, "low": 1, "medium": 2, "high": 3}
-                max_risk = risk_order.get(opt_settings.max_quality_risk, 2)
-                result_risk = risk_order.get(opt_result.quality_risk, 0)
+                max_risk = _RISK_ORDER.get(opt_settings.max_quality_risk, 2)
+                result_risk = _RISK_ORDER.get(opt_result.quality_risk, 0)
                 if result_risk <= max_risk and opt_result.optimized_prompt:
                     prompt_to_use = opt_result.optimized_prompt
                     logger.debug(
@@ -529,15 +537,20 @@ class InferenceOptimizer:
                         model=decision.model_name,
                         batch_group=eligibility.batch_group,
                         deadline=deadline,
+                        estimated_latency_ms=eligibility.estimated_inference_ms,
                         future=fut,
                         infer_kwargs=infer_kwargs,
                     )
                     self._request_queue.enqueue(qr)
-                    timeout_sec = (eligibility.max_wait_ms / 1000.0) + 2.0
+                    timeout_sec = (
+                        eligibility.max_wait_ms + DISPATCH_GRACE_MS
+                    ) / 1000.0
                     try:
                         batch_result = fut.result(timeout=timeout_sec)
                         return batch_result
                     except Exception:
+                        # Cancel first so a concurrent get_batch skips it
+                        fut.cancel()
                         self._request_queue.remove(request_id)
                         logger.debug(
                             "Batch wait timed out or failed, executing individually",
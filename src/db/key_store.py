@@ -2,13 +2,19 @@
 Database-backed API key store for AuthMiddleware.
 
 Converts between ApiKeyModel and auth._StoredKey. Used when DATABASE_URL is set.
+Lookups are served from a bounded in-process LRU (with TTL) keyed by prefix,
+so an active key only hits PostgreSQL once per TTL window.
 """
 
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Tuple
 
+from src.config import get_settings
 from src.db.repositories import ApiKeyRepository
 from src.governance.auth import _StoredKey
 
@@ -38,10 +44,32 @@ class DbKeyStore:
 
     Args:
         repository: ApiKeyRepository instance.
+        cache_ttl_seconds: How long a looked-up key is served from memory.
+            Bounds how stale a revocation made by another worker can be.
+        cache_max_entries: Maximum cached keys (least recently used evicted).
     """
 
-    def __init__(self, repository: ApiKeyRepository) -> None:
+    def __init__(
+        self,
+        repository: ApiKeyRepository,
+        cache_ttl_seconds: Optional[int] = None,
+        cache_max_entries: Optional[int] = None,
+    ) -> None:
+        _s = get_settings().governance
         self._repo = repository
+        self._cache_ttl = (
+            cache_ttl_seconds
+            if cache_ttl_seconds is not None
+            else _s.auth_key_cache_ttl_seconds
+        )
+        self._cache_max = (
+            cache_max_entries
+            if cache_max_entries is not None
+            else _s.auth_key_cache_max_entries
+        )
+        # key_prefix -> (monotonic expiry, _StoredKey)
+        self._cache: OrderedDict[str, Tuple[float, _StoredKey]] = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     def get_by_prefix(self, key_prefix: str) -> Optional[_StoredKey]:
         """Load a stored key by its 12-char prefix.
@@ -52,10 +80,47 @@ class DbKeyStore:
         Returns:
             _StoredKey if found, None otherwise.
         """
+        now = time.monotonic()
+        with self._cache_lock:
+            cached = self._cache.get(key_prefix)
+            if cached is not None:
+                if cached[0] > now:
+                    self._cache.move_to_end(key_prefix)
+                    return cached[1]
+                del self._cache[key_prefix]
+
         row = self._repo.get_by_prefix(key_prefix)
         if row is None:
             return None
-        return _row_to_stored(row)
+        stored = _row_to_stored(row)
+        self.prime(stored)
+        return stored
+
+    def prime(self, stored: _StoredKey) -> None:
+        """Put a key into the lookup cache (e.g. right after it is inserted).
+
+        Args:
+            stored: The key to cache under its display prefix.
+        """
+        if self._cache_max <= 0:
+            return
+        with self._cache_lock:
+            self._cache[stored.key_display_prefix] = (
+                time.monotonic() + self._cache_ttl,
+                stored,
+            )
+            self._cache.move_to_end(stored.key_display_prefix)
+            while len(self._cache) > self._cache_max:
+                self._cache.popitem(last=False)
+
+    def evict(self, key_prefix: str) -> None:
+        """Drop a key from the lookup cache.
+
+        Args:
+            key_prefix: First 12 characters of the key.
+        """
+        with self._cache_lock:
+            self._cache.pop(key_prefix, None)
 
     def store(self, stored: _StoredKey, full_key: str) -> None:
         """Persist a new API key (called after bcrypt hash is computed).
@@ -74,6 +139,7 @@ class DbKeyStore:
             scopes=stored.scopes,
             expires_at=stored.expires_at,
         )
+        self.prime(stored)
         logger.info(
             "API key stored in DB",
             extra={"key_prefix": stored.key_display_prefix, "org_id": stored.org_id},
@@ -88,4 +154,5 @@ class DbKeyStore:
         Returns:
             True if the key was found and revoked, False otherwise.
         """
+        self.evict(key_prefix)
         return self._repo.revoke_by_prefix(key_prefix)
@@ -130,7 +130,7 @@ class ContextualEmbeddingEngine:
         )
 
         results = vector_db.query(
-            embedding=embedding.tolist(), top_k=top_k
+            embedding=embedding, top_k=top_k
         )
 
         for result in results:
@@ -7,7 +7,7 @@ at runtime based on observed performance data.
 """
 
 import logging
-from typing import Dict, Literal
+from typing import Dict, Literal, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -58,6 +58,9 @@ class AdaptiveThresholdTuner:
 
     def __init__(self, config: ThresholdConfig | None = None) -> None:
         self._config = config or ThresholdConfig()
+        # Resolved (task_type, cost_sensitivity) -> threshold, including
+        # fallbacks; cleared whenever a threshold is updated.
+        self._resolved: Dict[Tuple[str, str], float] = {}
 
     def get_threshold(
         self,
@@ -75,6 +78,11 @@ class AdaptiveThresholdTuner:
         Returns:
             Threshold value between 0.0 and 1.0.
         """
+        cache_key = (task_type, cost_sensitivity)
+        threshold = self._resolved.get(cache_key)
+        if threshold is not None:
+            return threshold
+
         task_thresholds = self._config.thresholds.get(
             task_type,
             self._config.thresholds.get("default", {"medium": 0.85}),
@@ -83,6 +91,7 @@ class AdaptiveThresholdTuner:
             cost_sensitivity,
             task_thresholds.get("medium", 0.85),
         )
+        self._resolved[cache_key] = threshold
         return threshold
 
     def update_threshold(
@@ -114,6 +123,7 @@ class AdaptiveThresholdTuner:
             )
 
         self._config.thresholds[task_type][cost_sensitivity] = new_threshold
+        self._resolved.clear()
 
         logger.info(
             "Threshold updated",
@@ -1,33 +1,42 @@
 """
 Vector database abstraction for Asahi semantic caching.
 
-Provides a backend-agnostic Protocol plus an in-memory implementation
-for development/testing and a Pinecone implementation for production.
+Provides a backend-agnostic Protocol plus in-memory implementations
+(an HNSW index, and a brute-force scan for development/testing) and a
+Pinecone implementation for production.
 """
 
 import logging
 import os
-from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
+import threading
+from typing import Any, Dict, List, Optional, Protocol, Union, runtime_checkable
 
 import numpy as np
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from src.exceptions import VectorDBError
 
 logger = logging.getLogger(__name__)
 
+# Embeddings may be passed as float lists or numpy arrays; numpy arrays
+# are kept as-is so callers avoid boxing every element into a PyFloat.
+Embedding = Union[List[float], np.ndarray]
+
 
 class VectorDBEntry(BaseModel):
     """An entry to upsert into the vector database.
 
     Attributes:
         vector_id: Unique identifier for this vector.
-        embedding: The embedding vector as a list of floats.
+        embedding: The embedding vector as a list of floats or a numpy
+            array.
         metadata: Arbitrary metadata to store alongside the vector.
     """
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     vector_id: str
-    embedding: List[float]
+    embedding: Embedding
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
@@ -58,7 +67,7 @@ class VectorDatabase(Protocol):
 
     def query(
         self,
-        embedding: List[float],
+        embedding: Embedding,
         top_k: int = 5,
         filter: Optional[Dict[str, Any]] = None,
     ) -> List[VectorSearchResult]:
@@ -77,13 +86,47 @@ class VectorDatabase(Protocol):
 class InMemoryVectorDB:
     """In-memory vector database using brute-force cosine search.
 
+    Embeddings are kept as rows of one C-contiguous ``float32`` matrix
+    with their norms precomputed, so a query is a single matrix-vector
+    product (BLAS SGEMV) rather than a Python loop over entries.
+
+    With ``quantize=True`` rows are stored as ``int8`` instead (scaled
+    by their max magnitude), cutting embedding memory by 4x.  Scores are
+    then the cosine of the quantized vectors, accurate to about 1e-2, and
+    the int32-accumulated product is slower than SGEMV, so the default
+    keeps exact ``float32`` scores for threshold decisions.
+
     Suitable for development and testing.  Not recommended for
     production workloads above ~10 000 vectors.
+
+    Args:
+        quantize: Store embeddings as ``int8`` to save memory.
     """
 
-    def __init__(self) -> None:
-        self._vectors: Dict[str, np.ndarray] = {}
+    def __init__(self, quantize: bool = False) -> None:
+        self._dtype = np.int8 if quantize else np.float32
+        # Rows [0, len(self._ids)) of the matrix/norms are live; capacity
+        # doubles as needed.  Row i holds the vector of self._ids[i].
+        self._matrix = np.empty((0, 0), dtype=self._dtype)
+        self._norms = np.empty(0, dtype=np.float32)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
         self._metadata: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _append_row(self, vec: np.ndarray) -> int:
+        """Append *vec* as a new row, growing the matrix if full (lock held)."""
+        row = len(self._ids)
+        if row == 0:
+            # First vector (re)sets the dimension
+            self._matrix = np.empty((8, vec.shape[0]), dtype=self._dtype)
+            self._norms = np.empty(8, dtype=np.float32)
+        elif row == self._matrix.shape[0]:
+            self._matrix = np.concatenate(
+                (self._matrix, np.empty_like(self._matrix))
+            )
+            self._norms = np.concatenate((self._norms, np.empty_like(self._norms)))
+        return row
 
     def upsert(self, entries: List[VectorDBEntry]) -> int:
         """Insert or update vectors.
@@ -98,28 +141,35 @@ class InMemoryVectorDB:
             VectorDBError: If embedding dimensions are inconsistent.
         """
         count = 0
-        for entry in entries:
-            vec = np.array(entry.embedding, dtype=np.float32)
+        with self._lock:
+            for entry in entries:
+                vec = np.asarray(entry.embedding, dtype=np.float32)
 
-            # Validate dimension consistency
-            if self._vectors and entry.vector_id not in self._vectors:
-                existing_dim = next(iter(self._vectors.values())).shape[0]
-                if vec.shape[0] != existing_dim:
+                # Validate dimension consistency
+                if self._ids and vec.shape[0] != self._matrix.shape[1]:
                     raise VectorDBError(
-                        f"Dimension mismatch: expected {existing_dim}, "
+                        f"Dimension mismatch: expected {self._matrix.shape[1]}, "
                         f"got {vec.shape[0]}"
                     )
 
-            self._vectors[entry.vector_id] = vec
-            self._metadata[entry.vector_id] = entry.metadata
-            count += 1
+                if self._dtype is np.int8:
+                    vec = _quantize(vec)
+                row = self._rows.get(entry.vector_id)
+                if row is None:
+                    row = self._append_row(vec)
+                    self._ids.append(entry.vector_id)
+                    self._rows[entry.vector_id] = row
+                self._matrix[row] = vec
+                self._norms[row] = np.linalg.norm(vec.astype(np.float32))
+                self._metadata[entry.vector_id] = entry.metadata
+                count += 1
 
         logger.debug("Vectors upserted", extra={"count": count})
         return count
 
     def query(
         self,
-        embedding: List[float],
+        embedding: Embedding,
         top_k: int = 5,
         filter: Optional[Dict[str, Any]] = None,
     ) -> List[VectorSearchResult]:
@@ -133,45 +183,265 @@ class InMemoryVectorDB:
         Returns:
             List of VectorSearchResult sorted by similarity (highest first).
         """
-        if not self._vectors:
+        if top_k <= 0:
             return []
 
-        query_vec = np.array(embedding, dtype=np.float32)
-        query_norm = np.linalg.norm(query_vec)
+        query_vec = np.asarray(embedding, dtype=np.float32)
+        if self._dtype is np.int8:
+            query_vec = _quantize(query_vec)
+        query_norm = np.linalg.norm(query_vec.astype(np.float32))
         if query_norm == 0:
             return []
 
-        results: List[VectorSearchResult] = []
+        with self._lock:
+            n = len(self._ids)
+            if n == 0:
+                return []
 
-        for vid, vec in self._vectors.items():
-            # Apply metadata filter
+            norms = self._norms[:n]
+            # Zero vectors have no direction and never match
+            candidates = norms > 0
             if filter:
-                meta = self._metadata.get(vid, {})
-                if not all(meta.get(k) == v for k, v in filter.items()):
+                metadata = self._metadata
+                candidates &= np.fromiter(
+                    (
+                        all(metadata[vid].get(k) == v for k, v in filter.items())
+                        for vid in self._ids
+                    ),
+                    dtype=bool,
+                    count=n,
+                )
+            rows = np.flatnonzero(candidates)
+            if rows.size == 0:
+                return []
+
+            matrix = self._matrix[:n] if rows.size == n else self._matrix[rows]
+            if self._dtype is np.int8:
+                # Per-row scales cancel out of the cosine, so the int32
+                # dot product only needs the quantized norms
+                scores = np.einsum(
+                    "ij,j->i", matrix, query_vec, dtype=np.int32
+                ).astype(np.float32)
+            else:
+                scores = matrix @ query_vec
+            scores /= (norms if rows.size == n else norms[rows]) * query_norm
+            np.clip(scores, 0.0, 1.0, out=scores)
+
+            if top_k < rows.size:
+                top = np.argpartition(-scores, top_k - 1)[:top_k]
+            else:
+                top = np.arange(rows.size)
+            # Highest score first; ties keep row order
+            top = top[np.lexsort((top, -scores[top]))]
+
+            ids, meta = self._ids, self._metadata
+            return [
+                VectorSearchResult(
+                    vector_id=ids[rows[i]],
+                    score=float(scores[i]),
+                    metadata=meta[ids[rows[i]]],
+                )
+                for i in top
+            ]
+
+    def delete(self, vector_ids: List[str]) -> int:
+        """Delete vectors by ID.
+
+        The last row is moved into the deleted row's slot, so deletes
+        are O(d) and the live rows stay packed.
+
+        Args:
+            vector_ids: IDs to delete.
+
+        Returns:
+            Number of actually deleted entries.
+        """
+        count = 0
+        with self._lock:
+            for vid in vector_ids:
+                row = self._rows.pop(vid, None)
+                if row is None:
                     continue
+                last = len(self._ids) - 1
+                if row != last:
+                    moved = self._ids[last]
+                    self._matrix[row] = self._matrix[last]
+                    self._norms[row] = self._norms[last]
+                    self._ids[row] = moved
+                    self._rows[moved] = row
+                self._ids.pop()
+                del self._metadata[vid]
+                count += 1
 
-            vec_norm = np.linalg.norm(vec)
-            if vec_norm == 0:
-                continue
+        logger.debug("Vectors deleted", extra={"count": count})
+        return count
 
-            score = float(np.dot(query_vec, vec) / (query_norm * vec_norm))
-            score = max(0.0, min(1.0, score))
+    def count(self) -> int:
+        """Return total number of stored vectors."""
+        return len(self._ids)
 
-            results.append(
-                VectorSearchResult(
-                    vector_id=vid,
-                    score=score,
-                    metadata=self._metadata.get(vid, {}),
+
+# Optional HNSW backend; requires the hnswlib package (pip install hnswlib)
+try:
+    import hnswlib
+except Exception:
+    hnswlib = None  # type: ignore[assignment]
+
+
+class HNSWVectorDB:
+    """In-memory vector database backed by an HNSW graph index.
+
+    Queries walk the graph in roughly O(log N) instead of scanning every
+    stored vector, so lookups stay flat as the semantic cache grows into
+    the tens of thousands of entries.  Results are approximate; recall
+    is tuned by ``ef_search``.  Vector ids are mapped to the integer
+    labels hnswlib stores, and metadata is kept in a sidecar dict.
+
+    Args:
+        dimension: Embedding dimensionality.
+        max_elements: Initial index capacity; the index grows on demand.
+        ef_construction: Build-time candidate list size.
+        M: Graph out-degree.
+        ef_search: Query-time candidate list size.
+
+    Raises:
+        VectorDBError: If hnswlib is not installed.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        max_elements: int = 10_000,
+        ef_construction: int = 64,
+        M: int = 16,
+        ef_search: int = 100,
+    ) -> None:
+        if hnswlib is None:
+            raise VectorDBError("hnswlib is not installed")
+        self._dimension = dimension
+        self._index = hnswlib.Index(space="cosine", dim=dimension)
+        self._index.init_index(
+            max_elements=max_elements, ef_construction=ef_construction, M=M
+        )
+        self._index.set_ef(ef_search)
+        self._labels: Dict[str, int] = {}
+        self._ids: Dict[int, str] = {}
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+        self._next_label = 0
+        # Labels freed by delete(), handed out again before new ones
+        self._free_labels: List[int] = []
+        # hnswlib is not safe for resize/delete concurrent with queries
+        self._lock = threading.Lock()
+
+    def upsert(self, entries: List[VectorDBEntry]) -> int:
+        """Insert or update vectors.
+
+        Args:
+            entries: List of entries to upsert.
+
+        Returns:
+            Number of entries upserted.
+
+        Raises:
+            VectorDBError: If an embedding has the wrong dimension.
+        """
+        if not entries:
+            return 0
+
+        vectors = np.empty((len(entries), self._dimension), dtype=np.float32)
+        for row, entry in enumerate(entries):
+            vec = np.asarray(entry.embedding, dtype=np.float32)
+            if vec.shape != (self._dimension,):
+                raise VectorDBError(
+                    f"Dimension mismatch: expected {self._dimension}, "
+                    f"got {vec.shape[0] if vec.ndim else 0}"
                 )
+            vectors[row] = vec
+
+        with self._lock:
+            labels = np.empty(len(entries), dtype=np.int64)
+            for row, entry in enumerate(entries):
+                label = self._labels.get(entry.vector_id)
+                if label is None:
+                    if self._free_labels:
+                        label = self._free_labels.pop()
+                    else:
+                        label = self._next_label
+                        self._next_label += 1
+                    self._labels[entry.vector_id] = label
+                    self._ids[label] = entry.vector_id
+                labels[row] = label
+                self._metadata[entry.vector_id] = entry.metadata
+
+            capacity = self._index.get_max_elements()
+            if self._next_label > capacity:
+                self._index.resize_index(max(self._next_label, capacity * 2))
+            # Existing labels are updated in place; re-adding a deleted
+            # label unmarks it, so freed slots are reused
+            self._index.add_items(vectors, labels)
+
+        logger.debug("Vectors upserted", extra={"count": len(entries)})
+        return len(entries)
+
+    def query(
+        self,
+        embedding: Embedding,
+        top_k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[VectorSearchResult]:
+        """Find the (approximate) top-k most similar vectors.
+
+        Args:
+            embedding: Query embedding vector.
+            top_k: Maximum number of results to return.
+            filter: Optional metadata filter (key-value exact match).
+
+        Returns:
+            List of VectorSearchResult sorted by similarity (highest first).
+        """
+        query_vec = np.asarray(embedding, dtype=np.float32)
+        if not query_vec.any():
+            return []
+
+        with self._lock:
+            k = min(top_k, len(self._labels))
+            if k <= 0:
+                return []
+
+            label_filter = None
+            if filter:
+                metadata, ids = self._metadata, self._ids
+
+                def label_filter(label: int) -> bool:
+                    meta = metadata[ids[label]]
+                    return all(meta.get(key) == v for key, v in filter.items())
+
+                k = min(k, sum(1 for label in ids if label_filter(label)))
+                if k == 0:
+                    return []
+
+            labels, distances = self._index.knn_query(
+                query_vec, k=k, filter=label_filter
             )
 
-        # Sort by score descending
-        results.sort(key=lambda r: r.score, reverse=True)
-        return results[:top_k]
+            results: List[VectorSearchResult] = []
+            for label, distance in zip(labels[0], distances[0], strict=True):
+                vid = self._ids[int(label)]
+                # Cosine distance is 1 - similarity
+                score = max(0.0, min(1.0, 1.0 - float(distance)))
+                results.append(
+                    VectorSearchResult(
+                        vector_id=vid, score=score, metadata=self._metadata[vid]
+                    )
+                )
+        return results
 
     def delete(self, vector_ids: List[str]) -> int:
         """Delete vectors by ID.
 
+        Deleted labels are masked out of the graph rather than removed,
+        and are reused by later inserts, so churn does not grow the index.
+
         Args:
             vector_ids: IDs to delete.
 
@@ -179,9 +449,14 @@ class InMemoryVectorDB:
             Number of actually deleted entries.
         """
         count = 0
-        for vid in vector_ids:
-            if vid in self._vectors:
-                del self._vectors[vid]
+        with self._lock:
+            for vid in vector_ids:
+                label = self._labels.pop(vid, None)
+                if label is None:
+                    continue
+                self._index.mark_deleted(label)
+                self._free_labels.append(label)
+                del self._ids[label]
                 self._metadata.pop(vid, None)
                 count += 1
 
@@ -190,7 +465,22 @@ class InMemoryVectorDB:
 
     def count(self) -> int:
         """Return total number of stored vectors."""
-        return len(self._vectors)
+        return len(self._labels)
+
+
+def _quantize(vec: np.ndarray) -> np.ndarray:
+    """Quantize a float vector to ``int8`` scaled by its max magnitude."""
+    peak = np.abs(vec).max() if vec.size else 0.0
+    if peak == 0:
+        return np.zeros(vec.shape, dtype=np.int8)
+    return np.rint(vec * (127.0 / peak)).astype(np.int8)
+
+
+def _as_list(embedding: Embedding) -> List[float]:
+    """Convert an embedding to the plain float list Pinecone's client sends."""
+    if isinstance(embedding, np.ndarray):
+        return embedding.tolist()
+    return embedding
 
 
 # Optional Pinecone backend (Step 7); requires pinecone package (pip install pinecone)
@@ -240,7 +530,7 @@ class PineconeVectorDB:
                 )
             vectors.append({
                 "id": entry.vector_id,
-                "values": entry.embedding,
+                "values": _as_list(entry.embedding),
                 "metadata": entry.metadata,
             })
         ns = self._namespace or None
@@ -249,7 +539,7 @@ class PineconeVectorDB:
 
     def query(
         self,
-        embedding: List[float],
+        embedding: Embedding,
         top_k: int = 5,
         filter: Optional[Dict[str, Any]] = None,
     ) -> List[VectorSearchResult]:
@@ -260,7 +550,7 @@ class PineconeVectorDB:
             )
         ns = self._namespace or None
         resp = self._index.query(
-            vector=embedding,
+            vector=_as_list(embedding),
             top_k=top_k,
             include_metadata=True,
             namespace=ns,
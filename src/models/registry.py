@@ -116,6 +116,20 @@ class ModelRegistry:
             )
         return self._models[name]
 
+    def get_or_none(self, name: str) -> Optional[ModelProfile]:
+        """Return a model profile by name, or ``None`` if it is unknown.
+
+        Non-raising variant of :meth:`get` for callers that treat a
+        missing model as "use defaults".
+
+        Args:
+            name: Canonical model identifier.
+
+        Returns:
+            The matching ModelProfile, or ``None``.
+        """
+        return self._models.get(name)
+
     def remove(self, name: str) -> None:
         """De-register a model.
 
@@ -279,9 +293,12 @@ def estimate_tokens(text: str) -> int:
     Returns:
         Estimated token count (minimum 1 for non-empty text, 0 for empty).
     """
-    if not text or not text.strip():
+    # str.split() already ignores surrounding whitespace, so a separate
+    # strip() (a full copy of a possibly huge prompt) is unnecessary.
+    words = len(text.split()) if text else 0
+    if not words:
         return 0
-    return max(1, int(len(text.split()) * 1.3))
+    return max(1, int(words * 1.3))
 
 
 def calculate_cost(
@@ -7,7 +7,6 @@ history actually contribute to answer quality, enabling safe removal
 of low-relevance content.
 """
 
-import hashlib
 import logging
 import math
 import re
@@ -15,6 +14,7 @@ from collections import Counter
 from typing import Any, Dict, List, Literal, Optional
 
 import numpy as np
+import xxhash
 from pydantic import BaseModel, Field
 
 from src.embeddings.engine import EmbeddingEngine
@@ -420,5 +420,7 @@ class ContextAnalyzer:
         Returns:
             ID string like ``"system-a1b2c3d4"``.
         """
-        digest = hashlib.md5(text.encode()).hexdigest()[:8]
+        # Only needs to be deterministic, so use the non-cryptographic
+        # xxHash3 rather than MD5
+        digest = xxhash.xxh3_64_hexdigest(text.encode("utf-8"))[:8]
         return f"{category}-{digest}"
@@ -0,0 +1,40 @@
+"""Shared HTTP client for the provider adapters.
+
+Opening an ``httpx.Client`` per call pays a fresh TCP + TLS handshake on
+every inference request.  All adapters instead post through one pooled
+client, so connections to each provider stay alive between requests and,
+over HTTP/2, concurrent requests share a single connection.
+"""
+
+import functools
+import importlib.util
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+import httpx
+
+# HTTP/2 needs the optional ``h2`` package (``httpx[http2]``)
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+_LIMITS = httpx.Limits(max_keepalive_connections=64, max_connections=256)
+_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+
+@functools.cache
+def get_http_client() -> httpx.Client:
+    """Return the process-wide pooled HTTP client.
+
+    ``httpx.Client`` is thread-safe, so the adapters (which run on the
+    optimizer's worker threads) share this one instance.  API keys are
+    sent as per-request headers, never set on the client, and its cookie
+    jar rejects every cookie: a ``Set-Cookie`` from one provider response
+    must not be replayed on later requests from other tenants.
+
+    Returns:
+        The shared ``httpx.Client``.
+    """
+    return httpx.Client(
+        http2=_HTTP2,
+        limits=_LIMITS,
+        timeout=_TIMEOUT,
+        cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+    )
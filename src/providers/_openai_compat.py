@@ -10,8 +10,7 @@ import logging
 import time
 from typing import Optional
 
-import httpx
-
+from src.providers._http import get_http_client
 from src.providers.base import (
     InferenceRequest,
     InferenceResponse,
@@ -22,8 +21,6 @@ from src.providers.base import (
 
 logger = logging.getLogger(__name__)
 
-_TIMEOUT = 60.0  # seconds
-
 
 class OpenAICompatMixin:
     """Mixin for providers that speak the OpenAI chat completions protocol."""
@@ -72,8 +69,7 @@ class OpenAICompatMixin:
         }
 
         start = time.time()
-        with httpx.Client(timeout=_TIMEOUT) as client:
-            resp = client.post(url, json=body, headers=headers)
+        resp = get_http_client().post(url, json=body, headers=headers)
 
         latency_ms = int((time.time() - start) * 1000)
 
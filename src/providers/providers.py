@@ -15,6 +15,7 @@ from typing import Optional
 
 import httpx
 
+from src.providers._http import get_http_client
 from src.providers._openai_compat import OpenAICompatMixin
 from src.providers.base import (
     InferenceRequest,
@@ -27,8 +28,6 @@ from src.providers.base import (
 
 logger = logging.getLogger(__name__)
 
-_TIMEOUT = 60.0
-
 
 # ── Helper ──────────────────────────────────────────────────────────────
 
@@ -99,8 +98,7 @@ class AnthropicProvider(ProviderAdapter):
             body["temperature"] = request.temperature
 
         start = time.time()
-        with httpx.Client(timeout=_TIMEOUT) as client:
-            resp = client.post(self._BASE_URL, json=body, headers=headers)
+        resp = get_http_client().post(self._BASE_URL, json=body, headers=headers)
         latency_ms = int((time.time() - start) * 1000)
 
         _raise_for_status(self.provider_name, resp)
@@ -161,12 +159,11 @@ class GoogleProvider(ProviderAdapter):
         }
 
         start = time.time()
-        with httpx.Client(timeout=_TIMEOUT) as client:
-            resp = client.post(
-                url,
-                json=body,
-                headers={"Content-Type": "application/json"},
-            )
+        resp = get_http_client().post(
+            url,
+            json=body,
+            headers={"Content-Type": "application/json"},
+        )
         latency_ms = int((time.time() - start) * 1000)
 
         _raise_for_status(self.provider_name, resp)
@@ -276,9 +273,8 @@ class OllamaProvider(OpenAICompatMixin, ProviderAdapter):
         """Query the Ollama instance for pulled models."""
         url = f"{self._base_url}/api/tags"
         try:
-            with httpx.Client(timeout=10.0) as client:
-                resp = client.get(url)
-                resp.raise_for_status()
+            resp = get_http_client().get(url, timeout=10.0)
+            resp.raise_for_status()
             data = resp.json()
             models = [m["name"] for m in data.get("models", [])]
             self._registered_models = set(models)
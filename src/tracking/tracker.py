@@ -7,7 +7,6 @@ local JSONL files (MVP) with a pluggable backend interface.
 """
 
 import csv
-import json
 import logging
 import os
 from datetime import datetime, timezone
@@ -224,11 +223,12 @@ class EventTracker:
                 if not line:
                     continue
                 try:
-                    data = json.loads(line)
-                    event = InferenceEvent(**data)
+                    # Parse and validate in one pass in pydantic-core,
+                    # which also reads the ISO timestamps natively
+                    event = InferenceEvent.model_validate_json(line)
                     self._events.append(event)
                     loaded += 1
-                except (json.JSONDecodeError, Exception) as exc:
+                except Exception as exc:
                     logger.warning(
                         "Skipping corrupted JSONL line",
                         extra={
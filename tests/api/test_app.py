@@ -285,6 +285,11 @@ class TestErrorHandling:
         resp = client.post("/infer", json={"prompt": "x" * 200000})
         assert resp.status_code == 422
 
+    def test_oversize_body_returns_413(self, client: TestClient) -> None:
+        resp = client.post("/infer", json={"prompt": "x" * 600000})
+        assert resp.status_code == 413
+        assert resp.json()["error"] == "payload_too_large"
+
 
 # ---------------------------------------------------------------------------
 # Exception handler tests
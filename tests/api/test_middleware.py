@@ -0,0 +1,79 @@
+"""Tests for API middleware helpers (rate limiting)."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.api.middleware import RateLimiter, RedisRateLimiter
+
+
+class TestRateLimiter:
+    """Tests for the in-memory sliding-window RateLimiter."""
+
+    def test_allows_under_limit(self) -> None:
+        limiter = RateLimiter(max_requests=3, window_seconds=60)
+        assert all(limiter.is_allowed("ip") for _ in range(3))
+
+    def test_blocks_at_limit(self) -> None:
+        limiter = RateLimiter(max_requests=2, window_seconds=60)
+        limiter.is_allowed("ip")
+        limiter.is_allowed("ip")
+        assert limiter.is_allowed("ip") is False
+
+    def test_clients_are_independent(self) -> None:
+        limiter = RateLimiter(max_requests=1, window_seconds=60)
+        assert limiter.is_allowed("a")
+        assert limiter.is_allowed("b")
+        assert limiter.is_allowed("a") is False
+
+    def test_expired_entries_are_pruned(self) -> None:
+        limiter = RateLimiter(max_requests=2, window_seconds=10)
+        with patch("src.api.middleware.time.time", return_value=100.0):
+            limiter.is_allowed("ip")
+            limiter.is_allowed("ip")
+            assert limiter.is_allowed("ip") is False
+        with patch("src.api.middleware.time.time", return_value=111.0):
+            assert limiter.is_allowed("ip")
+        assert len(limiter._requests["ip"]) == 1
+
+
+@pytest.fixture
+def redis_limiter():
+    """Create a RedisRateLimiter backed by async fakeredis (Lua needs lupa)."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    return RedisRateLimiter(client, max_requests=2, window_seconds=10)
+
+
+class TestRedisRateLimiter:
+    """Tests for the Redis-backed sliding-window RedisRateLimiter."""
+
+    async def test_blocks_at_limit(self, redis_limiter: RedisRateLimiter) -> None:
+        assert await redis_limiter.is_allowed("ip")
+        assert await redis_limiter.is_allowed("ip")
+        assert await redis_limiter.is_allowed("ip") is False
+        assert await redis_limiter.is_allowed("other")
+
+    async def test_window_expiry(self, redis_limiter: RedisRateLimiter) -> None:
+        with patch("src.api.middleware.time.time", return_value=100.0):
+            await redis_limiter.is_allowed("ip")
+            await redis_limiter.is_allowed("ip")
+            assert await redis_limiter.is_allowed("ip") is False
+        with patch("src.api.middleware.time.time", return_value=111.0):
+            assert await redis_limiter.is_allowed("ip")
+
+    async def test_fails_open_on_redis_error(self) -> None:
+        client = MagicMock()
+        client.register_script.return_value = AsyncMock(
+            side_effect=ConnectionError("down")
+        )
+        limiter = RedisRateLimiter(client, max_requests=1)
+        assert await limiter.is_allowed("ip")
+
+    def test_from_url_uses_async_client(self) -> None:
+        pytest.importorskip("redis")
+        import redis.asyncio as aioredis
+
+        limiter = RedisRateLimiter.from_url("redis://localhost:6399/0")
+        assert isinstance(limiter._client, aioredis.Redis)
@@ -1,5 +1,7 @@
 """Tests for BatchEngine -- request batching eligibility."""
 
+from typing import List, Optional
+
 import pytest
 
 from src.batching.engine import BatchConfig, BatchEligibility, BatchEngine
@@ -81,6 +83,21 @@ class TestBatchEngine:
     def engine_no_registry(self, config: BatchConfig) -> BatchEngine:
         return BatchEngine(config=config, model_registry=None)
 
+    @pytest.fixture
+    def lookups(
+        self, registry: ModelRegistry, monkeypatch: pytest.MonkeyPatch
+    ) -> List[str]:
+        """Model names passed to ``registry.get_or_none``, in call order."""
+        calls: List[str] = []
+        original_get = registry.get_or_none
+
+        def counting_get(name: str) -> Optional[ModelProfile]:
+            calls.append(name)
+            return original_get(name)
+
+        monkeypatch.setattr(registry, "get_or_none", counting_get)
+        return calls
+
     # ------------------------------------------------------------------
     # Eligible requests
     # ------------------------------------------------------------------
@@ -242,6 +259,62 @@ class TestBatchEngine:
         assert result.eligible is True
         # With default 100ms estimated inference: 300 - 100 = 200, min(200, 500) = 200
         assert result.max_wait_ms == 200
+        assert result.estimated_inference_ms == 100
+
+    def test_per_request_limit_computed_once_per_model(
+        self, registry: ModelRegistry, lookups: List[str]
+    ) -> None:
+        engine = BatchEngine(config=BatchConfig(), model_registry=registry)
+        for _ in range(3):
+            engine._per_request_limit("deepseek-chat")
+        assert lookups == ["deepseek-chat"]
+
+    def test_registry_lookup_memoised_across_evaluates(
+        self, registry: ModelRegistry, lookups: List[str]
+    ) -> None:
+        engine = BatchEngine(config=BatchConfig(), model_registry=registry)
+        for _ in range(3):
+            engine.evaluate("Summarize this", "faq", "claude-3-5-sonnet", 1000)
+        assert lookups == ["claude-3-5-sonnet"]
+
+        engine.clear_profile_cache()
+        engine.evaluate("Summarize this", "faq", "claude-3-5-sonnet", 1000)
+        assert len(lookups) == 2
+
+    def test_eligible_result_matches_validated_model(self) -> None:
+        engine = BatchEngine(config=BatchConfig())
+        result = engine.evaluate("Summarize this", "faq", "claude-3-5-sonnet", 1000)
+        assert result == BatchEligibility.model_validate(result.model_dump())
+
+    def test_batch_group_key_is_shared_across_evaluates(self) -> None:
+        engine = BatchEngine(config=BatchConfig())
+        first = engine.evaluate("Summarize this", "faq", "claude-3-5-sonnet", 1000)
+        second = engine.evaluate("Other text", "faq", "claude-3-5-sonnet", 1000)
+        assert first.batch_group == "faq:claude-3-5-sonnet"
+        assert first.batch_group is second.batch_group
+
+    # ------------------------------------------------------------------
+    # evaluate_batch
+    # ------------------------------------------------------------------
+
+    def test_evaluate_batch_matches_evaluate(self, engine: BatchEngine) -> None:
+        huge_prompt = " ".join(["word"] * 6000)
+        cases = [
+            ("Summarize this", "summarization", "claude-3-5-sonnet", 1000),
+            ("Quick answer", "faq", "claude-3-5-sonnet", 100),
+            ("Write code", "coding", "gpt-4-turbo", 1000),
+            (huge_prompt, "summarization", "deepseek-chat", 5000),
+            ("Translate hi", "translation", "gpt-4-turbo", 10000),
+        ]
+        batch = engine.evaluate_batch(*map(list, zip(*cases)))
+        assert batch == [engine.evaluate(*case) for case in cases]
+
+    def test_evaluate_batch_empty(self, engine: BatchEngine) -> None:
+        assert engine.evaluate_batch([], [], [], []) == []
+
+    def test_evaluate_batch_length_mismatch(self, engine: BatchEngine) -> None:
+        with pytest.raises(BatchingError, match="same length"):
+            engine.evaluate_batch(["a"], ["faq"], [], [1000])
 
     # ------------------------------------------------------------------
     # Error wrapping
@@ -257,12 +330,9 @@ class TestBatchEngine:
         with pytest.raises(BatchingError, match="Failed to evaluate"):
             engine.evaluate("text", "faq", "model", 1000)
 
-    def test_registry_get_failure_skips_token_check(self) -> None:
-        """If registry.get raises, token check is skipped gracefully."""
+    def test_unknown_model_skips_token_check(self) -> None:
+        """If the registry doesn't know the model, token check is skipped."""
         registry = ModelRegistry(config_path=None)
-        registry.get = lambda name: (_ for _ in ()).throw(  # type: ignore[assignment]
-            RuntimeError("broken")
-        )
         engine = BatchEngine(
             config=BatchConfig(),
             model_registry=registry,
@@ -271,12 +341,9 @@ class TestBatchEngine:
         # Should still be eligible because token check was skipped
         assert result.eligible is True
 
-    def test_registry_get_failure_uses_default_latency(self) -> None:
-        """If registry.get fails during latency estimate, default is used."""
+    def test_unknown_model_uses_default_latency(self) -> None:
+        """If the registry doesn't know the model, default latency is used."""
         registry = ModelRegistry(config_path=None)
-        registry.get = lambda name: (_ for _ in ()).throw(  # type: ignore[assignment]
-            RuntimeError("broken")
-        )
         engine = BatchEngine(
             config=BatchConfig(max_wait_ms=500),
             model_registry=registry,
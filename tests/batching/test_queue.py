@@ -1,13 +1,20 @@
 """Tests for RequestQueue -- thread-safe batching queue."""
 
+import sys
 import threading
 import time
+from concurrent.futures import Future
 from datetime import datetime, timedelta, timezone
 from typing import List
+from unittest.mock import patch
 
 import pytest
 
-from src.batching.queue import QueuedRequest, RequestQueue
+from src.batching.queue import (
+    DISPATCH_GRACE_MS,
+    QueuedRequest,
+    RequestQueue,
+)
 
 
 def _make_request(
@@ -43,6 +50,50 @@ class TestQueuedRequest:
         assert req.deadline > req.enqueued_at
 
 
+class TestMsUntilDeadline:
+    """Tests for QueuedRequest.ms_until_deadline."""
+
+    def test_future_and_past_deadlines(self) -> None:
+        assert 4000 < _make_request(deadline_offset_ms=5000).ms_until_deadline() <= 5000
+        assert _make_request(deadline_offset_ms=-100).ms_until_deadline() < -99
+
+
+class TestMonotonicClock:
+    """Tests for anchoring request times on the monotonic clock."""
+
+    def test_enqueued_ns_is_current_monotonic_time(self) -> None:
+        req = _make_request()
+        assert abs(req.enqueued_ns - time.monotonic_ns()) < 50_000_000  # 50 ms
+
+    def test_deadline_is_relative_to_enqueue(self) -> None:
+        # Datetimes stamped while the wall clock was an hour off (e.g.
+        # before an NTP step) only contribute their difference
+        skewed = datetime.now(timezone.utc) - timedelta(hours=1)
+        req = QueuedRequest(
+            request_id="r1",
+            prompt="hello",
+            model="m",
+            batch_group="g",
+            enqueued_at=skewed,
+            deadline=skewed + timedelta(seconds=5),
+        )
+        assert 4000 < req.ms_until_deadline() <= 5000
+        queue = RequestQueue()
+        queue.enqueue(req)
+        (snap,) = queue.snapshot()
+        assert snap.oldest_age_ms < 1000
+        assert snap.deadline_expired is False
+        assert [r.request_id for r in queue.get_batch("g", 10)] == ["r1"]
+
+    def test_age_ignores_wall_clock_jumps(self) -> None:
+        queue = RequestQueue()
+        queue.enqueue(_make_request("r1"))
+        # A wall-clock step an hour forward must not age the request
+        with patch("time.time_ns", return_value=time.time_ns() + 3_600 * 10**9):
+            assert queue.oldest_request_age_ms("faq:claude-3-5-sonnet") < 1000
+            assert queue.get_expired_groups() == []
+
+
 class TestRequestQueue:
     """Tests for RequestQueue operations."""
 
@@ -94,6 +145,14 @@ class TestRequestQueue:
         batch = queue.get_batch("faq:claude-3-5-sonnet", 5)
         assert len(batch) == 5
 
+    def test_get_batch_is_fifo(self, queue: RequestQueue) -> None:
+        for i in range(5):
+            queue.enqueue(_make_request(f"r{i}"))
+        first = queue.get_batch("faq:claude-3-5-sonnet", 2)
+        rest = queue.get_batch("faq:claude-3-5-sonnet", 10)
+        assert [r.request_id for r in first] == ["r0", "r1"]
+        assert [r.request_id for r in rest] == ["r2", "r3", "r4"]
+
     def test_get_batch_empty_group(self, queue: RequestQueue) -> None:
         batch = queue.get_batch("nonexistent", 5)
         assert batch == []
@@ -135,23 +194,163 @@ class TestRequestQueue:
             prompt="old request",
             model="claude-3-5-sonnet",
             batch_group="faq:sonnet",
-            enqueued_at=now - timedelta(seconds=10),
+            enqueued_at=now,
             deadline=now - timedelta(seconds=1),  # already expired
         )
         queue.enqueue(req)
         expired = queue.get_expired_groups()
         assert "faq:sonnet" in expired
 
+    def test_expired_group_cleared_after_batch_pop(
+        self, queue: RequestQueue
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        queue.enqueue(
+            QueuedRequest(
+                request_id="expired-1",
+                prompt="old request",
+                model="m",
+                batch_group="g",
+                enqueued_at=now,
+                deadline=now - timedelta(seconds=1),
+            )
+        )
+        queue.enqueue(_make_request("fresh", batch_group="g", deadline_offset_ms=10000))
+        queue.get_batch("g", 1)
+        assert queue.get_expired_groups() == []
+        assert queue.has_deadline_expired("g") is False
+
     # ------------------------------------------------------------------
     # get_all_groups
     # ------------------------------------------------------------------
 
+    def test_get_batch_skips_cancelled_requests(self, queue: RequestQueue) -> None:
+        cancelled = _make_request("r1")
+        cancelled.future = Future()
+        cancelled.future.cancel()
+        queue.enqueue(cancelled)
+        queue.enqueue(_make_request("r2"))
+        batch = queue.get_batch("faq:claude-3-5-sonnet", 1)
+        assert [r.request_id for r in batch] == ["r2"]
+        assert queue.size() == 0
+
+    def test_get_batch_times_out_abandoned_requests(
+        self, queue: RequestQueue
+    ) -> None:
+        stale = _make_request("r1", deadline_offset_ms=-(DISPATCH_GRACE_MS + 100))
+        stale.future = Future()
+        queue.enqueue(stale)
+        # Past its dispatch deadline but within the grace period: still sent
+        queue.enqueue(_make_request("r2", deadline_offset_ms=-10))
+        batch = queue.get_batch("faq:claude-3-5-sonnet", 10)
+        assert [r.request_id for r in batch] == ["r2"]
+        with pytest.raises(TimeoutError):
+            stale.future.result(timeout=0)
+
+    # ------------------------------------------------------------------
+    # get_batch_prioritized
+    # ------------------------------------------------------------------
+
+    def test_get_batch_prioritized_urgent_first_by_deadline(
+        self, queue: RequestQueue
+    ) -> None:
+        group = "faq:claude-3-5-sonnet"
+        queue.enqueue(_make_request("normal-late", deadline_offset_ms=5000))
+        queue.enqueue(_make_request("normal-soon", deadline_offset_ms=1000))
+        queue.enqueue(_make_request("urgent-mid", deadline_offset_ms=50))
+        queue.enqueue(_make_request("urgent-late", deadline_offset_ms=80))
+        queue.enqueue(_make_request("urgent-first", deadline_offset_ms=10))
+
+        batch = queue.get_batch_prioritized(group, 4, urgent_window_ms=100)
+        assert [r.request_id for r in batch] == [
+            "urgent-first",
+            "urgent-mid",
+            "urgent-late",
+            "normal-soon",
+        ]
+        assert [r.request_id for r in queue.peek(group)] == ["normal-late"]
+        assert not queue.remove("urgent-first")
+        assert queue.remove("normal-late")
+
+    def test_get_batch_prioritized_tracks_earliest_deadline(
+        self, queue: RequestQueue
+    ) -> None:
+        group = "faq:claude-3-5-sonnet"
+        queue.enqueue(_make_request("r1", deadline_offset_ms=5000))
+        queue.enqueue(_make_request("r2", deadline_offset_ms=-10))
+        batch = queue.get_batch_prioritized(group, 1, urgent_window_ms=100)
+        assert [r.request_id for r in batch] == ["r2"]
+        assert not queue.has_deadline_expired(group)
+        assert queue.size(group) == 1
+
+    def test_get_batch_prioritized_discards_abandoned(
+        self, queue: RequestQueue
+    ) -> None:
+        stale = _make_request("r1", deadline_offset_ms=-(DISPATCH_GRACE_MS + 100))
+        stale.future = Future()
+        queue.enqueue(stale)
+        queue.enqueue(_make_request("r2"))
+        batch = queue.get_batch_prioritized(
+            "faq:claude-3-5-sonnet", 10, urgent_window_ms=100
+        )
+        assert [r.request_id for r in batch] == ["r2"]
+        assert queue.size() == 0
+        with pytest.raises(TimeoutError):
+            stale.future.result(timeout=0)
+
+    def test_get_batch_prioritized_missing_group(
+        self, queue: RequestQueue
+    ) -> None:
+        assert queue.get_batch_prioritized("nope", 5, urgent_window_ms=100) == []
+
+    def test_expiry_tracks_out_of_order_deadlines(
+        self, queue: RequestQueue
+    ) -> None:
+        group = "faq:claude-3-5-sonnet"
+        queue.enqueue(_make_request("r1", deadline_offset_ms=5000))
+        queue.enqueue(_make_request("r2", deadline_offset_ms=-10))
+        queue.enqueue(_make_request("r3", deadline_offset_ms=-20))
+        assert queue.has_deadline_expired(group)
+        queue.remove("r3")
+        assert queue.has_deadline_expired(group)
+        queue.remove("r2")
+        assert not queue.has_deadline_expired(group)
+        assert queue.get_expired_groups() == []
+
+    def test_peek_iter_is_a_snapshot(self, queue: RequestQueue) -> None:
+        for i in range(3):
+            queue.enqueue(_make_request(f"r{i}"))
+        it = queue.peek_iter("faq:claude-3-5-sonnet", max_size=2)
+        queue.get_batch("faq:claude-3-5-sonnet", 10)
+        assert [r.request_id for r in it] == ["r0", "r1"]
+        assert list(queue.peek_iter("missing")) == []
+
+    def test_snapshot(self, queue: RequestQueue) -> None:
+        queue.enqueue(_make_request("r1", batch_group="a", deadline_offset_ms=-10))
+        queue.enqueue(_make_request("r2", batch_group="a"))
+        queue.enqueue(_make_request("r3", batch_group="b", deadline_offset_ms=5000))
+        queue.get_batch("b", 10)  # emptied groups are omitted
+
+        snap = queue.snapshot()
+        assert len(snap) == 1
+        group, size, oldest_age_ms, expired, ms_until_deadline = snap[0]
+        assert (group, size, expired) == ("a", 2, True)
+        assert oldest_age_ms >= 0
+        assert snap[0].deadline_expired and snap[0].size == 2
+        assert ms_until_deadline <= 0
+
     def test_get_all_groups(self, queue: RequestQueue) -> None:
         queue.enqueue(_make_request("r1", batch_group="group-a"))
         queue.enqueue(_make_request("r2", batch_group="group-b"))
         groups = queue.get_all_groups()
         assert set(groups) == {"group-a", "group-b"}
 
+    def test_group_names_are_interned(self, queue: RequestQueue) -> None:
+        # Build the key at runtime so it is a distinct, non-interned object
+        group = "".join(["faq:", "claude-3-5-sonnet"])
+        queue.enqueue(_make_request("r1", batch_group=group))
+        assert queue.get_all_groups()[0] is sys.intern(group)
+
     def test_get_all_groups_empty(self, queue: RequestQueue) -> None:
         assert queue.get_all_groups() == []
 
@@ -167,6 +366,16 @@ class TestRequestQueue:
     def test_remove_nonexistent(self, queue: RequestQueue) -> None:
         assert queue.remove("ghost") is False
 
+    def test_remove_middle_preserves_order(self, queue: RequestQueue) -> None:
+        for i in range(4):
+            queue.enqueue(_make_request(f"r{i}", batch_group="g"))
+        assert queue.remove("r1") is True
+        assert queue.remove("r3") is True
+        assert [r.request_id for r in queue.peek("g")] == ["r0", "r2"]
+        queue.enqueue(_make_request("r4", batch_group="g"))
+        batch = queue.get_batch("g", 10)
+        assert [r.request_id for r in batch] == ["r0", "r2", "r4"]
+
     def test_remove_cleans_up_empty_group(self, queue: RequestQueue) -> None:
         queue.enqueue(_make_request("r1", batch_group="g1"))
         queue.remove("r1")
@@ -187,7 +396,7 @@ class TestRequestQueue:
             prompt="test",
             model="m",
             batch_group="g",
-            enqueued_at=now - timedelta(seconds=5),
+            enqueued_at=now,
             deadline=now - timedelta(seconds=1),
         )
         queue.enqueue(req)
@@ -200,12 +409,14 @@ class TestRequestQueue:
             prompt="test",
             model="m",
             batch_group="g",
-            enqueued_at=now - timedelta(milliseconds=500),
+            enqueued_at=now,
             deadline=now + timedelta(seconds=10),
         )
         queue.enqueue(req)
+        # Ages run from the monotonic enqueue time, not enqueued_at
+        time.sleep(0.05)
         age = queue.oldest_request_age_ms("g")
-        assert age >= 400  # at least 400ms (allow some margin)
+        assert age >= 40  # at least 40ms (allow some margin)
 
     def test_oldest_request_age_empty_group(self, queue: RequestQueue) -> None:
         assert queue.oldest_request_age_ms("nonexistent") == 0
@@ -214,6 +425,36 @@ class TestRequestQueue:
     # Thread safety
     # ------------------------------------------------------------------
 
+    def test_enqueue_many(self, queue: RequestQueue) -> None:
+        queue.enqueue_many([
+            _make_request("r1", batch_group="a"),
+            _make_request("r2", batch_group="b"),
+            _make_request("r3", batch_group="a"),
+        ])
+        assert queue.size() == 3
+        assert [r.request_id for r in queue.peek("a")] == ["r1", "r3"]
+        assert queue.remove("r2")
+
+    def test_enqueue_many_is_all_or_nothing(self, queue: RequestQueue) -> None:
+        queue.enqueue(_make_request("r1", batch_group="a"))
+        with pytest.raises(ValueError, match="already in the queue"):
+            queue.enqueue_many([
+                _make_request("r2", batch_group="b"),
+                _make_request("r1", batch_group="a"),
+            ])
+        with pytest.raises(ValueError, match="Duplicate"):
+            queue.enqueue_many([_make_request("r3"), _make_request("r3")])
+        assert queue.size() == 1
+        assert queue.remove("r2") is False
+
+    def test_single_threaded_queue(self) -> None:
+        queue = RequestQueue(thread_safe=False)
+        queue.enqueue(_make_request("r1"))
+        queue.enqueue(_make_request("r2"))
+        assert queue.remove("r1")
+        assert [r.request_id for r in queue.get_batch("faq:claude-3-5-sonnet", 5)] == ["r2"]
+        assert queue.size() == 0
+
     def test_concurrent_enqueue(self, queue: RequestQueue) -> None:
         """Multiple threads enqueuing simultaneously should not lose data."""
         errors: List[str] = []
@@ -272,3 +513,29 @@ class TestRequestQueue:
 
         total = len(consumed) + queue.size("shared")
         assert total == produced
+
+    def test_concurrent_groups_and_remove(self, queue: RequestQueue) -> None:
+        """Per-group locking keeps disjoint groups and removes consistent."""
+        errors: List[Exception] = []
+
+        def worker(group: str) -> None:
+            try:
+                for i in range(100):
+                    queue.enqueue(_make_request(f"{group}-{i}", batch_group=group))
+                for i in range(0, 100, 2):
+                    assert queue.remove(f"{group}-{i}")
+                queue.get_batch(group, 10)
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [
+            threading.Thread(target=worker, args=(f"g{t}",)) for t in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        assert queue.size() == 8 * 40
+        assert [r.request_id for r in queue.peek("g0", 2)] == ["g0-21", "g0-23"]
@@ -3,7 +3,7 @@
 import time
 from concurrent.futures import Future
 from datetime import datetime, timedelta, timezone
-from typing import List
+from typing import Iterator, List
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -54,7 +54,7 @@ def _make_expired_request(
         prompt="expired",
         model="claude-3-5-sonnet",
         batch_group=batch_group,
-        enqueued_at=now - timedelta(seconds=5),
+        enqueued_at=now,
         deadline=now - timedelta(seconds=1),
     )
 
@@ -161,6 +161,63 @@ class TestBatchSchedulerExecution:
         assert len(executed) == 1
         assert len(executed[0]) == 3
 
+    def test_full_group_wakes_scheduler_before_poll(
+        self, queue: RequestQueue, config: BatchConfig
+    ) -> None:
+        """Filling a group flushes it without waiting for the poll interval."""
+        done: List[int] = []
+        scheduler = BatchScheduler(
+            queue=queue,
+            executor=lambda batch: done.append(len(batch)) or _success_executor(batch),
+            config=config,
+            poll_interval_ms=10_000,
+        )
+        scheduler.start()
+        try:
+            time.sleep(0.05)  # let the loop enter its long wait
+            for i in range(config.max_batch_size):
+                queue.enqueue(_make_request(f"r{i}"))
+            deadline = time.monotonic() + 2.0
+            while not done and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert done == [config.max_batch_size]
+        finally:
+            scheduler.stop()
+
+    def test_tick_reports_time_until_next_flush(
+        self, queue: RequestQueue, config: BatchConfig
+    ) -> None:
+        scheduler = BatchScheduler(
+            queue=queue, executor=_success_executor, config=config
+        )
+        assert scheduler._tick() is None
+        queue.enqueue(_make_request("r1", deadline_offset_ms=2000))
+        queue.enqueue(_make_request("r2", deadline_offset_ms=2000))
+        # Two requests: due when the oldest reaches 70% of max_wait_ms
+        next_flush_s = scheduler._tick()
+        assert next_flush_s is not None
+        assert 0 < next_flush_s <= config.max_wait_ms * 0.7 / 1000.0 + 0.002
+
+    def test_tick_sends_urgent_requests_first(
+        self, queue: RequestQueue, config: BatchConfig
+    ) -> None:
+        """An overfull group dispatches the requests nearest their deadline."""
+        executed: List[List[str]] = []
+
+        def tracking_executor(batch: List[QueuedRequest]) -> List[InferenceResult]:
+            executed.append([r.request_id for r in batch])
+            return _success_executor(batch)
+
+        scheduler = BatchScheduler(
+            queue=queue, executor=tracking_executor, config=config
+        )
+        for i in range(5):
+            queue.enqueue(_make_request(f"r{i}", deadline_offset_ms=5000))
+        queue.enqueue(_make_request("urgent", deadline_offset_ms=50))
+        scheduler._tick()
+        assert executed[0][0] == "urgent"
+        assert len(executed[0]) == config.max_batch_size
+
     def test_size_threshold_triggers_flush(
         self, queue: RequestQueue, config: BatchConfig
     ) -> None:
@@ -228,7 +285,8 @@ class TestBatchSchedulerExecution:
 
         config = BatchConfig(min_batch_size=2, max_batch_size=10, max_wait_ms=200)
 
-        # Create requests with enqueued_at in the past so age > 0.7 * 200 = 140ms
+        # Ages run from enqueue, so within the 300 ms run they pass
+        # 0.7 * 200 = 140ms
         now = datetime.now(timezone.utc)
         for i in range(2):
             req = QueuedRequest(
@@ -236,7 +294,7 @@ class TestBatchSchedulerExecution:
                 prompt="test",
                 model="claude-3-5-sonnet",
                 batch_group="faq:sonnet",
-                enqueued_at=now - timedelta(milliseconds=200),
+                enqueued_at=now,
                 deadline=now + timedelta(seconds=5),
             )
             queue.enqueue(req)
@@ -281,6 +339,62 @@ class TestBatchSchedulerErrorHandling:
     def config(self) -> BatchConfig:
         return BatchConfig(min_batch_size=2, max_batch_size=5, max_wait_ms=500)
 
+    def test_streaming_executor_failure_only_retries_unanswered(
+        self, queue: RequestQueue, config: BatchConfig
+    ) -> None:
+        """Results yielded before a failure are kept; the rest fall back."""
+        calls: List[List[str]] = []
+
+        def flaky_executor(batch: List[QueuedRequest]) -> Iterator[InferenceResult]:
+            calls.append([r.request_id for r in batch])
+            for req in batch:
+                if len(batch) > 1 and req.request_id == "r1":
+                    raise RuntimeError("boom")
+                yield _make_result(req.request_id)
+
+        scheduler = BatchScheduler(
+            queue=queue, executor=flaky_executor, config=config
+        )
+        futures = []
+        for i in range(3):
+            req = _make_request(f"r{i}")
+            req.future = Future()
+            futures.append(req.future)
+            queue.enqueue(req)
+
+        scheduler.flush_group("faq:sonnet")
+        assert calls == [["r0", "r1", "r2"], ["r1"], ["r2"]]
+        assert [f.result(timeout=0).request_id for f in futures] == ["r0", "r1", "r2"]
+
+    def test_requests_that_cannot_meet_deadline_are_dropped(
+        self, queue: RequestQueue, config: BatchConfig
+    ) -> None:
+        """Doomed requests are failed before the executor is called."""
+        executed: List[List[str]] = []
+
+        def tracking_executor(batch: List[QueuedRequest]) -> List[InferenceResult]:
+            executed.append([r.request_id for r in batch])
+            return _success_executor(batch)
+
+        scheduler = BatchScheduler(
+            queue=queue, executor=tracking_executor, config=config
+        )
+        doomed = _make_request("doomed", deadline_offset_ms=0)
+        doomed.estimated_latency_ms = 60_000
+        doomed.future = Future()
+        ok = _make_request("ok", deadline_offset_ms=0)
+        ok.estimated_latency_ms = 500
+        ok.future = Future()
+        queue.enqueue(doomed)
+        queue.enqueue(ok)
+
+        scheduler.flush_group("faq:sonnet")
+        assert executed == [["ok"]]
+        with pytest.raises(BatchingError, match="deadline exceeded"):
+            doomed.future.result(timeout=0)
+        assert ok.future.result(timeout=0).request_id == "ok"
+        assert scheduler.stats()["deadline_drops"] == 1
+
     def test_batch_failure_falls_back_to_individual(
         self, queue: RequestQueue, config: BatchConfig
     ) -> None:
@@ -446,12 +560,18 @@ class TestBatchSchedulerEdgeCases:
         # Scheduler should have stopped
         assert scheduler.is_running is False
 
-    def test_resolve_futures_with_short_results(
+    def test_short_results_fall_back_to_individual(
         self, queue: RequestQueue, config: BatchConfig
     ) -> None:
-        """_resolve_futures handles results list shorter than batch."""
+        """Requests left unanswered by a short result list run one by one."""
+        calls: List[List[str]] = []
+
+        def short_executor(batch: List[QueuedRequest]) -> List[InferenceResult]:
+            calls.append([r.request_id for r in batch])
+            return _success_executor(batch[:1])
+
         scheduler = BatchScheduler(
-            queue=queue, executor=_success_executor, config=config
+            queue=queue, executor=short_executor, config=config
         )
 
         reqs = []
@@ -460,11 +580,12 @@ class TestBatchSchedulerEdgeCases:
             req.future = Future()
             reqs.append(req)
 
-        # Only 1 result for 3 requests; first gets result, others get exception
-        scheduler._resolve_futures(reqs, [_make_result("r0")])
-        assert reqs[0].future.done() and reqs[0].future.result().response == "response-r0"
-        for req in reqs[1:]:
-            assert req.future.done() and req.future.exception() is not None
+        # Only 1 result for 3 requests: the other two are retried alone
+        scheduler._execute_batch(reqs)
+        assert calls == [["r0", "r1", "r2"], ["r1"], ["r2"]]
+        for req in reqs:
+            assert req.future.result(timeout=0).request_id == req.request_id
+        assert scheduler.stats()["batch_errors"] == 1
 
     def test_flush_empty_group_is_noop(
         self, queue: RequestQueue, config: BatchConfig
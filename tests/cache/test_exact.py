@@ -2,12 +2,19 @@
 Tests for the exact-match cache layer.
 """
 
+import threading
 import time
 from datetime import datetime, timedelta, timezone
 
 import pytest
 
-from src.cache.exact import Cache, CacheEntry, CacheStats
+from src.cache.exact import (
+    Cache,
+    CacheEntry,
+    CacheStats,
+    _raw_cache_key,
+    generate_cache_key,
+)
 
 
 class TestCacheEntry:
@@ -136,6 +143,50 @@ class TestCache:
         assert removed == 2
         assert cache.size == 0
 
+    def test_cleanup_expired_keeps_live_entries(self) -> None:
+        cache = Cache(ttl_seconds=60)
+        cache.set("q1", "r1", "model", 0.01)
+        cache.set("q2", "r2", "model", 0.02)
+        cache._expiry[_raw_cache_key("q1")] = time.monotonic() - 1
+        assert cache.cleanup_expired() == 1
+        assert cache.get("q2") is not None
+
+    def test_cleanup_expired_mostly_expired_rebuild(self) -> None:
+        cache = Cache(ttl_seconds=60)
+        for i in range(8):
+            cache.set(f"q{i}", f"r{i}", "model", 0.01)
+        for i in range(6):
+            cache._expiry[_raw_cache_key(f"q{i}")] = time.monotonic() - 1
+        assert cache.cleanup_expired() == 6
+        assert cache.size == 2
+        assert cache.get("q7") is not None
+        cache.set("q8", "r8", "model", 0.01)
+        assert cache.size == 3
+
+    def test_set_reclaims_expired_entries(self) -> None:
+        cache = Cache(ttl_seconds=60)
+        for i in range(3):
+            cache.set(f"q{i}", f"r{i}", "model", 0.01)
+        for i in range(3):
+            cache._expiry[_raw_cache_key(f"q{i}")] = time.monotonic() - 1
+        cache.set("q3", "r3", "model", 0.01)
+        # At most two expired entries are reclaimed per write
+        assert cache.size == 2
+        cache.set("q4", "r4", "model", 0.01)
+        assert cache.size == 2
+        assert cache.get("q3") is not None
+
+    def test_lru_eviction_at_max_entries(self) -> None:
+        cache = Cache(ttl_seconds=60, max_entries=2)
+        cache.set("q1", "r1", "model", 0.01)
+        cache.set("q2", "r2", "model", 0.02)
+        cache.get("q1")  # q2 is now least recently used
+        cache.set("q3", "r3", "model", 0.03)
+        assert cache.size == 2
+        assert cache.get("q2") is None
+        assert cache.get("q1") is not None
+        assert cache.get("q3") is not None
+
     def test_size_property(self, cache: Cache) -> None:
         assert cache.size == 0
         cache.set("q1", "r1", "model", 0.01)
@@ -159,6 +210,19 @@ class TestCache:
         key2 = cache.generate_key("query B")
         assert key1 != key2
 
+    def test_set_entry_matches_validated_model(self, cache: Cache) -> None:
+        entry = cache.set("q1", "r1", "model", 1)
+        assert entry == CacheEntry.model_validate(entry.model_dump())
+        assert isinstance(entry.cost, float)
+
+    def test_generate_key_format(self, cache: Cache) -> None:
+        key = cache.generate_key("test query")
+        assert len(key) == 32
+        assert cache.generate_key("test query", org_id="org1") == f"org1:{key}"
+        assert key == generate_cache_key("test query")
+        assert _raw_cache_key("test query").hex() == key
+        assert _raw_cache_key("q", "org1") == b"org1:" + _raw_cache_key("q")
+
     def test_different_queries_different_entries(self, cache: Cache) -> None:
         cache.set("query A", "response A", "model", 0.01)
         cache.set("query B", "response B", "model", 0.02)
@@ -166,3 +230,28 @@ class TestCache:
         assert cache.get("query B") is not None
         assert cache.get("query A").response == "response A"
         assert cache.get("query B").response == "response B"
+
+    def test_concurrent_set_get_and_cleanup(self) -> None:
+        """Writers, readers and cleanup sweeps can run in parallel."""
+        cache = Cache(ttl_seconds=3600, max_entries=50)
+        errors = []
+
+        def worker(tid: int) -> None:
+            try:
+                for i in range(300):
+                    cache.set(f"t{tid}-q{i}", "r", "model", 0.01)
+                    cache.get(f"t{tid}-q{i - 1}")
+                    cache.cleanup_expired()
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        assert cache.size == 50
+        assert len(cache._expiry) == 50
+        assert cache.stats().hits + cache.stats().misses == 1200
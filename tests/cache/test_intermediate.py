@@ -1,5 +1,6 @@
 """Tests for IntermediateCache (Tier 3 orchestrator)."""
 
+import threading
 import time
 
 import pytest
@@ -33,6 +34,38 @@ class TestGetSet:
         result = cache.get("nonexistent")
         assert result is None
 
+    def test_lru_eviction_at_max_entries(self) -> None:
+        cache = IntermediateCache(ttl_seconds=3600, max_entries=2)
+        cache.set("key1", "result1")
+        cache.set("key2", "result2")
+        cache.get("key1")
+        cache.set("key3", "result3")
+        assert cache.get("key2") is None
+        assert cache.get("key1") == "result1"
+        assert cache.stats()["entry_count"] == 2
+
+    def test_max_entries_defaults_to_settings(self) -> None:
+        from src.config import get_settings
+
+        cache = IntermediateCache()
+        assert cache._max_entries == get_settings().cache.max_entries
+
+    def test_set_reclaims_expired_entries(self, cache: IntermediateCache) -> None:
+        cache.set("doc:a:1", "r1")
+        cache.set("doc:a:2", "r2")
+        cache._expiry["doc:a:1"] = time.monotonic() - 1
+        cache.set("doc:a:3", "r3")
+        assert cache.stats()["entry_count"] == 2
+        assert cache._by_document == {"doc": {"doc:a:2", "doc:a:3"}}
+
+    def test_cleanup_expired(self, cache: IntermediateCache) -> None:
+        cache.set("key1", "result1")
+        cache.set("key2", "result2")
+        cache._expiry["key1"] = time.monotonic() - 1
+        assert cache.cleanup_expired() == 1
+        assert cache.get("key1") is None
+        assert cache.get("key2") == "result2"
+
     def test_set_and_get(self, cache: IntermediateCache) -> None:
         cache.set("key1", "result1")
         result = cache.get("key1")
@@ -70,11 +103,58 @@ class TestInvalidateByDocument:
         assert cache.get("doc1:summarize:abc") is None
         assert cache.get("doc2:summarize:ghi") == "summary2"
 
+    def test_invalidate_by_document_uses_index(
+        self, cache: IntermediateCache
+    ) -> None:
+        cache.set("doc1:summarize:abc", "summary1")
+        cache.set("doc1:answer:def", "answer1")
+        cache.invalidate("doc1:answer:def")
+        assert cache._by_document == {"doc1": {"doc1:summarize:abc"}}
+        assert cache.invalidate_by_document("doc1") == 1
+        assert cache._by_document == {}
+
+    def test_invalidate_by_document_with_colon_in_id(
+        self, cache: IntermediateCache
+    ) -> None:
+        cache.set("org:a:summarize:abc", "a")
+        cache.set("org:b:summarize:def", "b")
+        assert cache.invalidate_by_document("org:a") == 1
+        assert cache.get("org:b:summarize:def") == "b"
+
     def test_invalidate_by_document_none(self, cache: IntermediateCache) -> None:
         count = cache.invalidate_by_document("nonexistent")
         assert count == 0
 
 
+class TestThreadSafety:
+    """Tests for concurrent access."""
+
+    def test_concurrent_set_and_invalidate(self) -> None:
+        cache = IntermediateCache(max_entries=100)
+        errors = []
+
+        def worker(tid: int) -> None:
+            try:
+                for i in range(300):
+                    cache.set(f"doc{tid}:step:{i}", "r")
+                    cache.get(f"doc{tid}:step:{i - 1}")
+                    if i % 50 == 0:
+                        cache.invalidate_by_document(f"doc{tid}")
+                    cache.cleanup_expired()
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert not errors
+        indexed = sum(len(keys) for keys in cache._by_document.values())
+        assert indexed == len(cache._results) == len(cache._expiry)
+
+
 class TestExecuteWorkflow:
     """Tests for execute_workflow."""
 
@@ -7,7 +7,11 @@ Uses fakeredis so no real Redis server is required.
 import pytest
 
 from src.cache.exact import CacheEntry, CacheStats
-from src.cache.redis_backend import RedisCache
+from src.cache.redis_backend import (
+    RedisCache,
+    _deserialize_entry,
+    _serialize_entry,
+)
 
 
 @pytest.fixture
@@ -17,7 +21,7 @@ def redis_cache():
         import fakeredis
     except ImportError:
         pytest.skip("fakeredis not installed")
-    client = fakeredis.FakeStrictRedis(decode_responses=True)
+    client = fakeredis.FakeStrictRedis()
     return RedisCache(
         redis_url="redis://localhost:6379/0",
         ttl_seconds=3600,
@@ -25,6 +29,27 @@ def redis_cache():
     )
 
 
+class TestSerialization:
+    """Tests for the MessagePack entry format."""
+
+    def test_round_trip(self) -> None:
+        entry = CacheEntry(
+            cache_key="abc",
+            query="q",
+            response="r",
+            model="m",
+            cost=0.5,
+            access_count=3,
+        )
+        data = _serialize_entry(entry)
+        assert isinstance(data, bytes)
+        assert _deserialize_entry(data) == entry
+
+    def test_rejects_garbage(self) -> None:
+        with pytest.raises(Exception):
+            _deserialize_entry(b'{"cache_key": "abc"}')
+
+
 class TestRedisCacheWithFakeredis:
     """Tests for RedisCache using an injected FakeStrictRedis."""
 
@@ -40,6 +65,14 @@ class TestRedisCacheWithFakeredis:
         assert result.response == "A programming language."
         assert result.model == "gpt-4o"
 
+    def test_entry_keys_are_versioned(self, redis_cache: RedisCache) -> None:
+        redis_cache.set("q1", "r1", "m1", 0.01)
+        key = redis_cache.generate_key("q1")
+        assert redis_cache._client.exists(f"asahi:t1:v3:{key}")
+        # Entries written under the old, unversioned layout are never read
+        redis_cache._client.set("asahi:t1:" + redis_cache.generate_key("old"), "{}")
+        assert redis_cache.get("old") is None
+
     def test_get_miss(self, redis_cache: RedisCache) -> None:
         result = redis_cache.get("nonexistent query")
         assert result is None
@@ -78,6 +111,12 @@ class TestRedisCacheWithFakeredis:
         k2 = redis_cache.generate_key("hello")
         assert k1 == k2
 
+    def test_keys_share_one_digest(self, redis_cache: RedisCache) -> None:
+        key, rkey, ac_key = redis_cache._keys("hello", org_id="org1")
+        assert key == redis_cache.generate_key("hello", org_id="org1")
+        assert rkey == f"asahi:t1:v3:{key}"
+        assert ac_key == f"asahi:t1:ac:v3:{key}"
+
     def test_clear(self, redis_cache: RedisCache) -> None:
         redis_cache.set("q1", "r1", "m1", 0.01)
         redis_cache.set("q2", "r2", "m2", 0.02)
@@ -85,3 +124,97 @@ class TestRedisCacheWithFakeredis:
         assert n >= 2
         assert redis_cache.get("q1") is None
         assert redis_cache.get("q2") is None
+
+    def test_hit_does_not_rewrite_entry(self, redis_cache: RedisCache) -> None:
+        redis_cache.set("q1", "r1", "m1", 0.01)
+        rkey = "asahi:t1:v3:" + redis_cache.generate_key("q1")
+        stored = redis_cache._client.get(rkey)
+        assert redis_cache.get("q1").access_count == 1
+        assert redis_cache.get("q1").access_count == 2
+        assert redis_cache._client.get(rkey) == stored
+        ac_key = "asahi:t1:ac:v3:" + redis_cache.generate_key("q1")
+        assert 0 < redis_cache._client.ttl(ac_key) <= 3600
+        # Overwriting the entry resets its access count
+        redis_cache.set("q1", "r1b", "m1", 0.01)
+        assert redis_cache.get("q1").access_count == 1
+
+    def test_unusable_entry_counts_as_miss(self, redis_cache: RedisCache) -> None:
+        redis_cache.set("q1", "r1", "m1", 0.01)
+        redis_cache._client.set(
+            "asahi:t1:v3:" + redis_cache.generate_key("q1"), "not json"
+        )
+        assert redis_cache.get("q1") is None
+        stats = redis_cache.stats()
+        assert (stats.hits, stats.misses) == (0, 1)
+        assert stats.entry_count == 0
+
+    def test_clear_in_batches(self, redis_cache: RedisCache) -> None:
+        for i in range(1200):
+            redis_cache.set(f"q{i}", "r", "m", 0.0)
+        redis_cache.get("q0")
+        assert redis_cache.clear() == 1200
+        assert redis_cache.stats().entry_count == 0
+        assert redis_cache.stats().hits == 1
+        assert redis_cache._client.exists(RedisCache.INDEX_KEY) == 0
+        assert redis_cache._client.keys("asahi:t1:v3:*") == []
+
+    def test_entry_count_uses_index(self, redis_cache: RedisCache) -> None:
+        redis_cache.set("q1", "r1", "m1", 0.01)
+        redis_cache.set("q1", "r1b", "m1", 0.01)  # overwrite: not double-counted
+        redis_cache.set("q2", "r2", "m2", 0.01)
+        assert redis_cache.stats().entry_count == 2
+        redis_cache.invalidate("q2")
+        assert redis_cache.stats().entry_count == 1
+        redis_cache.clear()
+        assert redis_cache.stats().entry_count == 0
+
+    def test_entry_count_prunes_expired_index_members(
+        self, redis_cache: RedisCache
+    ) -> None:
+        redis_cache.set("q1", "r1", "m1", 0.01)
+        # Simulate the entry having expired in Redis
+        rkey = "asahi:t1:v3:" + redis_cache.generate_key("q1")
+        redis_cache._client.zadd(RedisCache.INDEX_KEY, {rkey: 1.0})
+        assert redis_cache.stats().entry_count == 0
+
+    def test_set_prunes_expired_index_members(self, redis_cache: RedisCache) -> None:
+        client = redis_cache._client
+        for i in range(50):
+            redis_cache.set(f"old{i}", "r", "m", 0.01)
+        # Simulate the entries having expired in Redis
+        client.delete(*client.keys("asahi:t1:v3:*"))
+        client.zadd(
+            RedisCache.INDEX_KEY,
+            {member: 1.0 for member in client.zrange(RedisCache.INDEX_KEY, 0, -1)},
+        )
+        for i in range(10):
+            redis_cache.set(f"new{i}", "r", "m", 0.01)
+        assert client.zcard(RedisCache.INDEX_KEY) == 10
+
+    def test_rebuild_index(self, redis_cache: RedisCache) -> None:
+        redis_cache.set("q1", "r1", "m1", 0.01)
+        redis_cache.set("q2", "r2", "m2", 0.01)
+        redis_cache._client.delete(RedisCache.INDEX_KEY)
+        assert redis_cache.stats().entry_count == 0
+        assert redis_cache.rebuild_index() == 2
+        assert redis_cache.stats().entry_count == 2
+
+
+class TestConnectionPools:
+    """Tests for the URL-keyed shared connection pools."""
+
+    def test_instances_share_pool_per_url(self) -> None:
+        url = "redis://localhost:6399/0"
+        try:
+            a = RedisCache(redis_url=url)
+            b = RedisCache(redis_url=url)
+            c = RedisCache(redis_url="redis://localhost:6399/1")
+            pool = a._client.connection_pool
+            assert b._client.connection_pool is pool
+            assert c._client.connection_pool is not pool
+            assert pool.max_connections == 32
+        finally:
+            RedisCache.close_pools()
+        d = RedisCache(redis_url=url)
+        assert d._client.connection_pool is not pool
+        RedisCache.close_pools()
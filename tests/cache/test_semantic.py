@@ -1,13 +1,23 @@
 """Tests for SemanticCache (Tier 2 orchestrator)."""
 
+import threading
+import time
+from typing import List
+
+import numpy as np
 import pytest
 
 from src.embeddings.engine import EmbeddingConfig, EmbeddingEngine
 from src.embeddings.mismatch import MismatchCostCalculator
-from src.cache.semantic import SemanticCache, SemanticCacheResult
+from src.cache.semantic import (
+    SemanticCache,
+    SemanticCacheResult,
+    _EmbeddingCoalescer,
+)
 from src.embeddings.similarity import SimilarityCalculator
 from src.embeddings.threshold import AdaptiveThresholdTuner
 from src.embeddings.vector_store import InMemoryVectorDB
+from src.exceptions import EmbeddingError
 
 
 @pytest.fixture
@@ -56,6 +66,21 @@ class TestSemanticCacheGet:
         # dissimilar texts should usually miss
         assert isinstance(result, SemanticCacheResult)
 
+    def test_expired_entry_is_not_served(self, engine: EmbeddingEngine) -> None:
+        cache = SemanticCache(
+            embedding_engine=engine,
+            vector_db=InMemoryVectorDB(),
+            similarity_calc=SimilarityCalculator(),
+            mismatch_calc=MismatchCostCalculator(),
+            threshold_tuner=AdaptiveThresholdTuner(),
+            ttl_seconds=-1,
+        )
+        cache.set("What is Python?", "A programming language.", "gpt-4", 0.01)
+        result = cache.get(
+            "What is Python?", task_type="faq", cost_sensitivity="high"
+        )
+        assert result.hit is False
+
     def test_returns_semantic_cache_result(self, cache: SemanticCache) -> None:
         result = cache.get("test query")
         assert isinstance(result, SemanticCacheResult)
@@ -73,6 +98,14 @@ class TestSemanticCacheSet:
         stats = cache.stats()
         assert stats["entry_count"] == 1
 
+    def test_set_stores_epoch_timestamps(self, cache: SemanticCache) -> None:
+        cache.set("Test query", "Test response", "model", 0.01)
+        meta = cache._db.query(
+            embedding=cache._embedder.embed_text("Test query").tolist(), top_k=1
+        )[0].metadata
+        assert isinstance(meta["created_at"], float)
+        assert meta["expires_at"] == pytest.approx(meta["created_at"] + 86400)
+
     def test_set_multiple(self, cache: SemanticCache) -> None:
         cache.set("Query A", "Response A", "model", 0.01)
         cache.set("Query B", "Response B", "model", 0.02)
@@ -146,3 +179,90 @@ class TestSemanticCacheIntegration:
 
         stats = cache.stats()
         assert stats["entry_count"] == 3
+
+
+class TestEmbeddingCoalescing:
+    """Tests for coalescing concurrent query embeddings."""
+
+    def test_concurrent_lookups_share_embedding_calls(
+        self, engine: EmbeddingEngine
+    ) -> None:
+        calls: List[int] = []
+        original = engine.embed_texts
+
+        def counting_embed_texts(texts: List[str]) -> List[np.ndarray]:
+            calls.append(len(texts))
+            time.sleep(0.02)  # keep callers overlapping
+            return original(texts)
+
+        engine.embed_texts = counting_embed_texts  # type: ignore[method-assign]
+        cache = SemanticCache(
+            embedding_engine=engine,
+            vector_db=InMemoryVectorDB(),
+            similarity_calc=SimilarityCalculator(),
+            mismatch_calc=MismatchCostCalculator(),
+            threshold_tuner=AdaptiveThresholdTuner(),
+            coalesce_window_ms=20,
+        )
+        cache.set("What is Python?", "A programming language.", "gpt-4", 0.01)
+        calls.clear()
+
+        results: List[SemanticCacheResult] = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    cache.get("What is Python?", "faq", "high")
+                )
+            )
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(results) == 8 and all(r.hit for r in results)
+        assert sum(calls) == 8
+        assert len(calls) < 8
+
+    def test_short_batch_fails_every_caller(self, engine: EmbeddingEngine) -> None:
+        original = engine.embed_texts
+
+        def short_embed_texts(texts: List[str]) -> List[np.ndarray]:
+            return original(texts)[:-1]
+
+        engine.embed_texts = short_embed_texts  # type: ignore[method-assign]
+        coalescer = _EmbeddingCoalescer(engine, window_s=0.02)
+        coalescer._in_flight = 1  # an in-flight call makes new callers batch
+
+        errors: List[Exception] = []
+
+        def embed(text: str) -> None:
+            try:
+                coalescer.embed(text)
+            except EmbeddingError as exc:
+                errors.append(exc)
+
+        threads = [
+            # Daemon threads so a regression fails the test instead of hanging
+            threading.Thread(target=embed, args=(f"query {i}",), daemon=True)
+            for i in range(3)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+        assert not any(t.is_alive() for t in threads)
+        assert len(errors) == 3
+
+    def test_solo_lookup_embeds_directly(self, cache: SemanticCache) -> None:
+        cache.set("What is Python?", "A programming language.", "gpt-4", 0.01)
+        assert cache._coalescer is not None
+        assert cache.get("What is Python?", "faq", "high").hit
+        assert cache._coalescer._pending == []
+        assert cache._coalescer._in_flight == 0
+
+    def test_empty_query_fails_alone(self, cache: SemanticCache) -> None:
+        result = cache.get("   ")
+        assert result.hit is False
+        assert "Embedding failed" in result.reason
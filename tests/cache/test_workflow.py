@@ -2,7 +2,7 @@
 
 import pytest
 
-from src.cache.workflow import WorkflowDecomposer, WorkflowStep
+from src.cache.workflow import WorkflowDecomposer, WorkflowStep, _step_cache_key
 
 
 @pytest.fixture
@@ -68,6 +68,14 @@ class TestDecompose:
         s2 = decomposer.decompose("What is Python?")
         assert s1[0].cache_key == s2[0].cache_key
 
+    def test_cache_key_format(self, decomposer: WorkflowDecomposer) -> None:
+        steps = decomposer.decompose(
+            "Based on the document, summarize the main points"
+        )
+        doc_id, step_type, intent_hash = steps[0].cache_key.split(":")
+        assert len(doc_id) == 12 and len(intent_hash) == 8
+        assert step_type == "summarize"
+
     def test_different_queries_different_cache_keys(
         self, decomposer: WorkflowDecomposer
     ) -> None:
@@ -75,6 +83,17 @@ class TestDecompose:
         s2 = decomposer.decompose("What is Java?")
         assert s1[0].cache_key != s2[0].cache_key
 
+    def test_steps_match_validated_model(
+        self, decomposer: WorkflowDecomposer
+    ) -> None:
+        steps = decomposer.decompose("Compare Python and Rust")
+        for step in steps:
+            assert step == WorkflowStep.model_validate(step.model_dump())
+            assert step.result is None
+        assert [s.step_id for s in steps] == [
+            f"step_{i}" for i in range(1, len(steps) + 1)
+        ]
+
 
 class TestExtractIntent:
     """Tests for extract_intent."""
@@ -86,3 +105,75 @@ class TestExtractIntent:
     def test_long_text_truncated(self, decomposer: WorkflowDecomposer) -> None:
         intent = decomposer.extract_intent("x " * 200)
         assert len(intent) <= 83  # 80 chars + "..."
+
+
+class TestPatternDetection:
+    """Tests for the keyword detectors."""
+
+    @pytest.mark.parametrize(
+        "prompt, expected",
+        [
+            ("Compare Python and Java", True),
+            ("Python VS. Java", True),
+            ("Is tea better than coffee or not", True),
+            ("What is the contrast ratio", True),
+            ("Describe the computer", False),
+            ("Tell me about versions", False),
+            # Keyword present but not as a whole word
+            ("They compared notes", False),
+        ],
+    )
+    def test_is_comparison(
+        self, decomposer: WorkflowDecomposer, prompt: str, expected: bool
+    ) -> None:
+        assert decomposer._is_comparison(prompt) is expected
+
+    @pytest.mark.parametrize(
+        "prompt, expected",
+        [
+            ("Summarize the ARTICLE", True),
+            ("According to the study, what happened", True),
+            ("Write a textbook outline", False),
+            ("What is Python", False),
+        ],
+    )
+    def test_has_document_reference(
+        self, decomposer: WorkflowDecomposer, prompt: str, expected: bool
+    ) -> None:
+        assert decomposer._has_document_reference(prompt) is expected
+
+
+class TestExtractDocumentSections:
+    """Tests for extract_document_sections."""
+
+    def test_splits_on_markers_and_drops_blank_sections(
+        self, decomposer: WorkflowDecomposer
+    ) -> None:
+        text = "Intro\n1. First\n  \n\n## Second\n\nThird\n \t"
+        assert decomposer.extract_document_sections(text) == [
+            "Intro",
+            "First",
+            "Second",
+            "Third",
+        ]
+
+    def test_blank_text_returns_single_empty_section(
+        self, decomposer: WorkflowDecomposer
+    ) -> None:
+        assert decomposer.extract_document_sections("  \n\n ") == [""]
+
+
+class TestStepMemoization:
+    """Tests for memoized step cache keys."""
+
+    def test_repeat_decomposition_reuses_keys_not_steps(
+        self, decomposer: WorkflowDecomposer
+    ) -> None:
+        _step_cache_key.cache_clear()
+        first = decomposer.decompose("Compare Python and Rust")
+        second = decomposer.decompose("Compare Python and Rust")
+        info = _step_cache_key.cache_info()
+        assert info.hits == len(first) and info.misses == len(first)
+        assert [s.cache_key for s in first] == [s.cache_key for s in second]
+        first[0].result = "cached"
+        assert second[0].result is None
@@ -186,6 +186,16 @@ class TestDependencyInjection:
         optimizer = InferenceOptimizer(tracker=tracker, use_mock=True)
         assert optimizer.tracker is tracker
 
+    def test_settings_bound_at_init(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        optimizer = InferenceOptimizer(use_mock=True)
+
+        def fail() -> None:
+            raise AssertionError("get_settings() called on the request path")
+
+        monkeypatch.setattr("src.core.optimizer.get_settings", fail)
+        result = optimizer.infer("What is Python?")
+        assert result.response
+
 
 # ---------------------------------------------------------------------------
 # Metrics
@@ -370,3 +380,19 @@ class TestBaselineVsOptimized:
             f"Optimized (${optimized_cost:.4f}) should be cheaper than "
             f"baseline (${baseline_cost:.4f})"
         )
+
+
+class TestPackageExports:
+    """Tests for the lazily resolved ``src.core`` exports."""
+
+    def test_exports_resolve_to_optimizer_classes(self) -> None:
+        import src.core
+
+        assert src.core.InferenceOptimizer is InferenceOptimizer
+        assert src.core.InferenceResult is InferenceResult
+
+    def test_unknown_attribute_raises(self) -> None:
+        import src.core
+
+        with pytest.raises(AttributeError):
+            src.core.NotAnExport  # noqa: B018
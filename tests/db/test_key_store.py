@@ -0,0 +1,89 @@
+"""Tests for DbKeyStore -- PostgreSQL-backed API key store with lookup cache."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.db.key_store import DbKeyStore
+from src.governance.auth import _StoredKey
+
+
+def _make_row(prefix: str = "ask_acme_abc") -> Any:
+    """Helper to build an ApiKeyModel-like row."""
+    now = datetime.now(timezone.utc)
+    return SimpleNamespace(
+        key_prefix=prefix,
+        key_hash="hash",
+        user_id="u1",
+        org_id="o1",
+        scopes=["admin"],
+        expires_at=now + timedelta(days=1),
+        revoked=False,
+        created_at=now,
+    )
+
+
+@pytest.fixture
+def repo() -> MagicMock:
+    repo = MagicMock()
+    repo.get_by_prefix.return_value = _make_row()
+    repo.revoke_by_prefix.return_value = True
+    return repo
+
+
+class TestDbKeyStoreCache:
+    """Tests for the prefix-keyed lookup cache."""
+
+    def test_second_lookup_skips_db(self, repo: MagicMock) -> None:
+        store = DbKeyStore(repo, cache_ttl_seconds=60, cache_max_entries=10)
+        first = store.get_by_prefix("ask_acme_abc")
+        second = store.get_by_prefix("ask_acme_abc")
+        assert first is second
+        assert repo.get_by_prefix.call_count == 1
+
+    def test_missing_key_not_cached(self, repo: MagicMock) -> None:
+        repo.get_by_prefix.return_value = None
+        store = DbKeyStore(repo, cache_ttl_seconds=60, cache_max_entries=10)
+        assert store.get_by_prefix("nope") is None
+        assert store.get_by_prefix("nope") is None
+        assert repo.get_by_prefix.call_count == 2
+
+    def test_entry_expires_after_ttl(self, repo: MagicMock) -> None:
+        store = DbKeyStore(repo, cache_ttl_seconds=60, cache_max_entries=10)
+        with patch("src.db.key_store.time.monotonic", return_value=0.0):
+            store.get_by_prefix("ask_acme_abc")
+        with patch("src.db.key_store.time.monotonic", return_value=61.0):
+            store.get_by_prefix("ask_acme_abc")
+        assert repo.get_by_prefix.call_count == 2
+
+    def test_lru_eviction(self, repo: MagicMock) -> None:
+        repo.get_by_prefix.side_effect = lambda p: _make_row(p)
+        store = DbKeyStore(repo, cache_ttl_seconds=60, cache_max_entries=2)
+        for prefix in ("a", "b", "a", "c"):
+            store.get_by_prefix(prefix)
+        repo.get_by_prefix.reset_mock()
+        store.get_by_prefix("a")
+        store.get_by_prefix("b")
+        assert [c.args[0] for c in repo.get_by_prefix.call_args_list] == ["b"]
+
+    def test_prime_serves_without_db(self, repo: MagicMock) -> None:
+        store = DbKeyStore(repo, cache_ttl_seconds=60, cache_max_entries=10)
+        stored = _StoredKey(
+            key_display_prefix="acron_abcdef",
+            key_hash="h",
+            user_id="u",
+            org_id="o",
+        )
+        store.prime(stored)
+        assert store.get_by_prefix("acron_abcdef") is stored
+        repo.get_by_prefix.assert_not_called()
+
+    def test_revoke_evicts(self, repo: MagicMock) -> None:
+        store = DbKeyStore(repo, cache_ttl_seconds=60, cache_max_entries=10)
+        store.get_by_prefix("ask_acme_abc")
+        assert store.revoke_by_prefix("ask_acme_abc") is True
+        store.get_by_prefix("ask_acme_abc")
+        assert repo.get_by_prefix.call_count == 2
@@ -60,3 +60,12 @@ class TestUpdateThreshold:
     def test_update_negative_raises(self, tuner: AdaptiveThresholdTuner) -> None:
         with pytest.raises(ValueError):
             tuner.update_threshold("faq", "medium", -0.1)
+
+    def test_update_invalidates_memoized_thresholds(
+        self, tuner: AdaptiveThresholdTuner
+    ) -> None:
+        assert tuner.get_threshold("medical", "medium") == 0.80  # default row
+        tuner.update_threshold("medical", "medium", 0.95)
+        assert tuner.get_threshold("medical", "medium") == 0.95
+        tuner.update_threshold("default", "high", 0.6)
+        assert tuner.get_threshold("unknown", "high") == 0.6
@@ -1,9 +1,15 @@
-"""Tests for VectorDatabase (InMemoryVectorDB)."""
+"""Tests for VectorDatabase (InMemoryVectorDB, HNSWVectorDB)."""
 
 import numpy as np
 import pytest
 
-from src.embeddings.vector_store import InMemoryVectorDB, VectorDBEntry, VectorSearchResult
+from src.embeddings.vector_store import (
+    HNSWVectorDB,
+    InMemoryVectorDB,
+    VectorDBEntry,
+    VectorSearchResult,
+)
+from src.exceptions import VectorDBError
 
 
 @pytest.fixture
@@ -90,6 +96,29 @@ class TestQuery:
         results = db.query([1.0, 0.0])
         assert isinstance(results[0], VectorSearchResult)
 
+    def test_ties_keep_insertion_order(self, db: InMemoryVectorDB) -> None:
+        db.upsert([make_entry(f"v{i}", [1.0, 0.0]) for i in range(10)])
+        results = db.query([1.0, 0.0], top_k=3)
+        assert [r.vector_id for r in results] == ["v0", "v1", "v2"]
+
+    def test_zero_vectors_never_match(self, db: InMemoryVectorDB) -> None:
+        db.upsert([
+            make_entry("zero", [0.0, 0.0]),
+            make_entry("v1", [1.0, 0.0]),
+        ])
+        results = db.query([1.0, 0.0], top_k=5)
+        assert [r.vector_id for r in results] == ["v1"]
+
+    def test_numpy_embeddings(self, db: InMemoryVectorDB) -> None:
+        vec = np.array([1.0, 0.0, 0.0], dtype=np.float32)
+        entry = VectorDBEntry(vector_id="v1", embedding=vec)
+        assert entry.embedding is vec
+        db.upsert([entry])
+        vec[0] = 0.0  # stored vector must not alias the caller's array
+        results = db.query(np.array([1.0, 0.0, 0.0], dtype=np.float32), top_k=1)
+        assert results[0].vector_id == "v1"
+        assert results[0].score == pytest.approx(1.0)
+
 
 class TestDelete:
     """Tests for delete."""
@@ -113,6 +142,23 @@ class TestDelete:
         assert count == 1
         assert db.count() == 1
 
+    def test_delete_keeps_remaining_rows(self, db: InMemoryVectorDB) -> None:
+        # Enough entries to grow the matrix; deleting from the middle
+        # moves the last row into the freed slot
+        db.upsert([make_entry(f"v{i}", [1.0, float(i)], i=i) for i in range(20)])
+        db.delete(["v3", "v7"])
+        assert db.count() == 18
+        results = db.query([1.0, 19.0], top_k=1)
+        assert results[0].vector_id == "v19"
+        assert results[0].metadata == {"i": 19}
+        assert results[0].score == pytest.approx(1.0, abs=1e-6)
+
+    def test_dimension_resets_when_empty(self, db: InMemoryVectorDB) -> None:
+        db.upsert([make_entry("v1", [1.0, 0.0])])
+        db.delete(["v1"])
+        db.upsert([make_entry("v2", [0.0, 0.0, 1.0])])
+        assert db.query([0.0, 0.0, 1.0])[0].vector_id == "v2"
+
 
 class TestCount:
     """Tests for count."""
@@ -123,3 +169,106 @@ class TestCount:
     def test_after_upsert(self, db: InMemoryVectorDB) -> None:
         db.upsert([make_entry("v1", [1.0])])
         assert db.count() == 1
+
+
+class TestQuantized:
+    """Tests for int8 storage (``quantize=True``)."""
+
+    def test_scores_close_to_float32(self, db: InMemoryVectorDB) -> None:
+        rng = np.random.default_rng(0)
+        entries = [
+            make_entry(f"v{i}", rng.standard_normal(64).tolist()) for i in range(50)
+        ]
+        quantized = InMemoryVectorDB(quantize=True)
+        quantized.upsert(entries)
+        db.upsert(entries)
+        query = entries[7].embedding
+        expected = db.query(query, top_k=50)
+        results = quantized.query(query, top_k=50)
+        assert results[0].vector_id == "v7"
+        assert results[0].score == pytest.approx(1.0, abs=1e-6)
+        want = {r.vector_id: r.score for r in expected}
+        for result in results:
+            assert result.score == pytest.approx(want[result.vector_id], abs=1e-2)
+
+    def test_stores_int8(self) -> None:
+        quantized = InMemoryVectorDB(quantize=True)
+        quantized.upsert([make_entry("v1", [0.5, -0.25, 0.0])])
+        assert quantized._matrix.dtype == np.int8
+        assert quantized._matrix[0].tolist() == [127, -64, 0]
+
+    def test_zero_query(self) -> None:
+        quantized = InMemoryVectorDB(quantize=True)
+        quantized.upsert([make_entry("v1", [1.0, 0.0])])
+        assert quantized.query([0.0, 0.0]) == []
+
+
+class TestHNSWVectorDB:
+    """Tests for the HNSW-backed vector DB."""
+
+    @pytest.fixture
+    def hnsw(self) -> HNSWVectorDB:
+        pytest.importorskip("hnswlib")
+        return HNSWVectorDB(dimension=3, max_elements=2)
+
+    def test_missing_hnswlib_raises(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr("src.embeddings.vector_store.hnswlib", None)
+        with pytest.raises(VectorDBError):
+            HNSWVectorDB(dimension=3)
+
+    def test_matches_brute_force(self, hnsw: HNSWVectorDB, db: InMemoryVectorDB) -> None:
+        rng = np.random.default_rng(0)
+        entries = [
+            make_entry(f"v{i}", rng.standard_normal(3).tolist()) for i in range(20)
+        ]
+        # Capacity 2 forces the index to resize
+        assert hnsw.upsert(entries) == 20
+        db.upsert(entries)
+        query = [0.3, -0.2, 0.9]
+        expected = db.query(query, top_k=3)
+        results = hnsw.query(query, top_k=3)
+        assert [r.vector_id for r in results] == [r.vector_id for r in expected]
+        for got, want in zip(results, expected):
+            assert got.score == pytest.approx(want.score, abs=1e-5)
+
+    def test_upsert_updates_in_place(self, hnsw: HNSWVectorDB) -> None:
+        hnsw.upsert([make_entry("v1", [1.0, 0.0, 0.0], tag="old")])
+        hnsw.upsert([make_entry("v1", [0.0, 1.0, 0.0], tag="new")])
+        assert hnsw.count() == 1
+        results = hnsw.query([0.0, 1.0, 0.0], top_k=5)
+        assert results[0].score == pytest.approx(1.0, abs=1e-5)
+        assert results[0].metadata == {"tag": "new"}
+
+    def test_dimension_mismatch(self, hnsw: HNSWVectorDB) -> None:
+        with pytest.raises(VectorDBError):
+            hnsw.upsert([make_entry("v1", [1.0, 0.0])])
+
+    def test_query_with_filter(self, hnsw: HNSWVectorDB) -> None:
+        hnsw.upsert([
+            make_entry("v1", [1.0, 0.0, 0.0], org="a"),
+            make_entry("v2", [0.9, 0.1, 0.0], org="b"),
+        ])
+        results = hnsw.query([1.0, 0.0, 0.0], top_k=5, filter={"org": "b"})
+        assert [r.vector_id for r in results] == ["v2"]
+        assert hnsw.query([1.0, 0.0, 0.0], filter={"org": "c"}) == []
+
+    def test_delete(self, hnsw: HNSWVectorDB) -> None:
+        hnsw.upsert([
+            make_entry("v1", [1.0, 0.0, 0.0]),
+            make_entry("v2", [0.0, 1.0, 0.0]),
+        ])
+        assert hnsw.delete(["v1", "missing"]) == 1
+        assert hnsw.count() == 1
+        results = hnsw.query([1.0, 0.0, 0.0], top_k=5)
+        assert [r.vector_id for r in results] == ["v2"]
+
+    def test_delete_reuses_slots(self, hnsw: HNSWVectorDB) -> None:
+        hnsw.upsert([make_entry("v0", [0.0, 0.0, 1.0])])
+        # Insert/delete churn stays within the initial two slots
+        for i in range(1, 10):
+            hnsw.upsert([make_entry(f"v{i}", [1.0, float(i), 0.0])])
+            assert hnsw.delete([f"v{i}"]) == 1
+        assert hnsw._index.get_max_elements() == 2
+        hnsw.upsert([make_entry("v10", [1.0, 0.0, 0.0])])
+        results = hnsw.query([1.0, 0.0, 0.0], top_k=5)
+        assert [r.vector_id for r in results] == ["v10", "v0"]
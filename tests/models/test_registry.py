@@ -139,6 +139,13 @@ class TestModelRegistry:
         with pytest.raises(ModelNotFoundError):
             registry.get("nonexistent-model")
 
+    def test_get_or_none(
+        self, registry: ModelRegistry, sample_profile: ModelProfile
+    ) -> None:
+        registry.add(sample_profile)
+        assert registry.get_or_none("test-model") is sample_profile
+        assert registry.get_or_none("nonexistent-model") is None
+
     def test_remove(
         self, registry: ModelRegistry, sample_profile: ModelProfile
     ) -> None:
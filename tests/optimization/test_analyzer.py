@@ -120,6 +120,16 @@ class TestContextAnalyzerKeyword:
         assert "Turn 5" in history_seg.text
         assert "Turn 1" not in history_seg.text
 
+    def test_segment_ids_are_deterministic(self, analyzer: ContextAnalyzer) -> None:
+        parts = {"query": "What is machine learning?", "document": "ML notes"}
+        first = analyzer.analyze(parts, "What is machine learning?")
+        second = analyzer.analyze(parts, "What is machine learning?")
+        assert [s.segment_id for s in first] == [s.segment_id for s in second]
+        for seg in first:
+            prefix, digest = seg.segment_id.split("-")
+            assert prefix == seg.category
+            assert len(digest) == 8
+
     def test_token_count_is_positive(self, analyzer: ContextAnalyzer) -> None:
         parts = {"query": "What is machine learning?"}
         segments = analyzer.analyze(parts, "What is machine learning?")
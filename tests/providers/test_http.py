@@ -0,0 +1,26 @@
+"""Tests for the shared provider HTTP client."""
+
+import httpx
+
+from src.providers._http import get_http_client
+
+
+class TestGetHttpClient:
+    def test_returns_one_shared_client(self) -> None:
+        client = get_http_client()
+        assert isinstance(client, httpx.Client)
+        assert get_http_client() is client
+
+    def test_client_has_pool_timeouts(self) -> None:
+        timeout = get_http_client().timeout
+        assert timeout.read == 60.0
+        assert timeout.connect == 5.0
+
+    def test_client_keeps_no_cookies(self) -> None:
+        client = get_http_client()
+        request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+        response = httpx.Response(
+            200, headers={"Set-Cookie": "session=abc; Path=/"}, request=request
+        )
+        client.cookies.extract_cookies(response)
+        assert len(client.cookies) == 0
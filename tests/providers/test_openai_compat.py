@@ -47,11 +47,10 @@ class TestOpenAICompatMixin:
         provider = _TestProvider()
         req = InferenceRequest(model="test-v1", prompt="Hi")
 
-        with patch("src.providers._openai_compat.httpx.Client") as MockClient:
+        with patch("src.providers._openai_compat.get_http_client") as MockClient:
             mock_client = MagicMock()
             mock_client.post.return_value = _mock_response()
-            MockClient.return_value.__enter__ = MagicMock(return_value=mock_client)
-            MockClient.return_value.__exit__ = MagicMock(return_value=False)
+            MockClient.return_value = mock_client
 
             result = provider.call(req, "sk-test-key")
 
@@ -74,11 +73,10 @@ class TestOpenAICompatMixin:
             model="test-v1", prompt="Hi", system_prompt="Be helpful."
         )
 
-        with patch("src.providers._openai_compat.httpx.Client") as MockClient:
+        with patch("src.providers._openai_compat.get_http_client") as MockClient:
             mock_client = MagicMock()
             mock_client.post.return_value = _mock_response()
-            MockClient.return_value.__enter__ = MagicMock(return_value=mock_client)
-            MockClient.return_value.__exit__ = MagicMock(return_value=False)
+            MockClient.return_value = mock_client
 
             provider.call(req, "sk-key")
 
@@ -90,11 +88,10 @@ class TestOpenAICompatMixin:
         provider = _TestProvider()
         req = InferenceRequest(model="test-v1", prompt="Hi")
 
-        with patch("src.providers._openai_compat.httpx.Client") as MockClient:
+        with patch("src.providers._openai_compat.get_http_client") as MockClient:
             mock_client = MagicMock()
             mock_client.post.return_value = _mock_response()
-            MockClient.return_value.__enter__ = MagicMock(return_value=mock_client)
-            MockClient.return_value.__exit__ = MagicMock(return_value=False)
+            MockClient.return_value = mock_client
 
             provider.call(req, "sk-my-key")
 
@@ -105,11 +102,10 @@ class TestOpenAICompatMixin:
         provider = _TestProvider()
         req = InferenceRequest(model="test-v1", prompt="Hi")
 
-        with patch("src.providers._openai_compat.httpx.Client") as MockClient:
+        with patch("src.providers._openai_compat.get_http_client") as MockClient:
             mock_client = MagicMock()
             mock_client.post.return_value = _mock_response(status_code=429)
-            MockClient.return_value.__enter__ = MagicMock(return_value=mock_client)
-            MockClient.return_value.__exit__ = MagicMock(return_value=False)
+            MockClient.return_value = mock_client
 
             with pytest.raises(ProviderRateLimitError):
                 provider.call(req, "sk-key")
@@ -118,11 +114,10 @@ class TestOpenAICompatMixin:
         provider = _TestProvider()
         req = InferenceRequest(model="test-v1", prompt="Hi")
 
-        with patch("src.providers._openai_compat.httpx.Client") as MockClient:
+        with patch("src.providers._openai_compat.get_http_client") as MockClient:
             mock_client = MagicMock()
             mock_client.post.return_value = _mock_response(status_code=503)
-            MockClient.return_value.__enter__ = MagicMock(return_value=mock_client)
-            MockClient.return_value.__exit__ = MagicMock(return_value=False)
+            MockClient.return_value = mock_client
 
             with pytest.raises(ProviderServerError) as exc_info:
                 provider.call(req, "sk-key")
@@ -132,11 +127,10 @@ class TestOpenAICompatMixin:
         provider = _TestProvider()
         req = InferenceRequest(model="test-v1", prompt="Hi")
 
-        with patch("src.providers._openai_compat.httpx.Client") as MockClient:
+        with patch("src.providers._openai_compat.get_http_client") as MockClient:
             mock_client = MagicMock()
             mock_client.post.return_value = _mock_response(status_code=401)
-            MockClient.return_value.__enter__ = MagicMock(return_value=mock_client)
-            MockClient.return_value.__exit__ = MagicMock(return_value=False)
+            MockClient.return_value = mock_client
 
             with pytest.raises(ProviderRequestError) as exc_info:
                 provider.call(req, "bad-key")
@@ -163,11 +157,10 @@ class TestOpenAICompatMixin:
         provider = OllamaLike()
         req = InferenceRequest(model="llama3", prompt="Hi")
 
-        with patch("src.providers._openai_compat.httpx.Client") as MockClient:
+        with patch("src.providers._openai_compat.get_http_client") as MockClient:
             mock_client = MagicMock()
             mock_client.post.return_value = _mock_response()
-            MockClient.return_value.__enter__ = MagicMock(return_value=mock_client)
-            MockClient.return_value.__exit__ = MagicMock(return_value=False)
+            MockClient.return_value = mock_client
 
             result = provider.call(req, "")
 
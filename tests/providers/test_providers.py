@@ -32,22 +32,21 @@ def _mock_httpx_response(status_code: int = 200, json_data: dict | None = None):
 
 
 def _patch_httpx():
-    """Return a context-manager that patches httpx.Client for OpenAI-compat."""
-    return patch("src.providers._openai_compat.httpx.Client")
+    """Return a context-manager that patches the shared client for OpenAI-compat."""
+    return patch("src.providers._openai_compat.get_http_client")
 
 
 def _patch_httpx_providers():
-    """Return a context-manager that patches httpx.Client in providers module."""
-    return patch("src.providers.providers.httpx.Client")
+    """Return a context-manager that patches the shared client in providers module."""
+    return patch("src.providers.providers.get_http_client")
 
 
 def _setup_mock_client(MockClient, response):
-    """Wire up the mock context manager."""
+    """Wire up the mock shared client."""
     mock_client = MagicMock()
     mock_client.post.return_value = response
     mock_client.get.return_value = response
-    MockClient.return_value.__enter__ = MagicMock(return_value=mock_client)
-    MockClient.return_value.__exit__ = MagicMock(return_value=False)
+    MockClient.return_value = mock_client
     return mock_client
 
 
@@ -139,7 +138,7 @@ class TestAnthropicProvider:
                     "usage": {"input_tokens": 10, "output_tokens": 1},
                 }),
             )
-            mock_client = MockClient.return_value.__enter__()
+            mock_client = MockClient.return_value
             p.call(req, "key")
 
         body = mock_client.post.call_args.kwargs["json"]
@@ -7,6 +7,8 @@ from pathlib import Path
 import pytest
 import yaml
 
+import src.config as config_module
+
 from src.config import (
     Settings,
     get_settings,
@@ -14,6 +16,9 @@ from src.config import (
     _load_yaml,
     _apply_dict,
     _apply_env_overrides,
+    _ENV_OVERRIDE_TABLE,
+    _group_env_overrides,
+    AnomalySettings,
     ApiSettings,
     CacheSettings,
     RoutingSettings,
@@ -51,6 +56,40 @@ class TestLoadYaml:
         data = _load_yaml(f)
         assert data == {}
 
+    def test_unchanged_file_parsed_once(self, tmp_path, monkeypatch):
+        f = tmp_path / "cfg.yaml"
+        f.write_text("api:\n  cors_origins: [a]\n")
+        first = _load_yaml(f)
+        first["api"]["cors_origins"].append("mutated")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("unchanged file was re-parsed")
+
+        monkeypatch.setattr(yaml, "load", fail)
+        assert _load_yaml(f) == {"api": {"cors_origins": ["a"]}}
+
+    def test_changed_file_reparsed(self, tmp_path):
+        f = tmp_path / "cfg.yaml"
+        f.write_text("api:\n  port: 1\n")
+        assert _load_yaml(f)["api"]["port"] == 1
+        f.write_text("api:\n  port: 22\n")
+        assert _load_yaml(f)["api"]["port"] == 22
+
+    def test_json_config(self, tmp_path):
+        f = tmp_path / "config.json"
+        f.write_text('{"api": {"port": 7100}, "batching": {"max_wait_ms": 5}}')
+        assert _load_yaml(f) == {"api": {"port": 7100}, "batching": {"max_wait_ms": 5}}
+        s = get_settings(yaml_path=f, _force_reload=True)
+        assert s.api.port == 7100
+
+    def test_reads_utf8_and_stays_safe(self, tmp_path):
+        f = tmp_path / "cfg.yaml"
+        f.write_text("api:\n  host: \"héllo\"\n", encoding="utf-8")
+        assert _load_yaml(f)["api"]["host"] == "héllo"
+        f.write_text("x: !!python/object/apply:os.getcwd []\n")
+        with pytest.raises(yaml.YAMLError):
+            _load_yaml(f)
+
 
 # ── Settings defaults ───────────────────────────────────
 
@@ -67,6 +106,65 @@ class TestSettingsDefaults:
         assert s.governance.auth_api_key_required is False
 
 
+    def test_sections_built_on_first_access(self, tmp_path):
+        f = tmp_path / "config.yaml"
+        f.write_text(yaml.dump({
+            "observability": {"anomaly": {"cost_spike_threshold": 3.0}},
+        }))
+        s = get_settings(yaml_path=f, _force_reload=True)
+
+        def built(name):
+            try:
+                object.__getattribute__(s, name)
+            except AttributeError:
+                return False
+            return True
+
+        assert not built("observability")
+        obs = s.observability
+        assert obs.anomaly.cost_spike_threshold == 3.0
+        assert built("observability") and s.observability is obs
+        assert not built("api")
+
+    def test_default_maps_are_shared_and_read_only(self):
+        a, b = Settings(), Settings()
+        assert a.routing.quality_map is b.routing.quality_map
+        assert a.routing.quality_map["high"] == 4.0
+        assert a.routing.task_overrides["legal"]["min_quality"] == 4.2
+        assert a.batching.eligible_task_types == (
+            "summarization", "faq", "translation",
+        )
+        with pytest.raises(TypeError):
+            a.routing.quality_map["high"] = 1.0
+        with pytest.raises(TypeError):
+            a.routing.task_overrides["coding"]["min_quality"] = 1.0
+
+    def test_default_only_loads_do_not_share_sections(self, tmp_path):
+        missing = tmp_path / "nope.yaml"
+        first = get_settings(yaml_path=missing, _force_reload=True)
+        first.api.port = 1
+        second = get_settings(yaml_path=missing, _force_reload=True)
+        assert second.api.port == 8000
+
+    def test_sections_cannot_be_replaced(self):
+        s = Settings()
+        with pytest.raises(AttributeError):
+            s.api = ApiSettings(port=1)
+        with pytest.raises(AttributeError):
+            del s.cache
+        assert s.api.port == 8000
+
+    def test_settings_use_slots(self):
+        s = Settings()
+        assert not hasattr(s, "__dict__")
+        assert not hasattr(s.api, "__dict__")
+        assert not hasattr(s.observability.anomaly, "__dict__")
+
+    def test_unknown_attribute_raises(self):
+        with pytest.raises(AttributeError):
+            Settings().not_a_section
+
+
 # ── get_settings() from YAML ────────────────────────────
 
 
@@ -164,12 +262,90 @@ class TestEnvOverrides:
         s = get_settings(yaml_path=cfg, _force_reload=True)
         assert s.api.port == 4000
 
+    def test_env_override_uses_declared_type(self, tmp_path, monkeypatch):
+        # YAML wrote an int into a float field; the override still casts
+        # with the field's declared type
+        cfg = self._write_config(
+            tmp_path, {"routing": {"default_quality_threshold": 4}}
+        )
+        monkeypatch.setenv("ASAHI_ROUTING_DEFAULT_QUALITY_THRESHOLD", "4.5")
+        s = get_settings(yaml_path=cfg, _force_reload=True)
+        assert s.routing.default_quality_threshold == 4.5
+
+    def test_non_scalar_fields_not_overridable(self, tmp_path, monkeypatch):
+        cfg = self._write_config(tmp_path, {})
+        monkeypatch.setenv("ASAHI_OBSERVABILITY_ANOMALY", "oops")
+        monkeypatch.setenv("ASAHI_API_CORS_ORIGINS", "oops")
+        s = get_settings(yaml_path=cfg, _force_reload=True)
+        assert isinstance(s.observability.anomaly, AnomalySettings)
+        assert s.api.cors_origins == ["*"]
+
+    def test_yaml_and_env_applied_in_one_section_build(
+        self, tmp_path, monkeypatch
+    ):
+        cfg = self._write_config(
+            tmp_path, {"cache": {"ttl_seconds": 10, "max_entries": 20}}
+        )
+        monkeypatch.setenv("ASAHI_CACHE_MAX_ENTRIES", "30")
+        s = get_settings(yaml_path=cfg, _force_reload=True)
+        # The snapshot is taken at load; later env changes do not leak in
+        monkeypatch.setenv("ASAHI_CACHE_TTL_SECONDS", "99")
+        assert (s.cache.ttl_seconds, s.cache.max_entries) == (10, 30)
+
+    def test_env_overrides_grouped_by_section(self):
+        grouped = _group_env_overrides({
+            "ASAHI_API_PORT": "1",
+            "ASAHI_API_HOST": "h",
+            "ASAHI_CACHE_TTL_SECONDS": "2",
+            "ASAHI_NOT_A_FIELD": "x",
+        })
+        assert sorted(grouped) == ["api", "cache"]
+        assert sorted(o[0] for o in grouped["api"]) == ["host", "port"]
+
+    def test_override_table_covers_every_scalar_field(self):
+        table = {
+            env_key: cast
+            for entries in _ENV_OVERRIDE_TABLE.values()
+            for _, env_key, cast in entries
+        }
+        assert table["ASAHI_API_PORT"] is int
+        assert table["ASAHI_ROUTING_DEFAULT_QUALITY_THRESHOLD"] is float
+        assert table["ASAHI_GOVERNANCE_AUTH_KEY_PREFIX"] is str
+        assert table["ASAHI_OBSERVABILITY_ENABLED"]("TRUE") is True
+        assert "ASAHI_BATCHING_ELIGIBLE_TASK_TYPES" not in table
+        assert len(table) == 63
+
     def _write_config(self, tmp_path, data):
         f = tmp_path / "config.yaml"
         f.write_text(yaml.dump(data))
         return f
 
 
+# ── .env loading ────────────────────────────────────────
+
+
+class TestDotenv:
+    def test_unchanged_dotenv_not_reloaded(self, tmp_path, monkeypatch):
+        env_file = tmp_path / ".env"
+        env_file.write_text("ASAHI_API_PORT=7001\n")
+        monkeypatch.setenv("ASAHI_API_PORT", "1")  # restored after the test
+        cfg = tmp_path / "config.yaml"
+        cfg.write_text("{}")
+        s = get_settings(yaml_path=cfg, env_path=env_file, _force_reload=True)
+        assert s.api.port == 7001
+
+        calls = []
+        monkeypatch.setattr(
+            config_module, "load_dotenv", lambda *a, **k: calls.append(a)
+        )
+        get_settings(yaml_path=cfg, env_path=env_file, _force_reload=True)
+        assert calls == []
+
+        env_file.write_text("ASAHI_API_PORT=70002\n")
+        get_settings(yaml_path=cfg, env_path=env_file, _force_reload=True)
+        assert len(calls) == 1
+
+
 # ── _apply_dict helper ──────────────────────────────────
 
 
@@ -185,6 +361,17 @@ class TestApplyDict:
         _apply_dict(target, {"unknown_field": "value"})
         assert target.port == 8000  # unchanged
 
+    def test_merges_nested_sections(self):
+        target = ObservabilitySettings()
+        _apply_dict(target, {
+            "enabled": False,
+            "anomaly": {"cost_spike_threshold": 3.0, "bogus": 1},
+        })
+        assert target.enabled is False
+        assert isinstance(target.anomaly, AnomalySettings)
+        assert target.anomaly.cost_spike_threshold == 3.0
+        assert target.anomaly.latency_spike_threshold == 2.0
+
 
 # ── Integration: real config/config.yaml ─────────────────
 
@@ -187,6 +187,7 @@ class TestEventTracker:
         assert tracker.event_count == 1
         events = tracker.get_events()
         assert events[0].request_id == "loaded_event"
+        assert events[0] == event
 
     def test_load_from_file_skips_corrupted_lines(
         self, tracker: EventTracker, tmp_path: Path